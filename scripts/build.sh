@@ -16,13 +16,20 @@ setup_executable_names() {
     debug_exe_name="${debug_exe_name}-${version}"
 }
 
+# Compile the champion data snapshot loaded on first launch
+compile_snapshot() {
+    python src/compilesnapshot.py --output resources/snapshot/championdata.json.gz
+}
+
 # Build the application
 build() {
     pyinstaller src/monsoon.py --add-data "resources/images/*;resources/images" \
+    --add-data "resources/snapshot/*;resources/snapshot" \
     --onefile --hidden-import "win32api" --hidden-import "dependency_injector.errors" \
     --hidden-import "six" --icon "monsoon.ico" -n "$debug_exe_name"
     
     pyinstaller src/monsoon.py --add-data "resources/images/*;resources/images" \
+    --add-data "resources/snapshot/*;resources/snapshot" \
     --onefile --noconsole --hidden-import "win32api" \
     --hidden-import "dependency_injector.errors" --hidden-import "six" \
     --icon "monsoon.ico" -n "$exe_name"
@@ -30,6 +37,7 @@ build() {
 
 parse_version
 setup_executable_names
+compile_snapshot
 build
 
 # Archive and compress source code
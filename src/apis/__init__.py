@@ -1,2 +1,6 @@
+from .championregistry import *
+from .championsnapshot import *
 from .datadragon import *
-from .lolfandom import *
\ No newline at end of file
+from .httpclient import *
+from .iconprefetcher import *
+from .lolfandom import *
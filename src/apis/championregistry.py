@@ -0,0 +1,122 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from models import DynamicBalanceModel, BalanceLever
+from .lolalytics import LoLalytics
+
+
+class ChampionRegistry:
+    """Resolves the champions of every source to their numeric id, the key of
+    DataDragon records and champion select sessions. Names are matched through
+    alias maps of normalized names built once per data load, so a lookup is a
+    single dict hit, and names of a source that match no champion are reported
+    while the registry is built rather than turning into empty winrates.
+    """
+
+    def __init__(
+            self,
+            balances: Dict[int, DynamicBalanceModel],
+            aliases: Dict[str, int],
+            unmatched: Dict[str, List[str]] = None
+    ):
+        # Numeric champion id -> balance levers joined with the winrate
+        self.balances = balances
+        # Normalized name, DataDragon id or LoLalytics key -> numeric champion id
+        self.aliases = aliases
+        # Source name -> names of it that matched no champion
+        self.unmatched = unmatched or {}
+        # Display name -> balance, the shape of snapshots
+        self.balances_by_name = {x.champion_name: x for x in balances.values()}
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Return the form names of every source are matched by: "Kai'Sa",
+    "kaisa" and "KaiSa" are all "kaisa".
+    """
+        return "".join(x for x in name.lower() if x.isalnum())
+
+    @classmethod
+    def from_sources(cls, championdata: dict, winrates: Dict[str, Tuple[int, float]]):
+        """Join the champions of Module:ChampionData with LoLalytics winrates.
+
+    Args:
+        championdata (dict): Champion name -> {"id": ..., "apiname": ...,
+            "stats": {"aram": {...}}} of LolFandom.
+        winrates (dict): LoLalytics key -> (rank, winrate).
+    """
+        aliases = cls._championdata_aliases(championdata)
+        winrates_by_id = {}
+        unmatched_winrates = []
+        for key, winrate in winrates.items():
+            champion_id = aliases.get(cls.normalize(key))
+            if champion_id is None:
+                unmatched_winrates.append(key)
+                continue
+            aliases.setdefault(key, champion_id)
+            winrates_by_id[champion_id] = LoLalytics.format_winrate(*winrate)
+        return cls._join(championdata, aliases, winrates_by_id, unmatched_winrates)
+
+    def join(self, championdata: dict):
+        """Registry of new champion data joined with the winrates of this one,
+    so champion data is refreshed without fetching winrates again. Champions
+    new to the champion data have no winrate until winrates are joined again.
+    """
+        aliases = self._championdata_aliases(championdata)
+        winrates_by_id = {k: x.rank_winrate for k, x in self.balances.items() if x.rank_winrate}
+        return self._join(championdata, aliases, winrates_by_id, self.unmatched.get("lolalytics", []))
+
+    @classmethod
+    def _championdata_aliases(cls, championdata: dict) -> Dict[str, int]:
+        aliases = {}
+        for champion_name, champion in championdata.items():
+            champion_id = int(champion["id"])
+            aliases[cls.normalize(champion_name)] = champion_id
+            # DataDragon id, which differs from the name for a few champions ("MonkeyKing")
+            if champion.get("apiname"):
+                aliases.setdefault(cls.normalize(champion["apiname"]), champion_id)
+        return aliases
+
+    @classmethod
+    def _join(cls, championdata: dict, aliases: Dict[str, int], winrates_by_id: Dict[int, str],
+              unmatched_winrates: List[str]):
+        balances = {}
+        without_winrate = []
+        for champion_name, champion in championdata.items():
+            champion_id = int(champion["id"])
+            rank_winrate = winrates_by_id.get(champion_id, "")
+            if not rank_winrate:
+                without_winrate.append(champion_name)
+            aram_stats = champion["stats"]["aram"] or {}
+            balances[champion_id] = DynamicBalanceModel(
+                champion_id=champion_id,
+                rank_winrate=rank_winrate,
+                champion_name=champion_name,
+                balance_levers=[BalanceLever(name, modifier) for name, modifier in aram_stats.items()]
+            )
+
+        unmatched = {k: sorted(v) for k, v in (("lolalytics", unmatched_winrates),
+                                                 ("lolfandom", without_winrate)) if v}
+        for source, names in unmatched.items():
+            logging.warning(f"{len(names)} champions of {source} matched no champion of the other source: "
+                            f"{', '.join(names)}")
+        return cls(balances, aliases, unmatched)
+
+    @classmethod
+    def from_balances(cls, balances: Dict[str, DynamicBalanceModel]):
+        """Registry of already joined balances, such as the ones of a snapshot.
+    """
+        return cls(
+            balances={int(x.champion_id): x for x in balances.values()},
+            aliases={cls.normalize(x.champion_name): int(x.champion_id) for x in balances.values()}
+        )
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Return the numeric id of a champion name of any source, or None.
+    """
+        champion_id = self.aliases.get(name)
+        if champion_id is None:
+            champion_id = self.aliases.get(ChampionRegistry.normalize(name))
+        return champion_id
+
+    def balance(self, champion_id: int) -> Optional[DynamicBalanceModel]:
+        return self.balances.get(champion_id)
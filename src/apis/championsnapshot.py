@@ -0,0 +1,174 @@
+import gzip
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from models import DynamicBalanceModel, BalanceLever
+from utils import ResourceHelper
+from .datadragon import ChampionIndex, DataDragon
+from .lolfandom import LolFandom
+
+# Bumped whenever the layout of the snapshot changes; other formats are ignored
+SNAPSHOT_FORMAT = 1
+# Location of the snapshot bundled with the build, see scripts/build.sh
+SNAPSHOT_RESOURCE = "resources/snapshot/championdata.json.gz"
+# Location of the last good data in the user data directory, saved as sources refresh
+USER_SNAPSHOT = "snapshot/championdata.json.gz"
+# Fields of DataDragon champion records that are kept in a snapshot
+CHAMPION_FIELDS = ("id", "key", "name", "image")
+
+
+@dataclass(frozen=True)
+class ChampionSnapshot:
+    """Data class holding the joined champion data of every source at one point
+    in time, so the app can start without waiting on any upstream.
+    """
+    # Unix time the snapshot was compiled at
+    created_at: float
+    # DataDragon patch of the champion index
+    version: str
+    # DataDragon champion.json, champion records reduced to CHAMPION_FIELDS
+    champions: dict
+    # Revision id of Module:ChampionData, None when unknown
+    revision: Optional[int]
+    # Champion name -> balance levers joined with the LoLalytics winrate
+    dynamic_balances: Dict[str, DynamicBalanceModel]
+    # Source name -> unix time its data was last confirmed current, when known
+    updated_at: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def empty(cls):
+        """Return a snapshot without any champion, to start from when there is no
+    data at all.
+    """
+        return cls(created_at=0, version="", champions={"data": {}}, revision=None, dynamic_balances={})
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.champions["data"]
+
+    @classmethod
+    def capture(cls, data_dragon: DataDragon, lol_fandom: LolFandom, updated_at: Dict[str, float] = None):
+        index = data_dragon.index
+        data = {id: {k: v for k, v in x.items() if k in CHAMPION_FIELDS} for id, x in index.by_id.items()}
+        return cls(
+            created_at=time.time(),
+            version=index.version,
+            champions={"data": data},
+            revision=lol_fandom.revision,
+            dynamic_balances=dict(lol_fandom.dynamic_balances),
+            updated_at=dict(updated_at or {})
+        )
+
+    @classmethod
+    def from_bytes(cls, content: bytes):
+        """Load a snapshot written by to_bytes.
+
+    Raises:
+        Exception: Snapshot is corrupt or of a different format
+
+    Returns:
+        ChampionSnapshot
+    """
+        try:
+            document = json.loads(gzip.decompress(content))
+        except (OSError, EOFError, ValueError):
+            raise Exception("Failed to read champion snapshot")
+        if not isinstance(document, dict) or document.get("format") != SNAPSHOT_FORMAT:
+            raise Exception("Champion snapshot has an unsupported format")
+
+        try:
+            return cls._from_document(document)
+        except (KeyError, TypeError, ValueError):
+            raise Exception("Champion snapshot is incomplete")
+
+    @classmethod
+    def _from_document(cls, document: dict):
+        return cls(
+            created_at=document["created_at"],
+            version=document["version"],
+            champions=document["champions"],
+            revision=document["revision"],
+            dynamic_balances={x["champion_name"]: DynamicBalanceModel(
+                champion_id=x["champion_id"],
+                rank_winrate=x["rank_winrate"],
+                champion_name=x["champion_name"],
+                balance_levers=[BalanceLever(name, modifier) for name, modifier in x["balance_levers"]]
+            ) for x in document["dynamic_balances"]},
+            # Snapshots of older builds only know when they were created
+            updated_at=document.get("updated_at", {})
+        )
+
+    def to_bytes(self) -> bytes:
+        """Return the snapshot as compact gzipped JSON. Champion icons are left
+    out, they are fetched through the icon store.
+    """
+        document = {
+            "format": SNAPSHOT_FORMAT,
+            "created_at": self.created_at,
+            "version": self.version,
+            "champions": self.champions,
+            "revision": self.revision,
+            "dynamic_balances": [{
+                "champion_id": x.champion_id,
+                "rank_winrate": x.rank_winrate,
+                "champion_name": x.champion_name,
+                "balance_levers": [[y.name, y.modifier] for y in x.balance_levers]
+            } for x in self.dynamic_balances.values()],
+            "updated_at": self.updated_at
+        }
+        return gzip.compress(json.dumps(document, separators=(",", ":")).encode("utf-8"), mtime=0)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """Load a snapshot from a file, or return None if there is no usable
+    snapshot at the path.
+    """
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        try:
+            return cls.from_bytes(content)
+        except Exception as e:
+            logging.warning(f"Ignoring champion snapshot {path}: {e}")
+            return None
+
+    @classmethod
+    def load_bundled(cls):
+        """Load the snapshot bundled with the build, or return None when running
+    without one.
+    """
+        return cls.load(ResourceHelper.get_resource_path(SNAPSHOT_RESOURCE))
+
+    @classmethod
+    def load_user(cls):
+        """Load the last good data saved with save_user, or return None when there
+    is none.
+    """
+        return cls.load(ResourceHelper.get_user_data_path(USER_SNAPSHOT))
+
+    def save_user(self) -> None:
+        self.save(ResourceHelper.get_user_data_path(USER_SNAPSHOT))
+
+    @classmethod
+    def load_latest(cls):
+        """Load the newer of the last good data and the bundled snapshot, or return
+    None when there is neither.
+    """
+        snapshots = [x for x in (cls.load_user(), cls.load_bundled()) if x is not None]
+        return max(snapshots, key=lambda x: x.created_at, default=None)
+
+    def create_index(self) -> ChampionIndex:
+        return ChampionIndex.from_champions(self.version, self.champions)
@@ -1,55 +1,310 @@
-import requests
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from constants import IconModes
+from utils import DiskCache, CacheStats, IconStore
+from .httpclient import HttpClient
+from .iconprefetcher import IconPrefetcher
+from .spriteatlas import SpriteAtlas
+
+
+@dataclass(frozen=True)
+class ChampionIndex:
+    """Data class holding the champion data of a patch along with lookup tables
+    that are built once, so lookups never scan every champion.
+    """
+    version: str
+    champions: dict
+    # Numeric champion key (37) -> champion record
+    by_key: Dict[int, dict]
+    # DataDragon champion id ("Sona") -> champion record
+    by_id: Dict[str, dict]
+    # Display name ("Sona") -> champion record
+    by_name: Dict[str, dict]
+
+    @classmethod
+    def from_champions(cls, version: str, champions: dict):
+        data = champions["data"]
+        return cls(
+            version=version,
+            champions=champions,
+            by_key={int(x["key"]): x for x in data.values()},
+            by_id={id: x for id, x in data.items()},
+            by_name={x["name"]: x for x in data.values()}
+        )
 
 
 class DataDragon:
-    def __init__(self):
-        self.url = "https://ddragon.leagueoflegends.com"
-        self.latest_version = self._fetch_latest_version()
-        self.champions = self._fetch_champions()
+    def __init__(
+            self,
+            url: str = "https://ddragon.leagueoflegends.com",
+            http_client: HttpClient = None,
+            cache: DiskCache = None,
+            icon_store: IconStore = None,
+            prefetch_icons: bool = True,
+            icon_mode: IconModes = IconModes.FULL,
+            index: ChampionIndex = None
+    ):
+        self.url = url
+        self.http_client = http_client or HttpClient()
+        # Persistent cache; versioned resources are keyed by patch
+        self.cache = cache or DiskCache()
+        # Persistent content-addressed store of champion icons
+        self.icon_store = icon_store or IconStore()
+        self.prefetch_icons = prefetch_icons
+        self.icon_prefetcher: Optional[IconPrefetcher] = None
+        self.icon_mode = icon_mode
+        # Keyed by (patch, name), so entries a lookup adds while an index is
+        # swapped never pass for the other patch
         self.champion_icons = dict()
+        self.champion_sprite_icons = dict()
+        self.sprite_atlases: Dict[Tuple[str, str], SpriteAtlas] = dict()
+        self._sprite_atlases_lock = threading.Lock()
+        self._sprite_atlas_locks = dict()
+        self._index: Optional[ChampionIndex] = None
+        if index is None:
+            self.refresh()
+        else:
+            # Champion data of a snapshot. Its icons are prefetched right away,
+            # a refresh finding the same patch leaves the index as it is. An
+            # empty snapshot has no patch to prefetch, or to prune the store to
+            self._index = index
+            if self.prefetch_icons and index.version and index.by_id:
+                self.start_icon_prefetch()
 
-    def _fetch_latest_version(self):
-        req = requests.get(f"{self.url}/api/versions.json")
+    @property
+    def latest_version(self) -> str:
+        return self._index.version
+
+    @property
+    def champions(self) -> dict:
+        return self._index.champions
+
+    @property
+    def index(self) -> ChampionIndex:
+        return self._index
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def refresh(self) -> None:
+        """Fetch the latest champion data and swap in a freshly built index. The
+    index is replaced with a single assignment so concurrent lookups see either
+    the old or the new data, never a mix of both.
+    """
+        self._refresh(self._fetch_latest_version())
+
+    def refresh_if_outdated(self) -> bool:
+        """Check versions.json for a new patch and refresh if there is one. The
+    check is a conditional request, answered with 304 while nothing changed.
+
+    Returns:
+        bool: Whether the index of a new patch was swapped in.
+    """
+        version = self._fetch_latest_version()
+        if self._index is not None and self._index.version == version:
+            return False
+        self._refresh(version)
+        return True
+
+    def _refresh(self, version: str) -> None:
+        champions = self._fetch_champions(version)
+        index = ChampionIndex.from_champions(version, champions)
+        previous = self._index
+        self._index = index
+        if previous is None or previous.version != version:
+            self.champion_icons = dict()
+            self.champion_sprite_icons = dict()
+            self.sprite_atlases = dict()
+            with self._sprite_atlases_lock:
+                self._sprite_atlas_locks = dict()
+            if self.prefetch_icons:
+                self.start_icon_prefetch()
+        # Resources of older patches are never requested again
+        self.cache.prune("datadragon", keep=[version])
+
+    def start_icon_prefetch(self) -> IconPrefetcher:
+        """Start downloading every champion icon of the current patch into the
+    icon store in the background, or only the handful of sprite atlases in sprite
+    mode. The returned prefetcher exposes progress and cancellation hooks.
+    """
+        if self.icon_prefetcher is not None:
+            self.icon_prefetcher.cancel()
+        index = self._index
+        if self.icon_mode is IconModes.SPRITE:
+            sprites = sorted(set(x["image"]["sprite"] for x in index.by_id.values()))
+            prefetcher = IconPrefetcher(
+                lambda sprite: self._fetch_sprite_atlas(index.version, sprite),
+                sprites,
+                version=index.version)
+        else:
+            prefetcher = IconPrefetcher(
+                lambda name: self._fetch_icon(index.version, name),
+                list(index.by_id.keys()),
+                version=index.version)
+        prefetcher.completed += lambda sender, cancelled: self._on_icon_prefetch_completed(index.version, cancelled)
+        self.icon_prefetcher = prefetcher
+        return prefetcher.start()
+
+    def _on_icon_prefetch_completed(self, version: str, cancelled: bool) -> None:
+        self.icon_store.flush()
+        # Icons of older patches are only dropped once the new patch is complete
+        if not cancelled and version and self._index.version == version:
+            self.icon_store.prune(keep=[version])
+
+    def _fetch_cached(self, path: str, namespace: str, revalidate: bool = False):
+        """Fetch a resource from DataDragon through the disk cache. Resources under
+    a patch version never change once published and are served straight from
+    disk. Other resources are revalidated with ETag/Last-Modified first.
+
+    Args:
+        path (str): Path of the resource relative to the DataDragon url.
+        namespace (str): Cache namespace the resource is stored in.
+        revalidate (bool): Whether a cached copy must be revalidated.
+
+    Returns:
+        bytes: Content of the resource, or None if the response was not 200.
+    """
+        key = path.rsplit("/", 1)[-1]
+        content = self.cache.read(namespace, key)
+        if content is not None and not revalidate:
+            self.cache.record_hit()
+            return content
+
+        headers = {}
+        if content is not None:
+            metadata = self.cache.read_metadata(namespace, key)
+            if "etag" in metadata:
+                headers["If-None-Match"] = metadata["etag"]
+            if "last_modified" in metadata:
+                headers["If-Modified-Since"] = metadata["last_modified"]
+
+        req = self.http_client.get(f"{self.url}{path}", headers=headers)
+        if req.status_code == 304 and content is not None:
+            self.cache.record_hit(revalidated=True)
+            return content
 
         if req.status_code != 200:
+            return None
+
+        self.cache.record_miss()
+        self.cache.write(namespace, key, req.content, {
+            "etag": req.headers.get("ETag"),
+            "last_modified": req.headers.get("Last-Modified")
+        })
+        return req.content
+
+    def _fetch_latest_version(self):
+        content = self._fetch_cached("/api/versions.json", "datadragon", revalidate=True)
+
+        if content is None:
             raise Exception("Failed to get latest version from DataDragon")
 
-        if len(req.json()) == 0:
+        versions = json.loads(content)
+        if len(versions) == 0:
             raise Exception("Received empty versions list from DataDragon")
 
-        return req.json()[0]
+        return versions[0]
 
-    def _fetch_champions(self):
-        req = requests.get(f"{self.url}/cdn/{self.latest_version}/data/en_US/champion.json")
+    def _fetch_champions(self, version):
+        content = self._fetch_cached(
+            f"/cdn/{version}/data/en_US/champion.json",
+            f"datadragon/{version}")
 
-        if req.status_code != 200:
+        if content is None:
             raise Exception("Failed to get champions from DataDragon")
 
-        return req.json()
+        return json.loads(content)
 
     def fetch_by_champion_id(self, champion_id):
-        data = self.champions["data"]
-        for id in data:
-            if (int(data[id]["key"]) == champion_id):
-                return data[id]
-
-        return None
-
-    def fetch_icon_by_champion_id(self, champion_id):
-        data = self.champions["data"]
-        champion_name = None
-        for id in data.keys():
-            if (int(data[id]["key"]) == champion_id):
-                champion_name = id
-                break
-
-        if champion_name is None:
+        return self._index.by_key.get(champion_id)
+
+    def fetch_by_champion_name(self, name):
+        return self._index.by_name.get(name)
+
+    def fetch_icon_by_champion_id(self, champion_id, full_resolution: bool = False):
+        """Return the icon of a champion as PNG bytes. In sprite mode icons are
+    sliced from the sprite atlases unless a full resolution icon is requested.
+    """
+        index = self._index
+        champion = index.by_key.get(champion_id)
+
+        if champion is None:
             raise Exception("Invalid champion id")
 
-        if not champion_name in self.champion_icons:
-            req = requests.get(f"{self.url}/cdn/{self.latest_version}/img/champion/{champion_name}.png", stream=True)
-            if req.status_code != 200:
-                raise Exception("Failed to get champion icon from DataDragon")
-            self.champion_icons[champion_name] = req.content
+        champion_name = champion["id"]
+        key = (index.version, champion_name)
+        if self.icon_mode is IconModes.SPRITE and not full_resolution:
+            champion_sprite_icons = self.champion_sprite_icons
+            if not key in champion_sprite_icons:
+                image = champion["image"]
+                atlas = self._fetch_sprite_atlas(index.version, image["sprite"])
+                champion_sprite_icons[key] = atlas.slice(image["x"], image["y"], image["w"], image["h"])
+            return champion_sprite_icons[key]
+
+        champion_icons = self.champion_icons
+        if not key in champion_icons:
+            content = None
+            prefetcher = self.icon_prefetcher
+            if (prefetcher is not None and prefetcher.version == index.version
+                    and self.icon_mode is IconModes.FULL
+                    and not self.icon_store.contains(index.version, champion_name)):
+                # Avoid downloading an icon twice while it is being prefetched
+                content = prefetcher.wait(champion_name)
+                if self._index is not index:
+                    # A new patch was swapped in while waiting, look the icon up in it
+                    return self.fetch_icon_by_champion_id(champion_id, full_resolution)
+            if content is None:
+                content = self._fetch_icon(index.version, champion_name)
+                self.icon_store.flush()
+            champion_icons[key] = content
+
+        return champion_icons[key]
+
+    def _fetch_sprite_atlas(self, version: str, sprite: str) -> SpriteAtlas:
+        """Return a decoded sprite atlas, downloading it through the disk cache
+    once per patch.
+
+    Raises:
+        Exception: Response not 200
+    """
+        sprite_atlases = self.sprite_atlases
+        atlas = sprite_atlases.get((version, sprite))
+        if atlas is not None:
+            return atlas
+
+        # One lock per atlas so that atlases download in parallel but only once
+        with self._sprite_atlases_lock:
+            lock = self._sprite_atlas_locks.setdefault((version, sprite), threading.Lock())
+        with lock:
+            atlas = sprite_atlases.get((version, sprite))
+            if atlas is None:
+                content = self._fetch_cached(f"/cdn/{version}/img/sprite/{sprite}", f"datadragon/{version}/sprite")
+                if content is None:
+                    raise Exception("Failed to get champion sprite atlas from DataDragon")
+                atlas = SpriteAtlas(content)
+                sprite_atlases[(version, sprite)] = atlas
+        return atlas
+
+    def _fetch_icon(self, version: str, champion_name: str) -> bytes:
+        """Return the icon of a champion from the icon store, downloading it from
+    DataDragon into the store if needed.
+
+    Raises:
+        Exception: Response not 200
+    """
+        content = self.icon_store.get(version, champion_name)
+        if content is not None:
+            self.icon_store.record_hit()
+            return content
+
+        req = self.http_client.get(f"{self.url}/cdn/{version}/img/champion/{champion_name}.png")
+        if req.status_code != 200:
+            raise Exception("Failed to get champion icon from DataDragon")
 
-        return self.champion_icons[champion_name]
+        self.icon_store.record_miss()
+        self.icon_store.put(version, champion_name, req.content)
+        return req.content
@@ -0,0 +1,133 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+
+# Characters fed to the parser at a time, so scanning stops soon after a match
+CHUNK_SIZE = 16 * 1024
+# Opening and closing tags of the elements whose content is not parsed as markup
+RAW_TEXT_TAG = re.compile(r"<(/?)(script|style)\b", re.IGNORECASE)
+
+
+class _ElementTextParser(HTMLParser):
+    """Streaming parser that collects the text of elements matching a tag and
+    attributes. Only the text of matches is kept, no document tree is built.
+    """
+
+    def __init__(self, tag: str, attrs: Dict[str, str], classes: Iterable[str], limit: Optional[int]):
+        super().__init__(convert_charrefs=True)
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = set(classes)
+        self.limit = limit
+        self.texts: List[str] = []
+        self._parts: List[str] = []
+        self._depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self.limit is not None and len(self.texts) >= self.limit
+
+    def _matches(self, attrs) -> bool:
+        attrs = dict(attrs)
+        for name, value in self.attrs.items():
+            if attrs.get(name) != value:
+                return False
+        if self.classes and not self.classes.issubset((attrs.get("class") or "").split()):
+            return False
+        return True
+
+    def handle_starttag(self, tag, attrs):
+        if tag != self.tag or self.done:
+            return
+        if self._depth > 0:
+            self._depth += 1
+        elif self._matches(attrs):
+            self._depth = 1
+            self._parts = []
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == self.tag and self._depth == 0 and not self.done and self._matches(attrs):
+            self.texts.append("")
+
+    def handle_endtag(self, tag):
+        if tag != self.tag or self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            self.texts.append("".join(self._parts))
+
+    def handle_data(self, data):
+        if self._depth > 0:
+            self._parts.append(data)
+
+    def flush(self) -> None:
+        self.close()
+        # Unclosed match at the end of the document
+        if self._depth > 0:
+            self.texts.append("".join(self._parts))
+            self._depth = 0
+
+
+class HtmlExtractor:
+    """Finds the text of specific elements of large HTML pages without building
+    a document tree. Scanning starts shortly before the first occurrence of a hint
+    (an attribute value or class of the element) and stops once enough elements
+    were found. A hint inside a script or style moves the start back to the opening
+    tag of that script or style, so its content is never parsed as markup.
+    """
+
+    @staticmethod
+    def find_text(
+            markup: str,
+            tag: str,
+            attrs: Dict[str, str] = None,
+            classes: Iterable[str] = (),
+    ) -> Optional[str]:
+        """Return the text of the first element matching a tag, attributes (exact
+    values) and classes (all must be present), or None if there is no match.
+    """
+        texts = HtmlExtractor.find_all_text(markup, tag, attrs, classes, limit=1)
+        return texts[0] if texts else None
+
+    @staticmethod
+    def find_all_text(
+            markup: str,
+            tag: str,
+            attrs: Dict[str, str] = None,
+            classes: Iterable[str] = (),
+            limit: int = None
+    ) -> List[str]:
+        """Return the texts of up to limit elements matching a tag, attributes and
+    classes.
+    """
+        attrs = attrs or {}
+        classes = list(classes)
+        hints = list(attrs.values()) + classes
+        start = 0
+        if hints:
+            position = markup.find(hints[0])
+            if position == -1:
+                return []
+            start = HtmlExtractor._scan_start(markup, position)
+
+        parser = _ElementTextParser(tag, attrs, classes, limit)
+        for i in range(start, len(markup), CHUNK_SIZE):
+            parser.feed(markup[i:i + CHUNK_SIZE])
+            if parser.done:
+                break
+        parser.flush()
+        return parser.texts[:limit]
+
+    @staticmethod
+    def _scan_start(markup: str, position: int) -> int:
+        start = max(markup.rfind("<", 0, position), 0)
+        # Follow script and style elements up to the start the way the parser does,
+        # only the matching closing tag ends their content
+        raw_text_start, raw_text_tag = 0, None
+        for match in RAW_TEXT_TAG.finditer(markup, 0, start):
+            closing, tag = match.group(1), match.group(2).lower()
+            if raw_text_tag is None and not closing:
+                raw_text_start, raw_text_tag = match.start(), tag
+            elif raw_text_tag == tag and closing:
+                raw_text_tag = None
+        return start if raw_text_tag is None else raw_text_start
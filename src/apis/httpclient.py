@@ -0,0 +1,106 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from constants import Monsoon
+
+
+@dataclass
+class HttpStats:
+    """Data class for counting requests made through the HTTP client.
+    """
+    requests: int = 0
+    failures: int = 0
+    bytes_received: int = 0
+    # Seconds spent waiting for responses, retries included
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    @property
+    def latency_average(self) -> float:
+        return self.latency_total / self.requests if self.requests else 0.0
+
+    def record(self, bytes_received: int, latency: float, failed: bool) -> None:
+        self.requests += 1
+        self.failures += int(failed)
+        self.bytes_received += bytes_received
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+
+class HttpClient:
+    """Represents the HTTP client shared by every scraper. Keeps connections
+    alive per host, applies timeouts, retries idempotent requests with
+    exponential backoff and limits how many requests run against a host at once.
+    """
+
+    def __init__(
+            self,
+            connect_timeout: float = 5.0,
+            read_timeout: float = 20.0,
+            retries: int = 3,
+            backoff_factor: float = 0.5,
+            max_connections_per_host: int = 8
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections_per_host = max_connections_per_host
+        self.stats = HttpStats()
+        self.host_stats: Dict[str, HttpStats] = dict()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=max_connections_per_host,
+            max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = f"{Monsoon.TITLE}/{Monsoon.VERSION}"
+
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = dict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request. Accepts the keyword arguments of requests.get, the
+    timeout defaults to the configured connect/read timeouts.
+    """
+        host = urlsplit(url).netloc
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        with self._host_semaphore(host):
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+                content_length = len(response.content)
+            except requests.RequestException:
+                self._record(host, 0, time.perf_counter() - start, failed=True)
+                raise
+        self._record(host, content_length, time.perf_counter() - start, failed=response.status_code >= 400)
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_connections_per_host)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _record(self, host: str, bytes_received: int, latency: float, failed: bool) -> None:
+        with self._lock:
+            self.stats.record(bytes_received, latency, failed)
+            self.host_stats.setdefault(host, HttpStats()).record(bytes_received, latency, failed)
@@ -0,0 +1,118 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from utils import EventHandler
+
+
+class IconPrefetcher:
+    """Fetches a batch of icons through a bounded thread pool ahead of time.
+
+    Events are invoked from pool threads, subscribers that touch Qt widgets
+    must forward them to the GUI thread (e.g. through a Signal).
+    - progress_changed: args are a (done, total) tuple
+    - completed: args are True if the prefetch was cancelled
+    """
+
+    def __init__(
+            self,
+            fetch: Callable[[str], bytes],
+            names: List[str],
+            max_workers: int = 8,
+            version: Optional[str] = None
+    ):
+        self.fetch = fetch
+        self.names = list(names)
+        # Patch the icons belong to, so waiting lookups can tell a prefetch of another patch apart
+        self.version = version
+        self.max_workers = max_workers
+        self.total = len(self.names)
+        self.done = 0
+        self.failed = 0
+
+        self.progress_changed = EventHandler()
+        self.completed = EventHandler()
+
+        self._futures: Dict[str, Future] = dict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._futures) and not self._finished.is_set()
+
+    def start(self) -> "IconPrefetcher":
+        """Queue every icon on the thread pool and return immediately.
+    """
+        if self.total == 0:
+            self._finish()
+            return self
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="icon-prefetch")
+        self._executor = executor
+        for name in self.names:
+            future = executor.submit(self._run, name)
+            self._futures[name] = future
+        for future in self._futures.values():
+            future.add_done_callback(self._on_done)
+        # Let queued work drain without blocking the caller
+        executor.shutdown(wait=False)
+        return self
+
+    def cancel(self) -> None:
+        """Stop the prefetch. Icons already downloading are allowed to finish,
+    queued ones are dropped so they never hold up the exit of the process.
+    """
+        self._cancelled.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        for future in list(self._futures.values()):
+            future.cancel()
+
+    def join(self, timeout: float = None) -> bool:
+        """Block until the prefetch finished or was cancelled.
+    """
+        return self._finished.wait(timeout)
+
+    def wait(self, name: str, timeout: float = None) -> Optional[bytes]:
+        """Wait for the icon of a name if it is being prefetched. Returns None if
+    it is not part of the prefetch, was cancelled or failed.
+    """
+        future = self._futures.get(name)
+        if future is None or future.cancelled():
+            return None
+        try:
+            return future.result(timeout)
+        except Exception:
+            return None
+
+    def _run(self, name: str) -> Optional[bytes]:
+        if self._cancelled.is_set():
+            return None
+        try:
+            return self.fetch(name)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logging.debug(f"Failed to prefetch icon {name}: {e}")
+            return None
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self.done += 1
+            progress = (self.done, self.total)
+        self.progress_changed.invoke(self, progress)
+        if progress[0] == self.total:
+            self._finish()
+
+    def _finish(self) -> None:
+        try:
+            self.completed.invoke(self, self.is_cancelled)
+        finally:
+            self._finished.set()
@@ -1,13 +1,31 @@
-import requests
 import json
 import re
-from bs4 import BeautifulSoup
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import DiskCache
+from .htmlextractor import HtmlExtractor
+from .httpclient import HttpClient
 
 
 class LoLalytics:
-    def __init__(self):
-        self.url = "https://lolalytics.com/lol/tierlist/aram/?patch=14"
-        self.champ_url = "https://lolalytics.com/lol/{}/aram/build/?patch=14"
+    def __init__(
+            self,
+            http_client: HttpClient = None,
+            cache: DiskCache = None,
+            base_url: str = "https://lolalytics.com",
+            patch: str = "14",
+            max_workers: int = 4,
+            winrate_ttl: float = 12 * 60 * 60
+    ):
+        self.http_client = http_client or HttpClient()
+        self.cache = cache or DiskCache()
+        self.patch = patch
+        self.url = f"{base_url}/lol/tierlist/aram/?patch={patch}"
+        self.champ_url = f"{base_url}/lol/{{}}/aram/build/?patch={patch}"
+        # Champion page fallback; fetched in parallel and cached per patch
+        self.max_workers = max_workers
+        self.winrate_ttl = winrate_ttl
         self.__champs, self.__champsData = self._fetch_winrate_json()
         self.__winrates_by_champ = self._process_winrate_data()
 
@@ -27,27 +45,26 @@ class LoLalytics:
         Returns:
             dict: dict representation of the json returned
         """
-        response = requests.get(self.url)
+        response = self.http_client.get(self.url)
 
         if response.status_code != 200:
             raise Exception("LoLalytics did not respond 200")
         
         try:
-            soup = BeautifulSoup(response.text, "html.parser")
-            div = soup.find('div', class_='ml-auto text-right')
-            script_tag = soup.find('script', {'type': 'qwik/json'})
+            div_text = HtmlExtractor.find_text(response.text, 'div', classes=('ml-auto', 'text-right'))
+            script_text = HtmlExtractor.find_text(response.text, 'script', {'type': 'qwik/json'})
 
-            if not div or not script_tag:
+            if div_text is None or script_text is None:
                 raise Exception
             
             # process div for avgWR (needed to parse the script json object dynamically)
-            text = div.get_text(strip=True)
+            text = div_text.strip()
             match = re.search(r'(\d+\.\d+)', text)
             if match:
                 avgWR = float(match.group(1))
 
             # process script_tag for the scripted json object
-            json_text = script_tag.string.strip()  
+            json_text = script_text.strip()
             data = json.loads(json_text)
 
             # grab the {champ : ?? id } dictionary
@@ -78,18 +95,19 @@ class LoLalytics:
 
     def _fetch_winrate_for_champ(self, champ) -> float:
         """Visit champion page directly and grab winrate info"""
-        response = requests.get(self.champ_url.format(champ))
+        response = self.http_client.get(self.champ_url.format(champ))
 
         if response.status_code != 200:
             raise Exception("LoLalytics did not respond 200")
         
         try:
-            soup = BeautifulSoup(response.text, "html.parser")
             # Find the specific <p> tag with the given class
-            p_tag = soup.find('p', class_='lolx-links px-2 text-justify text-[14px] leading-normal text-white sm:px-0')
+            p_text = HtmlExtractor.find_text(
+                response.text, 'p',
+                classes='lolx-links px-2 text-justify text-[14px] leading-normal text-white sm:px-0'.split())
 
             # Use regex to find the float before the % symbol
-            match = re.search(r'(\d+\.?\d*)%', p_tag.get_text())
+            match = re.search(r'(\d+\.?\d*)%', p_text)
             if match:
                 return float(match.group(1))
             
@@ -97,8 +115,45 @@ class LoLalytics:
         except:
             raise Exception("Failed to find win rate for {}".format(champ))
 
-        
+    def _fetch_winrates_for_champs(self, champs) -> dict:
+        """Fetch winrates from the champion pages of several champions. Pages are
+    fetched through a bounded thread pool and results are cached per champion
+    and patch for winrate_ttl seconds.
+    """
+        cache_key = f"winrates-{self.patch}.json"
+        content = self.cache.read("lolalytics", cache_key)
+        cached = json.loads(content) if content else {}
+        now = time.time()
+
+        winrates = {}
+        stale = []
+        for champ in champs:
+            entry = cached.get(champ)
+            if entry is not None and now - entry["fetched_at"] < self.winrate_ttl:
+                winrates[champ] = entry["winrate"]
+                self.cache.record_hit()
+            else:
+                stale.append(champ)
+
+        if not stale:
+            return winrates
+
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="lolalytics-champ") as executor:
+            futures = {champ: executor.submit(self._fetch_winrate_for_champ, champ) for champ in stale}
+        for champ, future in futures.items():
+            try:
+                winrates[champ] = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            self.cache.record_miss()
+            cached[champ] = {"winrate": winrates[champ], "fetched_at": now}
 
+        self.cache.write("lolalytics", cache_key, json.dumps(cached).encode("utf-8"))
+        if error is not None:
+            raise error
+        return winrates
 
     def _process_winrate_data(self) -> dict:
         """Process winrate json into dict of cid -> rank, winrate pair"""
@@ -142,8 +197,7 @@ class LoLalytics:
 
         # remaining champs seem to have integer wr that is just missing
         # fetch directly from their champ page
-        for champ in missingInfo:
-            winrates[champ] = self._fetch_winrate_for_champ(champ)
+        winrates.update(self._fetch_winrates_for_champs(sorted(missingInfo)))
 
         wrSorted = sorted([(-wr, champ) for champ, wr in winrates.items()])
 
@@ -151,15 +205,22 @@ class LoLalytics:
             winrates[x[1]] = (rank, winrates[x[1]])
         return winrates
 
+    @property
+    def winrates(self) -> dict:
+        """LoLalytics key ("missfortune") -> (rank, winrate) of every champion."""
+        return self.__winrates_by_champ
+
+    @staticmethod
+    def format_winrate(rank, winrate) -> str:
+        return "Rank: {}\nWinrate: {}".format(rank, winrate)
+
     def fetch_winrate_by_champion(self, champ) -> str:
         """Return formated rank, winrate data for a champion"""
-        def format(rank, winrate) -> str:
-            return "Rank: {}\nWinrate: {}".format(rank, winrate)
-        if id in self.__winrates_by_champ:
-            return format(*self.__winrates_by_champ[champ])
+        if champ in self.__winrates_by_champ:
+            return self.format_winrate(*self.__winrates_by_champ[champ])
         fallback = champ.strip().lower().replace(" ", "").replace("\'", "")
         if fallback in self.__winrates_by_champ:
-            return format(*self.__winrates_by_champ[fallback])
+            return self.format_winrate(*self.__winrates_by_champ[fallback])
         return ""
 
 if __name__ == "__main__":
@@ -1,19 +1,124 @@
-import lupa
-import requests
-from bs4 import BeautifulSoup
-from lupa import LuaRuntime
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 
-from models import DynamicBalanceModel, BalanceLever
+from constants import FandomFetchModes
+from models import DynamicBalanceModel
+from utils import DiskCache, Stopwatch
+from .championregistry import ChampionRegistry
+from .htmlextractor import HtmlExtractor
+from .httpclient import HttpClient
 from .lolalytics import LoLalytics
+from .luatableparser import LuaTableParser, LuaParseError
 
 
 class LolFandom:
-    def __init__(self):
-        self.url = "https://leagueoflegends.fandom.com"
-        # Upstream; parses from Lua data module
-        self.__championdata_module = self._fetch_championdata_module()
-        self.__LoLalytics = LoLalytics()
-        self.__dynamic_balances_by_key = self._process_championdata_module()
+    MODULE = "Module:ChampionData/data"
+    # Bumped whenever the fields kept of the module change, invalidating stored champion data
+    CHAMPIONDATA_FORMAT = 2
+
+    def __init__(
+            self,
+            http_client: HttpClient = None,
+            cache: DiskCache = None,
+            url: str = "https://leagueoflegends.fandom.com",
+            lolalytics_url: str = "https://lolalytics.com",
+            fetch_mode: FandomFetchModes = FandomFetchModes.REVISION,
+            dynamic_balances: Dict[str, DynamicBalanceModel] = None,
+            revision: int = None
+    ):
+        self.url = url
+        self.lolalytics_url = lolalytics_url
+        self.http_client = http_client or HttpClient()
+        self.cache = cache or DiskCache()
+        self.fetch_mode = fetch_mode
+        # Revision id of the module processed, None when unknown
+        self.revision = revision
+        self.stopwatch = Stopwatch()
+        # Sources the balances were joined from, None for snapshot data
+        self.__championdata: Optional[dict] = None
+        self.__LoLalytics: Optional[LoLalytics] = None
+        # Refreshes rebuild one source each, one at a time
+        self._refresh_lock = threading.Lock()
+        if dynamic_balances is not None:
+            # Already joined data of a snapshot, nothing to fetch
+            self.__registry = ChampionRegistry.from_balances(dynamic_balances)
+            return
+        # LoLalytics does not depend on the Fandom module, so both are fetched at
+        # once and only joined where winrates are needed
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="lolalytics") as executor:
+            lolalytics = executor.submit(self._create_lolalytics)
+            # Upstream; parses from Lua data module
+            revision, championdata = self._load_championdata()
+            with self.stopwatch.measure("lolfandom.wait_lolalytics"):
+                lolalytics = lolalytics.result()
+        with self.stopwatch.measure("lolfandom.join"):
+            self._swap(revision, championdata, self._process_championdata_module(championdata, lolalytics), lolalytics)
+
+    @property
+    def dynamic_balances(self) -> Dict[str, DynamicBalanceModel]:
+        return self.__registry.balances_by_name
+
+    @property
+    def registry(self) -> ChampionRegistry:
+        return self.__registry
+
+    def refresh_championdata(self) -> bool:
+        """Check for a new revision of Module:ChampionData and swap in balances
+    joined from it. In page mode the module is fetched on every check.
+
+    Returns:
+        bool: Whether balances were swapped in.
+    """
+        with self._refresh_lock:
+            if self.fetch_mode == FandomFetchModes.PAGE or self.__championdata is None:
+                revision, championdata = self._load_championdata()
+            else:
+                revision = self._fetch_championdata_revision()
+                if revision is None or revision == self.revision:
+                    return False
+                championdata = self._load_championdata_revision(revision)
+            lolalytics = self.__LoLalytics
+            if lolalytics is None:
+                # Snapshot data keeps its winrates until refresh_winrates fetches
+                # the tierlist, which is never downloaded twice in a row
+                registry = self.__registry.join(championdata)
+            else:
+                registry = self._process_championdata_module(championdata, lolalytics)
+            self._swap(revision, championdata, registry, lolalytics)
+            return True
+
+    def refresh_winrates(self) -> bool:
+        """Fetch the LoLalytics tierlist again and swap in balances joined with it.
+
+    Returns:
+        bool: Whether any balance changed.
+    """
+        with self._refresh_lock:
+            lolalytics = self._create_lolalytics()
+            revision, championdata = self.revision, self.__championdata
+            if championdata is None:
+                revision, championdata = self._load_championdata()
+            previous = self.__registry.balances
+            self._swap(revision, championdata, self._process_championdata_module(championdata, lolalytics), lolalytics)
+            return self.__registry.balances != previous
+
+    def _swap(self, revision: Optional[int], championdata: dict, registry: ChampionRegistry,
+              lolalytics: Optional[LoLalytics]) -> None:
+        # The registry is built in full before a single assignment swaps it in,
+        # lookups see either the old or the new balances and never wait
+        self.__championdata = championdata
+        self.__LoLalytics = lolalytics
+        self.revision = revision
+        self.__registry = registry
+
+    def fetch_dynamic_balance_by_champion_id(self, champion_id: int) -> Optional[DynamicBalanceModel]:
+        """Finds a DynamicBalanceModel instance for a numeric champion id, the key
+    of DataDragon and champion select sessions. May return None as not all
+    champions have balance changes applied in ARAM.
+    """
+        return self.__registry.balance(champion_id)
 
     def fetch_dynamic_balance_by_champion_name(self, name) -> DynamicBalanceModel:
         """Finds a DynamicBalanceModel instance for a champion name. May return None
@@ -26,8 +131,11 @@ class LolFandom:
         DynamicBalanceModel: Represents the dynamic balance changes for a 
         champion in ARAM from Module:ChampionData.
     """
-        value = self.__dynamic_balances_by_key.get(name)
-        return value
+        registry = self.__registry
+        champion_id = registry.resolve(name)
+        if champion_id is None:
+            return None
+        return registry.balance(champion_id)
 
     def _fetch_championdata_module(self) -> str:
         """Fetch Module:ChampionData from LoL Fandom that contains ARAM balance
@@ -40,72 +148,150 @@ class LolFandom:
     Returns:
         str: Raw Lua code which itself returns table of champion statistics.
     """
-        req = requests.get(f"{self.url}/wiki/Module:ChampionData/data")
+        req = self.http_client.get(f"{self.url}/wiki/Module:ChampionData/data")
 
         if req.status_code != 200:
             raise Exception("Failed to get Module:ChampionData from LoL Fandom")
 
-        soup = BeautifulSoup(req.text, "html.parser")
-        select = soup.select("pre.mw-code")
+        select = HtmlExtractor.find_all_text(req.text, "pre", classes=["mw-code"], limit=2)
         if len(select) != 1:
             raise Exception("Failed to select Module:ChampionData from LoL Fandom")
 
-        championdata_module = select[0].text
+        championdata_module = select[0]
         return championdata_module
 
-    def _process_championdata_module(self):
-        """Process ChampionData modue by parsing Lua data table into dict of dynamic
-    balances.
+    def _load_championdata(self) -> Tuple[Optional[int], dict]:
+        """Load the champion data of Module:ChampionData. In revision mode the data
+    processed from a revision is kept on disk, so the module is only downloaded
+    and parsed again once the wiki has a newer revision.
+
+    Returns:
+        Tuple[Optional[int], dict]: Revision id, None when unknown, and champion
+        name -> {"id": ..., "apiname": ..., "stats": {"aram": {...}}}
+    """
+        if self.fetch_mode == FandomFetchModes.PAGE:
+            with self.stopwatch.measure("lolfandom.fetch"):
+                championdata_module = self._fetch_championdata_module()
+            with self.stopwatch.measure("lolfandom.parse"):
+                return None, self._select_championdata(self._evaluate_championdata_module(championdata_module))
+
+        with self.stopwatch.measure("lolfandom.revision"):
+            revision = self._fetch_championdata_revision()
+        return revision, self._load_championdata_revision(revision)
+
+    def _load_championdata_revision(self, revision: Optional[int]) -> dict:
+        championdata = self._read_championdata(revision)
+        if championdata is not None:
+            self.cache.record_hit()
+            return championdata
+
+        self.cache.record_miss()
+        with self.stopwatch.measure("lolfandom.fetch"):
+            championdata_module = self._fetch_championdata_source(revision)
+        with self.stopwatch.measure("lolfandom.parse"):
+            championdata = self._select_championdata(self._evaluate_championdata_module(championdata_module))
+        if revision is not None:
+            self.cache.write("lolfandom", "championdata.json", json.dumps(championdata).encode("utf-8"),
+                             {"revision": revision, "format": self.CHAMPIONDATA_FORMAT})
+        return championdata
+
+    def _fetch_championdata_revision(self) -> Optional[int]:
+        """Fetch the id of the current revision of Module:ChampionData through the
+    MediaWiki API.
+
+    Returns:
+        int: Revision id, or None if the API did not answer with one.
+    """
+        req = self.http_client.get(
+            f"{self.url}/api.php?action=query&prop=revisions&titles={self.MODULE}"
+            f"&rvprop=ids&format=json&formatversion=2")
+
+        if req.status_code != 200:
+            return None
+
+        try:
+            return int(req.json()["query"]["pages"][0]["revisions"][0]["revid"])
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+
+    def _fetch_championdata_source(self, revision: Optional[int]) -> str:
+        """Fetch the raw Lua source of Module:ChampionData, at a revision when
+    known so the source matches the revision id it is stored under.
+
+    Raises:
+        Exception: Response not 200
+
+    Returns:
+        str: Raw Lua code which itself returns table of champion statistics.
+    """
+        url = f"{self.url}/index.php?title={self.MODULE}&action=raw"
+        if revision is not None:
+            url += f"&oldid={revision}"
+        req = self.http_client.get(url)
+
+        if req.status_code != 200:
+            raise Exception("Failed to get Module:ChampionData source from LoL Fandom")
+
+        req.encoding = "utf-8"
+        return req.text
+
+    def _read_championdata(self, revision: Optional[int]) -> Optional[dict]:
+        """Return the champion data stored for a revision, or None if a different
+    revision (or nothing) is stored.
     """
+        metadata = self.cache.read_metadata("lolfandom", "championdata.json")
+        if revision is None or metadata.get("revision") != revision \
+                or metadata.get("format") != self.CHAMPIONDATA_FORMAT:
+            return None
 
-        # Setup attribute handler to protect Python space from Lua
-        def filter_attribute_access(obj, attr_name, is_setting):
-            raise AttributeError("access denied")
-
-        # Setup Lua runtime
-        lua = LuaRuntime(
-            unpack_returned_tuples=True,
-            attribute_filter=filter_attribute_access,
-            register_eval=False)
-        # Block access to dangerous functions in Lua space
-        for key in list(lua.globals()):
-            if key != "_G":
-                del lua.globals()[key]
-                # Sanitize and format Lua code
-        code = self.__championdata_module.strip()
-        code = code.replace("return", "")
-        code = code.replace("function", "")
-        code = code.replace("(", "")
-        code = code.replace(")", "")
-        code = code.replace("-- <pre>", "")
-        code = code.replace("-- </pre>", "")
-        code = code.replace("-- [[Category:Lua]]", "")
-        # Run Lua table
-        table = lua.eval(code)
-        # Ensure a Lua table is actually returned as a security precaution
-        if lupa.lua_type(table) != "table":
-            raise Exception("Failed to evaluate Module:ChampionData, stopping as security precaution")
-
-        # Transform into list of (key, value) tuples
-        items = list(table.items())
-        dynamic_balances = {}
-        # Create dynamic balance model data for each champion
-        for kv_tuple in items:
-            champion_id = kv_tuple[1]["id"]
-            champion_name = kv_tuple[0]
-            rank_winrate = self.__LoLalytics.fetch_winrate_by_champion(champion_name)
-            aram_stats = kv_tuple[1]["stats"]["aram"] or {}
-    
-            balance_items = list(aram_stats.items())
-            balance_levers = []
-            for balance_tuple in balance_items:
-                balance_levers.append(BalanceLever(balance_tuple[0], balance_tuple[1]))
-            # Insert new model into dictionary
-            dynamic_balances.update({champion_name: DynamicBalanceModel(
-                champion_id=champion_id,
-                rank_winrate=rank_winrate,
-                champion_name=champion_name,
-                balance_levers=balance_levers
-            )})
-
-        return dynamic_balances
+        content = self.cache.read("lolfandom", "championdata.json")
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+    def _create_lolalytics(self) -> LoLalytics:
+        with self.stopwatch.measure("lolalytics"):
+            return LoLalytics(self.http_client, self.cache, base_url=self.lolalytics_url)
+
+    def _evaluate_championdata_module(self, championdata_module: str) -> dict:
+        """Parse the Lua data table of the ChampionData module. The table literal is
+    parsed straight into Python values, no Lua code is run.
+
+    Raises:
+        Exception: Module is not a table of champions
+
+    Returns:
+        dict: Champion name -> {"id": ..., "stats": {"aram": {...}}, ...}
+    """
+        try:
+            table = LuaTableParser.parse(championdata_module)
+        except LuaParseError as e:
+            raise Exception(f"Failed to parse Module:ChampionData: {e}")
+
+        if not isinstance(table, dict):
+            raise Exception("Failed to parse Module:ChampionData, expected a table of champions")
+
+        return table
+
+    @staticmethod
+    def _select_championdata(table: dict) -> dict:
+        """Keep only the fields of the module used for dynamic balances.
+    """
+        championdata = {}
+        for champion_name, champion in table.items():
+            championdata[champion_name] = {
+                "id": champion["id"],
+                # DataDragon id of the champion, an alias of its name
+                "apiname": champion.get("apiname"),
+                "stats": {"aram": champion.get("stats", {}).get("aram")}
+            }
+        return championdata
+
+    def _process_championdata_module(self, championdata: dict, lolalytics: LoLalytics) -> ChampionRegistry:
+        """Process ChampionData module data into a registry of dynamic balances
+    joined with LoLalytics winrates by numeric champion id.
+    """
+        return ChampionRegistry.from_sources(championdata, lolalytics.winrates)
@@ -0,0 +1,252 @@
+import re
+from operator import itemgetter
+from typing import List
+
+# Whitespace and comments, then one token: a long string, symbol, string, name,
+# number or the end of the source, the frequent tokens of table constructors
+# first. Any other character is returned on its own and rejected by the parser.
+_TOKEN_PATTERN = re.compile(r"""\s*(?:--(?:\[(=*)\[.*?\]\1\]|[^\n]*)\s*)*
+(   \[(=*)\[.*?\]\3\]
+  | [][{}=,;()]
+  | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+  | [A-Za-z_]\w*
+  | 0[xX][0-9a-fA-F]+
+  | (?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?
+  | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+  | \.\.|//|\S|\Z
+)""", re.VERBOSE | re.DOTALL | re.ASCII)
+_TOKEN = itemgetter(1)
+
+_ESCAPE_PATTERN = re.compile(r"\\(x[0-9a-fA-F]{2}|u\{[0-9a-fA-F]+\}|\d{1,3}|z\s*|\n|.)", re.DOTALL)
+_ESCAPES = {"a": "\a", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v",
+            "\\": "\\", "\"": "\"", "'": "'", "\n": "\n"}
+
+_KEYWORDS = {"nil", "true", "false", "return", "function", "local", "end", "and", "or", "not"}
+# Tokens that end a field of a table constructor
+_SEPARATORS = {",", ";", "}"}
+
+# Binary operators and their (left, right) binding powers, as in the Lua manual
+_BINARY_OPERATORS = {
+    "..": (9, 8),
+    "+": (10, 10), "-": (10, 10),
+    "*": (11, 11), "/": (11, 11), "//": (11, 11), "%": (11, 11),
+    "^": (14, 13),
+}
+_UNARY_PRIORITY = 12
+
+
+class LuaParseError(Exception):
+    pass
+
+
+class LuaTableParser:
+    """Parses Lua source made of a single returned table constructor into Python
+    values, without running any Lua. Supports tables, strings, numbers, booleans
+    and nil along with constant arithmetic and concatenation. Anything else
+    (functions, variables, calls) is rejected.
+
+    Tables with only consecutive integer keys starting at 1 become lists, other
+    tables become dicts. Fields set to nil are left out, as in Lua.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = self._tokenize(source)
+        self.position = 0
+
+    @staticmethod
+    def parse(source: str):
+        """Return the value returned by Lua source (a "return { ... }" chunk or a
+    bare expression).
+
+    Raises:
+        LuaParseError: Source is not a supported Lua literal
+    """
+        parser = LuaTableParser(source)
+        if parser.tokens[0] == "return":
+            parser.position += 1
+        value = parser._expression()
+        if parser.tokens[parser.position] == ";":
+            parser.position += 1
+        if parser.tokens[parser.position] != "":
+            parser._error("Expected end of source")
+        return value
+
+    @staticmethod
+    def _tokenize(source: str) -> List[str]:
+        # Tokens are told apart by their first character. The source ends with ""
+        # twice, so looking one token ahead never runs past the end
+        tokens = list(map(_TOKEN, _TOKEN_PATTERN.findall(source)))
+        while tokens and tokens[-1] == "":
+            tokens.pop()
+        tokens += ["", ""]
+        return tokens
+
+    def _error(self, message: str):
+        # Offsets are only worked out when reporting an error
+        offsets = [x.start(2) for x in _TOKEN_PATTERN.finditer(self.source)]
+        offset = offsets[self.position] if self.position < len(offsets) else len(self.source)
+        line = self.source.count("\n", 0, offset) + 1
+        raise LuaParseError(f"{message} at line {line}")
+
+    def _expect(self, symbol: str) -> None:
+        if self.tokens[self.position] != symbol:
+            self._error(f"Expected {symbol!r}")
+        self.position += 1
+
+    def _expression(self, limit: int = 0):
+        if self.tokens[self.position] == "-":
+            self.position += 1
+            value = self._arithmetic("-", 0, self._expression(_UNARY_PRIORITY))
+        else:
+            value = self._simple_expression()
+
+        while True:
+            operator = self.tokens[self.position]
+            if operator not in _BINARY_OPERATORS:
+                return value
+            left, right = _BINARY_OPERATORS[operator]
+            if left <= limit:
+                return value
+            self.position += 1
+            value = self._arithmetic(operator, value, self._expression(right))
+
+    def _simple_expression(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        first = token[:1]
+        if first == '"' or first == "'":
+            if len(token) < 2 or token[-1] != first:
+                self.position -= 1
+                self._error("Unfinished string")
+            return self._unescape(token[1:-1])
+        if first == "{":
+            return self._table()
+        if first.isdigit() or (first == "." and token[1:2].isdigit()):
+            if token[:2] in ("0x", "0X"):
+                return int(token, 16)
+            if "." in token or "e" in token or "E" in token:
+                return float(token)
+            return int(token)
+        if first == "[" and len(token) > 1:
+            level = token.index("[", 1) + 1
+            content = token[level:-level]
+            # A newline right after the opening bracket is skipped
+            if content.startswith("\r\n"):
+                return content[2:]
+            return content[1:] if content.startswith("\n") else content
+        if token == "nil":
+            return None
+        if token == "true":
+            return True
+        if token == "false":
+            return False
+        if token == "(":
+            value = self._expression()
+            self._expect(")")
+            return value
+        self.position -= 1
+        self._error(f"Unsupported expression {token!r}")
+
+    def _table(self):
+        # Opening brace already consumed
+        tokens = self.tokens
+        fields = {}
+        index = 1
+        while tokens[self.position] != "}":
+            token = tokens[self.position]
+            if token == "[":
+                self.position += 1
+                key = self._simple_expression() if tokens[self.position + 1] == "]" else self._expression()
+                self._expect("]")
+                self._expect("=")
+                if key is None:
+                    self._error("Table index is nil")
+                self._set(fields, key, self._field_value())
+            elif (token[:1].isalpha() or token[:1] == "_") and token not in _KEYWORDS \
+                    and tokens[self.position + 1] == "=":
+                self.position += 2
+                self._set(fields, token, self._field_value())
+            else:
+                self._set(fields, index, self._field_value())
+                index += 1
+
+            separator = tokens[self.position]
+            if separator == "," or separator == ";":
+                self.position += 1
+            elif separator != "}":
+                self._error("Expected ',' or '}'")
+        self.position += 1
+
+        if fields and all(type(x) is int for x in fields) and sorted(fields) == list(range(1, len(fields) + 1)):
+            return [fields[x] for x in range(1, len(fields) + 1)]
+        return fields
+
+    def _field_value(self):
+        # Most values are a single literal, which needs no operator lookup when
+        # a separator follows
+        token = self.tokens[self.position]
+        if self.tokens[self.position + 1] in _SEPARATORS and token != "{" and token != "-":
+            return self._simple_expression()
+        return self._expression()
+
+    @staticmethod
+    def _set(fields: dict, key, value) -> None:
+        # Lua normalizes float keys with an integral value (1.0 -> 1)
+        if isinstance(key, float) and key.is_integer():
+            key = int(key)
+        if value is None:
+            fields.pop(key, None)
+        else:
+            fields[key] = value
+
+    def _arithmetic(self, operator: str, left, right):
+        if operator == "..":
+            if not all(isinstance(x, (str, int, float)) and not isinstance(x, bool) for x in (left, right)):
+                self._error("Attempt to concatenate a non-string value")
+            return f"{self._format_number(left)}{self._format_number(right)}"
+        if not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in (left, right)):
+            self._error(f"Attempt to perform arithmetic with {operator!r} on a non-number value")
+        try:
+            if operator == "+":
+                return left + right
+            if operator == "-":
+                return left - right
+            if operator == "*":
+                return left * right
+            if operator == "/":
+                return left / right
+            if operator == "//":
+                return left // right
+            if operator == "%":
+                return left % right
+            return float(left) ** right
+        except ZeroDivisionError:
+            self._error("Division by zero")
+
+    @staticmethod
+    def _format_number(value) -> str:
+        if isinstance(value, float) and value.is_integer():
+            return f"{value:.1f}"
+        return str(value)
+
+    @staticmethod
+    def _unescape(text: str) -> str:
+        if "\\" not in text:
+            return text
+
+        def replace(match):
+            escape = match.group(1)
+            if escape[0] == "x":
+                return chr(int(escape[1:], 16))
+            if escape[0] == "u":
+                return chr(int(escape[2:-1], 16))
+            if escape[0].isdigit():
+                return chr(int(escape))
+            if escape[0] == "z":
+                return ""
+            if escape in _ESCAPES:
+                return _ESCAPES[escape]
+            raise LuaParseError(f"Invalid escape sequence \\{escape}")
+
+        return _ESCAPE_PATTERN.sub(replace, text)
@@ -0,0 +1,26 @@
+from PySide6 import QtCore, QtGui
+
+
+class SpriteAtlas:
+    """Represents a decoded DataDragon sprite sheet (img/sprite/champion0.png)
+    that individual champion icons are sliced out of locally.
+    """
+
+    def __init__(self, content: bytes):
+        self.image = QtGui.QImage.fromData(content)
+        if self.image.isNull():
+            raise Exception("Failed to decode sprite atlas")
+
+    def slice(self, x: int, y: int, w: int, h: int) -> bytes:
+        """Return the region of the atlas as PNG encoded bytes.
+    """
+        if x < 0 or y < 0 or x + w > self.image.width() or y + h > self.image.height():
+            raise Exception("Sprite region is outside of the atlas")
+
+        region = self.image.copy(x, y, w, h)
+        data = QtCore.QByteArray()
+        buffer = QtCore.QBuffer(data)
+        buffer.open(QtCore.QIODevice.WriteOnly)
+        region.save(buffer, "PNG")
+        buffer.close()
+        return bytes(data)
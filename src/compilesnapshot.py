@@ -0,0 +1,36 @@
+"""Compiles the champion data snapshot bundled with the build. Runs the full
+ApiService pipeline against the upstream websites and writes the joined data,
+so a fresh install can show champion data before any upstream answered.
+
+Usage: python src/compilesnapshot.py [--output FILE]
+"""
+import argparse
+import logging
+import os
+
+from apis import ChampionSnapshot, HttpClient, SNAPSHOT_RESOURCE
+from services import ApiService
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", default=SNAPSHOT_RESOURCE, help="file to write the snapshot to")
+    args = parser.parse_args()
+
+    http_client = HttpClient()
+    api_service = ApiService(http_client=http_client, use_snapshot=False)
+    # Icons are not part of the snapshot
+    if api_service.data_dragon.icon_prefetcher is not None:
+        api_service.data_dragon.icon_prefetcher.cancel()
+
+    snapshot = ChampionSnapshot.capture(api_service.data_dragon, api_service.lol_fandom)
+    snapshot.save(args.output)
+    http_client.close()
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB): patch {snapshot.version}, "
+          f"{len(snapshot.champions['data'])} champions, {len(snapshot.dynamic_balances)} dynamic balances, "
+          f"module revision {snapshot.revision}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -10,6 +10,8 @@ class Monsoon:
             "properties are trademarks or registered trademarks of Riot Games, Inc. "
     WIDTH = 1280
     HEIGHT = 720
+    # Size champion icons are displayed at, in pixels
+    CHAMPION_ICON_SIZE = 80
 
 
 class Workers(Enum):
@@ -17,5 +19,30 @@ class Workers(Enum):
     LCU_EVENT_PROCESSOR = 1
 
 
+class IconModes(Enum):
+    # One img/champion/{name}.png request per champion, full resolution
+    FULL = 0
+    # Icons sliced from the img/sprite/champion*.png atlases
+    SPRITE = 1
+
+
+class FandomFetchModes(Enum):
+    # Rendered wiki page of the module, downloaded and parsed on every start
+    PAGE = 0
+    # Raw module source, only downloaded and parsed when its revision changed
+    REVISION = 1
+
+
+class FreshnessStates(Enum):
+    # Confirmed current by the last check of the source
+    FRESH = 0
+    # Persisted data that was not checked yet
+    STALE = 1
+    # The last check failed, persisted data is used until a check succeeds
+    OFFLINE = 2
+
+
 class SettingsSchema:
     DEFAULT = ("", "")
+    # Directory the League client writes its lockfile to, empty for the default of the platform
+    LEAGUE_INSTALL_PATH = ("league_install_path", "")
@@ -1,10 +1,13 @@
 from PySide6 import QtWidgets
 from dependency_injector import containers, providers
 
+from apis import HttpClient
+from utils import PixmapCache, Tracer
 from services import (
     ApplicationHostService,
     WorkerService,
     ApiService,
+    ChampionSelectService,
     SettingsContextService
 )
 from viewmodels import AboutWindowViewModel, SystemTrayViewModel, AppWindowViewModel
@@ -17,8 +20,12 @@ class Container(containers.DeclarativeContainer):
   """
 
     # Services
+    http_client = providers.ThreadSafeSingleton(HttpClient)
+    pixmap_cache = providers.ThreadSafeSingleton(PixmapCache)
+    tracer = providers.ThreadSafeSingleton(Tracer)
     settings_context_service = providers.ThreadSafeSingleton(SettingsContextService)
     api_service = providers.ThreadSafeSingleton(ApiService)
+    champion_select_service = providers.ThreadSafeSingleton(ChampionSelectService)
     application_host_service = providers.ThreadSafeSingleton(ApplicationHostService)
     worker_service = providers.ThreadSafeSingleton(WorkerService)
 
@@ -1,3 +1,7 @@
 from .balancelever import *
 from .championselectsessionmodel import *
+from .championslotchangemodel import *
 from .dynamicbalancemodel import *
+from .championselectresultmodel import *
+from .lockfilemodel import *
+from .sourcefreshnessmodel import *
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+from models import ChampionSlotChangeModel, DynamicBalanceModel
+
+
+@dataclass(frozen=True)
+class ChampionSelectResultModel:
+    """Data class holding the dynamic balances, icons included, resolved for a
+    champion select session. Balances are copies owned by the result.
+    """
+    # Sequence number of the session event the result was resolved from
+    sequence: int
+    team_champion_dynamic_balances: Tuple[DynamicBalanceModel, ...]
+    available_champion_dynamic_balances: Tuple[DynamicBalanceModel, ...]
+    # Slots whose balance differs from the previously emitted result
+    changes: Tuple[ChampionSlotChangeModel, ...] = ()
+    # Latency trace of the session event, 0 if untraced
+    trace_id: int = 0
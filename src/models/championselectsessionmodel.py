@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 
 from lcu_driver.events.responses import WebsocketEventResponse
@@ -12,9 +12,11 @@ class ChampionSelectSessionModel:
     team_champion_ids: List[int]
     is_bench_enabled: bool
     websocket_event_type: str
+    # Id of the latency trace started when the event was received, 0 if untraced
+    trace_id: int = field(default=0, compare=False)
 
     @classmethod
-    def from_websocket_event_response(cls, event: WebsocketEventResponse):
+    def from_websocket_event_response(cls, event: WebsocketEventResponse, trace_id: int = 0):
         bench_champions = event.data["benchChampions"]
         available_champion_ids = None
         if bench_champions:
@@ -27,5 +29,6 @@ class ChampionSelectSessionModel:
             available_champion_ids=available_champion_ids,
             team_champion_ids=team_champion_ids,
             is_bench_enabled=is_bench_enabled,
-            websocket_event_type=websocket_event_type
+            websocket_event_type=websocket_event_type,
+            trace_id=trace_id
         )
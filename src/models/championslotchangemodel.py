@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ChampionSlotChangeModel:
+    """Data class for a champion select slot whose balance changed between two
+    results, either to another champion or to fresh data of the same champion.
+    """
+    # The group of the slot ("team", "bench")
+    group: str
+    # Position of the slot among the balances shown for its group
+    slot: int
+    # Champion id before the change, None if the slot did not exist
+    previous_champion_id: Optional[int]
+    # Champion id after the change, None if the slot no longer exists
+    champion_id: Optional[int]
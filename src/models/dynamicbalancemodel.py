@@ -14,6 +14,8 @@ class DynamicBalanceModel:
     champion_name: str
     balance_levers: List[BalanceLever]
     champion_icon: Optional[bytes] = None
+    # DataDragon patch the icon belongs to, part of its key in the pixmap cache
+    champion_icon_version: Optional[str] = None
 
     def _format_champion_name(self) -> str:
         return f"{self.champion_name}"
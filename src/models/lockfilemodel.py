@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LockfileModel:
+    """Data class for the lockfile the League client writes to its install
+    directory while it runs, telling where its API listens.
+    """
+    # Name of the process that wrote the lockfile ("LeagueClient")
+    process_name: str
+    pid: int
+    # Port of the API on localhost
+    port: int
+    # Password of the riot user the API authenticates
+    password: str
+    # Protocol of the API ("https")
+    protocol: str
+
+    @classmethod
+    def from_string(cls, content: str):
+        """Parse the contents of a lockfile, "name:pid:port:password:protocol".
+
+    Raises:
+        Exception: Lockfile is incomplete, e.g. still being written
+
+    Returns:
+        LockfileModel
+    """
+        parts = content.strip().split(":")
+        if len(parts) != 5 or not all(parts):
+            raise Exception("Lockfile is incomplete")
+        try:
+            return cls(
+                process_name=parts[0],
+                pid=int(parts[1]),
+                port=int(parts[2]),
+                password=parts[3],
+                protocol=parts[4]
+            )
+        except ValueError:
+            raise Exception("Lockfile is incomplete")
+
+    @property
+    def connection_string(self) -> str:
+        # lcu-driver reads the pid of the client process from the first field
+        return f"{self.pid}:{self.pid}:{self.port}:{self.password}:{self.protocol}"
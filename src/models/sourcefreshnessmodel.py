@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from constants import FreshnessStates
+
+
+@dataclass(frozen=True)
+class SourceFreshnessModel:
+    """Data class for how current the data of an upstream source is.
+    """
+    # Name of the source ("datadragon", "lolfandom", "lolalytics")
+    source: str
+    state: FreshnessStates
+    # Unix time the data was last confirmed current upstream, None if never
+    updated_at: Optional[float]
+    # Message of the error of the last check, None if it succeeded
+    error: Optional[str] = None
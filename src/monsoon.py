@@ -1,4 +1,5 @@
 import logging
+import os
 
 from dependency_injector.wiring import Provide, inject
 
@@ -6,7 +7,8 @@ import services
 import viewmodels
 import views
 from container import Container
-from services import ApplicationHostService
+from constants import Workers
+from services import ApplicationHostService, LcuSessionRecorder
 
 
 @inject
@@ -23,5 +25,13 @@ if __name__ == "__main__":
     container = Container()
     container.init_resources()
     container.wire(modules=[__name__], packages=[services, views, viewmodels])
+    # Champion select latency spans are appended to this JSONL file when set
+    trace_path = os.environ.get("MONSOON_TRACE")
+    if trace_path:
+        container.tracer().dump_to(trace_path)
+    # Champion select websocket events are recorded to this gzip JSONL file when set
+    record_path = os.environ.get("MONSOON_RECORD_SESSIONS")
+    if record_path:
+        container.worker_service().get(Workers.LCU_EVENT_PROCESSOR).recorder = LcuSessionRecorder(record_path)
 
     main()
@@ -1,4 +1,8 @@
 from .apiservice import *
 from .applicationhostservice import *
+from .championselectcoalescer import *
+from .championselectservice import *
+from .lcusessionlog import *
+from .refreshscheduler import *
 from .settingscontextservice import *
 from .workerservice import *
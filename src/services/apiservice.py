@@ -1,16 +1,168 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 if TYPE_CHECKING:
-    pass
+    from apis import HttpClient
 
-from apis import DataDragon, LolFandom
+from apis import ChampionSnapshot, DataDragon, LolFandom
+from constants import FreshnessStates
+from models import SourceFreshnessModel
+from utils import EventHandler, Stopwatch
+from .refreshscheduler import RefreshScheduler
+
+from PySide6.QtCore import QObject, Signal
+from concurrent.futures import ThreadPoolExecutor
+from dependency_injector.wiring import Provide, inject
+import logging
+import time
+
+
+class ApiServicePort(QObject):
+    freshness_signal = Signal(SourceFreshnessModel)
+
+    def __init__(self):
+        super().__init__()
 
 
 class ApiService:
+    """Serves champion data joined from DataDragon, the LoL Fandom wiki and
+    LoLalytics. With use_snapshot, startup never waits on an upstream: data
+    starts from the newest of the last good data and the bundled snapshot (or
+    empty without either), every source is revalidated in the background once
+    refreshing starts, and the last good data is saved after every successful
+    check. Sources that cannot be reached keep their data and are marked offline.
+    """
+    # Source -> seconds between two checks for updates of it
+    REFRESH_INTERVALS = {
+        # New patches, through a conditional request for versions.json
+        "datadragon": 30 * 60,
+        # New revisions of Module:ChampionData
+        "lolfandom": 60 * 60,
+        # LoLalytics tierlist
+        "lolalytics": 3 * 60 * 60
+    }
+
+    @inject
     def __init__(
-            self
+            self,
+            http_client: HttpClient = Provide["http_client"],
+            use_snapshot: bool = True,
+            data_dragon_options: Optional[dict] = None,
+            lol_fandom_options: Optional[dict] = None,
+            refresh_intervals: Optional[Dict[str, float]] = None
     ):
-        self.data_dragon = DataDragon()
-        self.lol_fandom = LolFandom()
+        self.http_client = http_client
+        # Extra keyword arguments of the sources, such as their urls and caches
+        self.data_dragon_options = data_dragon_options or {}
+        self.lol_fandom_options = lol_fandom_options or {}
+        self.use_snapshot = use_snapshot
+        self.stopwatch = Stopwatch()
+        # Invoked with the name of a source once its fresh data was swapped in
+        self.refreshed = EventHandler()
+        # Created on the GUI thread, so freshness changed by the scheduler is queued to it
+        self.com = ApiServicePort()
+        self._freshness: Dict[str, SourceFreshnessModel] = dict()
+        # Checks the sources for updates while the app runs, see start_refresh
+        self.scheduler = RefreshScheduler()
+        intervals = dict(ApiService.REFRESH_INTERVALS, **(refresh_intervals or {}))
+        self.scheduler.add("datadragon", intervals["datadragon"],
+                           lambda: self._check("datadragon", lambda: self.data_dragon.refresh_if_outdated()))
+        self.scheduler.add("lolfandom", intervals["lolfandom"],
+                           lambda: self._check("lolfandom", lambda: self.lol_fandom.refresh_championdata()))
+        self.scheduler.add("lolalytics", intervals["lolalytics"],
+                           lambda: self._check("lolalytics", lambda: self.lol_fandom.refresh_winrates()))
+        self.scheduler.refreshed += lambda sender, name: self.refreshed.invoke(self, name)
+        with self.stopwatch.measure("total"):
+            if use_snapshot:
+                with self.stopwatch.measure("snapshot"):
+                    snapshot = ChampionSnapshot.load_latest() or ChampionSnapshot.empty()
+                self.data_dragon = DataDragon(
+                    http_client=self.http_client,
+                    index=snapshot.create_index(),
+                    **self.data_dragon_options)
+                self.lol_fandom = LolFandom(
+                    http_client=self.http_client,
+                    dynamic_balances=snapshot.dynamic_balances,
+                    revision=snapshot.revision,
+                    **self.lol_fandom_options)
+                for source in self.sources:
+                    self._set_freshness(source, FreshnessStates.STALE,
+                                        snapshot.updated_at.get(source, snapshot.created_at or None))
+                # Persisted data may be outdated, every source is checked as
+                # soon as refreshing starts
+                self.scheduler.trigger()
+            else:
+                self.data_dragon, self.lol_fandom = self._fetch()
+                for source in self.sources:
+                    self._set_freshness(source, FreshnessStates.FRESH, time.time())
+        logging.debug(f"ApiService startup timings:\n{Stopwatch.format_timings(self.startup_timings)}")
+
+    @property
+    def sources(self) -> Tuple[str, ...]:
+        return tuple(x.name for x in self.scheduler.tasks)
+
+    @property
+    def freshness(self) -> Dict[str, SourceFreshnessModel]:
+        """Source name -> how current its data is.
+    """
+        return dict(self._freshness)
+
+    @property
+    def startup_timings(self) -> Dict[str, float]:
+        """Seconds spent on each startup step, including the steps of LolFandom.
+    """
+        timings = {k: v for k, v in self.stopwatch.timings.items() if k != "total"}
+        timings.update(self.lol_fandom.stopwatch.timings)
+        timings["total"] = self.stopwatch.timings["total"]
+        return timings
+
+    def start_refresh(self) -> None:
+        """Start checking the sources for updates in the background.
+    """
+        self.scheduler.start()
+
+    def stop_refresh(self) -> None:
+        self.scheduler.stop()
+
+    def _check(self, source: str, refresh) -> bool:
+        """Run the update check of a source, keeping track of its freshness.
+    """
+        try:
+            changed = refresh()
+        except Exception as e:
+            previous = self._freshness[source]
+            self._set_freshness(source, FreshnessStates.OFFLINE, previous.updated_at, str(e))
+            raise
+        self._set_freshness(source, FreshnessStates.FRESH, time.time())
+        self._save()
+        return changed
+
+    def _set_freshness(self, source: str, state: FreshnessStates, updated_at: Optional[float],
+                       error: str = None) -> None:
+        freshness = SourceFreshnessModel(source, state, updated_at, error)
+        self._freshness[source] = freshness
+        self.com.freshness_signal.emit(freshness)
+
+    def _save(self) -> None:
+        """Save the current data as the last good data, once there is some.
+    """
+        if not self.use_snapshot or not self.data_dragon.index.by_id or not self.lol_fandom.dynamic_balances:
+            return
+        updated_at = {k: x.updated_at for k, x in self._freshness.items() if x.updated_at is not None}
+        try:
+            ChampionSnapshot.capture(self.data_dragon, self.lol_fandom, updated_at).save_user()
+        except OSError as e:
+            logging.warning(f"Failed to save champion data: {e}")
+
+    def _fetch(self) -> Tuple[DataDragon, LolFandom]:
+        # Data sources are independent of each other, so fetching takes as long
+        # as the slowest source rather than the sum of all of them
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="api") as executor:
+            data_dragon = executor.submit(self._measure, "datadragon", DataDragon, self.data_dragon_options)
+            lol_fandom = executor.submit(self._measure, "lolfandom", LolFandom, self.lol_fandom_options)
+            return data_dragon.result(), lol_fandom.result()
+
+    def _measure(self, name: str, factory, options: dict):
+        with self.stopwatch.measure(name):
+            return factory(http_client=self.http_client, **options)
@@ -4,10 +4,12 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from views import AppWindowView, SystemTray
-from utils import ResourceHelper
+    from services import ApiService, ChampionSelectService, WorkerService
+from utils import ResourceHelper, Tracer
 
 from dependency_injector.wiring import Provide, inject
 from PySide6 import QtWidgets, QtGui
+import logging
 import os
 import traceback
 import qdarktheme
@@ -19,9 +21,17 @@ class ApplicationHostService:
             self,
             application: QtWidgets.QApplication = Provide["application"],
             system_tray: SystemTray = Provide["system_tray"],
-            app_window_view: AppWindowView = Provide["app_window_view"]
+            app_window_view: AppWindowView = Provide["app_window_view"],
+            worker_service: WorkerService = Provide["worker_service"],
+            api_service: ApiService = Provide["api_service"],
+            champion_select_service: ChampionSelectService = Provide["champion_select_service"],
+            tracer: Tracer = Provide["tracer"]
     ) -> None:
         self.app_window_view = app_window_view
+        self.worker_service = worker_service
+        self.api_service = api_service
+        self.champion_select_service = champion_select_service
+        self.tracer = tracer
         self.application = application
         self.system_tray = system_tray
 
@@ -39,6 +49,7 @@ class ApplicationHostService:
         self._configure_application()
         self.system_tray.show()
         self.app_window_view.show()
+        self.api_service.start_refresh()
 
         try:
             self.application.exec()
@@ -49,6 +60,14 @@ class ApplicationHostService:
     def stop(self):
         """Stops our main application.
     """
+        self.worker_service.stop()
+        self.api_service.stop_refresh()
+        icon_prefetcher = self.api_service.data_dragon.icon_prefetcher
+        if icon_prefetcher is not None:
+            icon_prefetcher.cancel()
+        self.champion_select_service.shutdown()
+        self.tracer.stop_dump()
+        logging.debug(f"Champion select latencies:\n{self.tracer.format()}")
         os._exit(0)
 
     def on_exception(self):
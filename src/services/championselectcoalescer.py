@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from models import ChampionSelectSessionModel
+
+import threading
+
+
+@dataclass
+class CoalescerStats:
+    """Data class for counting what happened to champion select session events.
+    """
+    # Events pushed into the coalescer
+    received: int = 0
+    # Events replaced by a later event of the same burst
+    coalesced: int = 0
+    # Events whose champions and bench did not change since the last forwarded session
+    unchanged: int = 0
+    # Events forwarded to be resolved
+    forwarded: int = 0
+
+
+class ChampionSelectCoalescer:
+    """Sits between the LCU champion select session events and their processing.
+    The session websocket sends bursts of updates, mostly for timers and hovers.
+    Events are collected for a short window after the first event of a burst,
+    then only the latest one is compared against the last forwarded session and
+    forwarded if a team or bench champion, or whether the bench is enabled,
+    changed.
+    """
+
+    def __init__(
+            self,
+            forward: Callable[[ChampionSelectSessionModel], None],
+            window: float = 0.15
+    ):
+        self.forward = forward
+        # Seconds to collect a burst for, 0 compares every event right away
+        self.window = window
+        self.stats = CoalescerStats()
+        self._previous: Optional[ChampionSelectSessionModel] = None
+        self._pending: Optional[ChampionSelectSessionModel] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def push(self, session: ChampionSelectSessionModel) -> None:
+        with self._lock:
+            self.stats.received += 1
+            if self._pending is not None:
+                self.stats.coalesced += 1
+            self._pending = session
+            if self.window > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Compare the latest pending event right away and forward it if it
+    changed anything that is shown.
+    """
+        with self._lock:
+            self._timer = None
+            session = self._pending
+            self._pending = None
+            if session is None:
+                return
+            # The first session is always forwarded, even without champions
+            if self._previous is not None and ChampionSelectCoalescer.is_unchanged(self._previous, session):
+                self.stats.unchanged += 1
+                return
+            self._previous = session
+            self.stats.forwarded += 1
+            # Forwarded under the lock so sessions are forwarded in order
+            self.forward(session)
+
+    def reset(self) -> None:
+        """Forget the pending and last forwarded sessions, so the next event is
+    forwarded in full.
+    """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+            self._previous = None
+
+    @staticmethod
+    def is_unchanged(previous: ChampionSelectSessionModel, session: ChampionSelectSessionModel) -> bool:
+        """Return whether two sessions show the same team, bench and bench state.
+    Timers, hovers and the event type are ignored.
+    """
+        return (previous.team_champion_ids or []) == (session.team_champion_ids or []) \
+            and (previous.available_champion_ids or []) == (session.available_champion_ids or []) \
+            and previous.is_bench_enabled == session.is_bench_enabled
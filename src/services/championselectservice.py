@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from services import ApiService
+from constants import Monsoon
+from models import (
+    ChampionSelectResultModel,
+    ChampionSelectSessionModel,
+    ChampionSlotChangeModel,
+    DynamicBalanceModel
+)
+from utils import PixmapCache, Tracer
+from .championselectcoalescer import ChampionSelectCoalescer
+
+from PySide6.QtCore import QObject, QSize, Signal
+from concurrent.futures import ThreadPoolExecutor
+from dependency_injector.wiring import Provide, inject
+import dataclasses
+import logging
+import threading
+
+
+class ChampionSelectPort(QObject):
+    result_signal = Signal(ChampionSelectResultModel)
+
+    def __init__(self):
+        super().__init__()
+
+
+class ChampionSelectService:
+    """Resolves champion select sessions into dynamic balances and icons off the
+    GUI thread. Bursts of session events are coalesced first and only sessions
+    that changed a champion are resolved. Sessions are numbered as they are
+    forwarded; a session that is no longer the latest one is skipped, and its
+    result is never emitted. Results carry the slots whose balance changed since
+    the previously emitted result. Whenever the ApiService swaps in fresh data, the last
+    submitted session is resolved again against it.
+    """
+
+    @inject
+    def __init__(
+            self,
+            api_service: ApiService = Provide["api_service"],
+            pixmap_cache: PixmapCache = Provide["pixmap_cache"],
+            tracer: Tracer = Provide["tracer"],
+            max_workers: int = 4,
+            coalesce_window: float = 0.15
+    ):
+        self.api_service = api_service
+        self.tracer = tracer
+        # Icons are decoded and scaled by the workers, the GUI thread only blits them
+        self.pixmap_cache = pixmap_cache
+        self.icon_size = QSize(Monsoon.CHAMPION_ICON_SIZE, Monsoon.CHAMPION_ICON_SIZE)
+        # Created on the GUI thread, so results emitted by workers are queued to it
+        self.com = ChampionSelectPort()
+        self.dropped = 0
+        self.coalescer = ChampionSelectCoalescer(self._enqueue, coalesce_window)
+        self._sequence = 0
+        self._lock = threading.Lock()
+        # Team and bench balances of the last emitted result, only touched by the session thread
+        self._shown: Tuple[Tuple[DynamicBalanceModel, ...], Tuple[DynamicBalanceModel, ...]] = ((), ())
+        # Last submitted session, resubmitted when fresh data arrives
+        self._session: Optional[ChampionSelectSessionModel] = None
+        self._stopped = False
+        # Keeps the GUI thread and refreshes of the scheduler thread from pushing out of order
+        self._submit_lock = threading.Lock()
+        # Sessions are resolved one at a time, their champions in parallel
+        self._session_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="champ-select")
+        self._champion_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="champ-resolve")
+        self.api_service.refreshed += self._on_refreshed
+
+    @property
+    def latest_sequence(self) -> int:
+        return self._sequence
+
+    def is_latest(self, result: ChampionSelectResultModel) -> bool:
+        return result.sequence == self._sequence
+
+    def submit(self, session: ChampionSelectSessionModel) -> None:
+        """Pass a session event on to be coalesced and, if it changed any
+    champion, resolved.
+    """
+        with self._submit_lock:
+            self._session = session
+            self.coalescer.push(session)
+
+    def shutdown(self) -> None:
+        with self._submit_lock:
+            self._stopped = True
+        self.coalescer.reset()
+        self._session_executor.shutdown(wait=False)
+        self._champion_executor.shutdown(wait=False)
+
+    def _on_refreshed(self, sender, source: str) -> None:
+        # Invoked on the scheduler thread. The coalescer forgets the last forwarded
+        # session, so the unchanged session is resolved against the fresh data.
+        with self._submit_lock:
+            if self._stopped or self._session is None:
+                return
+            logging.debug(f"Resolving the champion select session again after {source} was refreshed")
+            self.coalescer.reset()
+            self.coalescer.push(self._session)
+
+    def _enqueue(self, session: ChampionSelectSessionModel) -> int:
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        self._session_executor.submit(self._resolve_session, sequence, session)
+        return sequence
+
+    def _resolve_session(self, sequence: int, session: ChampionSelectSessionModel) -> None:
+        try:
+            if sequence != self._sequence:
+                self._drop()
+                return
+            trace_id = session.trace_id
+            with self.tracer.span("session_resolve", trace_id):
+                team = self._resolve_champions(session.team_champion_ids or [], trace_id)
+                available = self._resolve_champions(session.available_champion_ids or [], trace_id)
+            if sequence != self._sequence:
+                self._drop()
+                return
+            team, available = tuple(team), tuple(available)
+            changes = ChampionSelectService.diff("team", self._shown[0], team) \
+                + ChampionSelectService.diff("bench", self._shown[1], available)
+            self._shown = (team, available)
+            self.com.result_signal.emit(ChampionSelectResultModel(
+                sequence=sequence,
+                team_champion_dynamic_balances=team,
+                available_champion_dynamic_balances=available,
+                changes=tuple(changes),
+                trace_id=trace_id
+            ))
+        except Exception:
+            logging.exception("Failed to resolve champion select session")
+
+    @staticmethod
+    def diff(
+            group: str,
+            previous: Sequence[DynamicBalanceModel],
+            balances: Sequence[DynamicBalanceModel]
+    ) -> List[ChampionSlotChangeModel]:
+        """Return the slots of a group whose balance differs between two results.
+    Slots are positions among the balances shown, champions without a balance
+    take up no slot.
+    """
+        changes = []
+        for slot in range(max(len(previous), len(balances))):
+            previous_balance = previous[slot] if slot < len(previous) else None
+            balance = balances[slot] if slot < len(balances) else None
+            if previous_balance != balance:
+                changes.append(ChampionSlotChangeModel(
+                    group, slot,
+                    previous_balance.champion_id if previous_balance is not None else None,
+                    balance.champion_id if balance is not None else None))
+        return changes
+
+    def _resolve_champions(self, champion_ids: List[int], trace_id: int = 0) -> List[DynamicBalanceModel]:
+        balances = self._champion_executor.map(lambda x: self._resolve_champion(x, trace_id), champion_ids)
+        return [x for x in balances if x is not None]
+
+    def _resolve_champion(self, champion_id: int, trace_id: int = 0) -> Optional[DynamicBalanceModel]:
+        data_dragon = self.api_service.data_dragon
+        # Balances are keyed by the numeric id of the session, one lookup resolves a champion
+        with self.tracer.span("champion_lookup", trace_id):
+            balance = self.api_service.lol_fandom.fetch_dynamic_balance_by_champion_id(champion_id)
+        if balance is None:
+            return None
+        version = data_dragon.latest_version
+        with self.tracer.span("icon_fetch", trace_id):
+            try:
+                icon = data_dragon.fetch_icon_by_champion_id(champion_id)
+            except Exception as e:
+                # Offline without the icon in the store, the balance is shown without it
+                logging.warning(f"Failed to fetch icon of champion {champion_id}: {e}")
+                icon = None
+        if icon is not None:
+            with self.tracer.span("icon_prepare", trace_id):
+                self.pixmap_cache.prepare(PixmapCache.key(champion_id, version, self.icon_size), icon)
+        return dataclasses.replace(balance, champion_icon=icon, champion_icon_version=version)
+
+    def _drop(self) -> None:
+        with self._lock:
+            self.dropped += 1
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Awaitable, Callable, Iterator, Optional, Tuple
+
+from lcu_driver.events.responses import WebsocketEventResponse
+import asyncio
+import gzip
+import json
+import threading
+import time
+
+# Bumped whenever the layout of a recording changes
+RECORDING_FORMAT = 1
+
+
+class LcuSessionRecorder:
+    """Writes websocket events of the League client to a gzip compressed JSONL
+    file as they are received: a header line, then one line per event with its
+    offset in seconds from the start of the recording. Lines are flushed as they
+    are written, so a recording survives the app being killed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._write({"format": RECORDING_FORMAT, "created_at": time.time()})
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def record(self, event: WebsocketEventResponse, offset: float = None) -> None:
+        """Write an event received now, or offset seconds into the recording.
+    """
+        if offset is None:
+            offset = time.monotonic() - self._start
+        with self._lock:
+            if self._file is None:
+                return
+            self._write({
+                "t": round(offset, 4),
+                "type": event.type,
+                "uri": event.uri,
+                "data": event.data
+            })
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class LcuSessionReplayer:
+    """Reads a recording of LcuSessionRecorder and plays its events back with
+    their original spacing scaled by 1 / speed, or without any delay when speed
+    is 0.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self.played = 0
+
+    def events(self) -> Iterator[Tuple[float, WebsocketEventResponse]]:
+        """Yield (offset in seconds, event) of every recorded event.
+
+    Raises:
+        Exception: File is not a recording of a supported format
+    """
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get("format") != RECORDING_FORMAT:
+                raise Exception("Session recording has an unsupported format")
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                yield record["t"], WebsocketEventResponse(
+                    event_type=record["type"], uri=record["uri"], data=record["data"])
+
+    def _delay(self, offset: float, start: float) -> float:
+        if not self.speed:
+            return 0
+        return max(start + offset / self.speed - time.monotonic(), 0)
+
+    async def play(self, handler: Callable[[None, WebsocketEventResponse], Awaitable],
+                   stopping: Optional[asyncio.Event] = None) -> int:
+        """Pass every event to an lcu-driver style handler on the running loop,
+    the way a connection would. Stops early once stopping is set.
+
+    Returns:
+        int: Number of events played.
+    """
+        start = time.monotonic()
+        for offset, event in self.events():
+            delay = self._delay(offset, start)
+            if stopping is not None and stopping.is_set():
+                break
+            if delay == 0:
+                # Flat out still lets the loop run, stop included
+                await asyncio.sleep(0)
+            elif stopping is None:
+                await asyncio.sleep(delay)
+            else:
+                try:
+                    await asyncio.wait_for(stopping.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            await handler(None, event)
+            self.played += 1
+        return self.played
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from utils import EventHandler
+
+import logging
+import threading
+import time
+
+
+@dataclass
+class RefreshTask:
+    """Data class for a data source checked for updates on its own interval.
+    """
+    # Name of the source ("datadragon")
+    name: str
+    # Seconds between two checks
+    interval: float
+    # Checks the source and swaps in rebuilt data, returns whether anything changed
+    refresh: Callable[[], bool]
+    # time.monotonic() the next check is due at
+    due: float = 0
+    checks: int = 0
+    # Checks that swapped in new data
+    swaps: int = 0
+    failures: int = 0
+
+
+class RefreshScheduler:
+    """Runs the update checks of data sources on a background thread, each on its
+    own interval. Sources rebuild their data on that thread and swap it in with a
+    single assignment, so lookups never block on a refresh or see half-built
+    data. A failed check is logged and the current data kept; it is retried
+    after retry_interval, or its own interval when that is shorter.
+    """
+
+    def __init__(self, retry_interval: float = 60):
+        self.retry_interval = retry_interval
+        self.tasks: List[RefreshTask] = []
+        # Invoked with the name of a source once it swapped in new data
+        self.refreshed = EventHandler()
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, name: str, interval: float, refresh: Callable[[], bool]) -> RefreshTask:
+        """Check a source every interval seconds, the first time one interval after
+    it was added unless triggered.
+    """
+        task = RefreshTask(name, interval, refresh, due=time.monotonic() + interval)
+        with self._lock:
+            self.tasks.append(task)
+        self._wakeup.set()
+        return task
+
+    def get(self, name: str) -> RefreshTask:
+        task = next((x for x in self.tasks if x.name == name), None)
+        if task is None:
+            raise Exception(f"Refresh task {name} does not exist")
+        return task
+
+    def start(self) -> "RefreshScheduler":
+        if self.is_running:
+            return self
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="api-refresh-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Stop from any thread and wait for a running check to finish.
+
+    Returns:
+        bool: Whether the scheduler stopped within the timeout.
+    """
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def trigger(self, name: str = None) -> None:
+        """Check a source, or every source, right away or as soon as the scheduler
+    starts.
+    """
+        with self._lock:
+            for task in self.tasks:
+                if name is None or task.name == name:
+                    task.due = 0
+        self._wakeup.set()
+
+    def run_due(self) -> List[str]:
+        """Run the checks that are due, one after the other.
+
+    Returns:
+        List[str]: Names of the sources that swapped in new data.
+    """
+        now = time.monotonic()
+        with self._lock:
+            due = [x for x in self.tasks if x.due <= now]
+        refreshed = []
+        for task in due:
+            if self._stopping:
+                break
+            if self._run_task(task):
+                refreshed.append(task.name)
+        return refreshed
+
+    def _run_task(self, task: RefreshTask) -> bool:
+        task.checks += 1
+        try:
+            changed = task.refresh()
+        except Exception:
+            task.failures += 1
+            logging.exception(f"Failed to refresh {task.name}, keeping its current data")
+            task.due = time.monotonic() + min(task.interval, self.retry_interval)
+            return False
+        task.due = time.monotonic() + task.interval
+        if changed:
+            task.swaps += 1
+            self.refreshed.invoke(self, task.name)
+        return changed
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self.run_due()
+            with self._lock:
+                due = min((x.due for x in self.tasks), default=None)
+            timeout = None if due is None else max(due - time.monotonic(), 0)
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
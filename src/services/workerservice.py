@@ -1,25 +1,36 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 if TYPE_CHECKING:
-    pass
-from utils import EventHandler
-from models import ChampionSelectSessionModel
-from constants import Workers
+    from services import SettingsContextService
+from utils import EventHandler, Tracer
+from models import ChampionSelectSessionModel, LockfileModel
+from constants import SettingsSchema, Workers
+from .lcusessionlog import LcuSessionRecorder, LcuSessionReplayer
 
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QThread, Signal, QObject, Qt
+from dependency_injector.wiring import Provide, inject
 from lcu_driver import Connector
+from lcu_driver.connection import Connection
+from lcu_driver.events.responses import WebsocketEventResponse
 from watchdog.observers import Observer
 from watchdog.events import (
     FileSystemEventHandler,
     FileSystemEvent,
     EVENT_TYPE_CREATED,
-    EVENT_TYPE_DELETED
+    EVENT_TYPE_DELETED,
+    EVENT_TYPE_MODIFIED,
+    EVENT_TYPE_MOVED
 )
-import time
+import aiohttp
 import asyncio
+import json
 import logging
+import os
+import psutil
+import sys
+import threading
 
 
 class CommunicationPort(QObject):
@@ -30,13 +41,20 @@ class CommunicationPort(QObject):
 
 
 class WorkerService:
-    workers_dictionary: Dict[Workers, QThread] = dict()
-
+    @inject
     def __init__(
-            self
+            self,
+            settings_context_service: SettingsContextService = Provide["settings_context_service"],
+            tracer: Tracer = Provide["tracer"]
     ):
-        self.workers_dictionary[Workers.LOCKFILE_WATCHER] = LockfileWatcherWorker()
-        self.workers_dictionary[Workers.LCU_EVENT_PROCESSOR] = LcuEventProcessorWorker()
+        lockfile_watcher = LockfileWatcherWorker(settings_context_service.get(SettingsSchema.LEAGUE_INSTALL_PATH))
+        lcu_event_processor = LcuEventProcessorWorker(tracer=tracer)
+        # Emitted on the watchdog thread, the processor hands them over to its own loop
+        lockfile_watcher.lockfile_create_signal.connect(lcu_event_processor.on_lockfile_created, Qt.DirectConnection)
+        lockfile_watcher.lockfile_delete_signal.connect(lcu_event_processor.on_lockfile_deleted, Qt.DirectConnection)
+        self.workers_dictionary: Dict[Workers, QThread] = dict()
+        self.workers_dictionary[Workers.LOCKFILE_WATCHER] = lockfile_watcher
+        self.workers_dictionary[Workers.LCU_EVENT_PROCESSOR] = lcu_event_processor
 
     def get(self, key: Workers) -> QThread:
         value = self.workers_dictionary.get(key)
@@ -44,70 +62,407 @@ class WorkerService:
             raise Exception("Worker does not exist in worker service. Did you forget to include it? o.o")
         return value
 
+    def stop(self) -> None:
+        """Stop the workers and wait for them to finish.
+    """
+        self.get(Workers.LOCKFILE_WATCHER).stop()
+        self.get(Workers.LCU_EVENT_PROCESSOR).stop()
+
+
+class LcuConnection(Connection):
+    """lcu-driver connection that can be closed from the loop. Its readiness
+    wait spins while the client API is down, so wait_until_ready is awaited
+    before init to probe with a delay between attempts instead. Only the public
+    members of Connection are used or overridden.
+    """
+    API_READY_DELAY = 0.5
+
+    def __init__(self, connector: Connector, process_or_string):
+        super().__init__(connector, process_or_string)
+        self.connector = connector
+        # Lockfiles end with the protocol of the API, the client process always serves https
+        if isinstance(process_or_string, str) and process_or_string.split(":")[-1] == "http":
+            self.api_protocols = ("http", "ws")
+        else:
+            self.api_protocols = ("https", "wss")
+        self.websocket: Optional[aiohttp.ClientWebSocketResponse] = None
+
+    @property
+    def protocols(self) -> Tuple[str, str]:
+        return self.api_protocols
+
+    @property
+    def address(self) -> str:
+        return f"{self.protocols[0]}://127.0.0.1:{self.port}"
+
+    @property
+    def ws_address(self) -> str:
+        return f"{self.protocols[1]}://127.0.0.1:{self.port}"
+
+    async def wait_until_ready(self) -> None:
+        """Wait until the client API answers, which takes a while after launch.
+    """
+        async with aiohttp.ClientSession(auth=aiohttp.BasicAuth("riot", self.auth_key)) as session:
+            while True:
+                try:
+                    async with session.get(f"{self.address}/riotclient/region-locale", ssl=False) as _:
+                        return
+                except aiohttp.ClientConnectorError:
+                    await asyncio.sleep(self.API_READY_DELAY)
+
+    async def run_ws(self) -> None:
+        """Subscribe to the events of the client API and dispatch them to the
+    handlers of the connector until the websocket closes.
+    """
+        async with aiohttp.ClientSession(auth=aiohttp.BasicAuth("riot", self.auth_key)) as session:
+            self.websocket = await session.ws_connect(self.ws_address, ssl=False)
+            await self.websocket.send_json([5, "OnJsonApiEvent"])
+            await self.websocket.receive()
+            while True:
+                message = await self.websocket.receive()
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    try:
+                        data = json.loads(message.data)[2]
+                    except (json.JSONDecodeError, IndexError, TypeError):
+                        logging.warning(f"Failed to decode a client API event: {message.data}")
+                        continue
+                    self.connector.ws.match_event(self.connector, self, data)
+                elif message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING,
+                                      aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+
+    @property
+    def is_listening(self) -> bool:
+        return self.websocket is not None and not self.websocket.closed
+
+    async def close_websocket(self) -> None:
+        # Ends run_ws, which closes the connection through the close handlers
+        if self.is_listening:
+            await self.websocket.close()
+
+    async def close_session(self) -> None:
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
 
 class LcuEventProcessorWorker(QThread):
-    com = CommunicationPort()
-    connector = Connector()
+    """Owns an asyncio loop on its thread that connects to the League client and
+    forwards champion select sessions through com. Lost or failed connections
+    are retried with exponential backoff; stop ends the loop right away rather
+    than at the next poll. A lockfile created by a launching client cuts the
+    backoff short and is connected to directly. Once connected, the session of
+    a champion select already running is fetched, as the websocket only sends
+    its changes.
 
-    def __init__(self):
+    Received events are written to a recorder when one is set. With a replayer,
+    the worker plays a recording through the same handler instead of connecting
+    to a client, and finishes once the recording is played.
+    """
+    SESSION_URI = "/lol-champ-select/v1/session"
+    SESSION_FETCH_TIMEOUT = 5.0
+    # Names of the client process that serves the API
+    UX_PROCESS_NAMES = ("LeagueClientUx.exe", "LeagueClientUx")
+
+    def __init__(
+            self,
+            retry_delay: float = 0.5,
+            max_retry_delay: float = 30.0,
+            tracer: Tracer = None,
+            recorder: LcuSessionRecorder = None,
+            replayer: LcuSessionReplayer = None
+    ):
         QThread.__init__(self)
         self.isRunning = False
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        # Champion select latency traces start when an event is received
+        self.tracer = tracer or Tracer()
+        self.recorder = recorder
+        self.replayer = replayer
+        # Created on the constructing thread, signals are queued to its receivers
+        self.com = CommunicationPort()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connection: Optional[LcuConnection] = None
+        self.attempts = 0
+        # Session events handled, fetched sessions included
+        self.events_received = 0
+        # Lockfile of the running client, connected to instead of looking up its process
+        self.lockfile: Optional[LockfileModel] = None
+        self._stopping: Optional[asyncio.Event] = None
+        # Set to end a backoff early
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._started = threading.Event()
+        self._stop_requested = False
 
-    @connector.ready
-    async def connect(connection):
+    def _create_connector(self) -> Connector:
+        connector = Connector(loop=self.loop)
+        connector.ready(self.on_ready)
+        connector.close(self.on_close)
+        connector.ws.register(self.SESSION_URI, event_types=("CREATE", "UPDATE", "DELETE"))(self.update)
+        return connector
+
+    async def on_ready(self, connection):
+        # A connection that got ready starts the backoff over
+        self.attempts = 0
         logging.debug("lcu-driver connected ♥")
+        await self.fetch_session(connection)
 
-    @connector.close
-    async def disconnect(connection):
+    async def on_close(self, connection):
         logging.debug("lcu-driver disconnected")
 
-    @connector.ws.register("/lol-champ-select/v1/session", event_types=('CREATE', 'UPDATE', 'DELETE'))
-    async def update(connection, event):
-        LcuEventProcessorWorker.com.data_signal.emit(
-            ChampionSelectSessionModel.from_websocket_event_response(event)
-        )
+    async def fetch_session(self, connection) -> None:
+        """Handle the current champion select session like a websocket event, if
+    there is one.
+    """
+        received = self.events_received
+        try:
+            with self.tracer.span("session_fetch"):
+                response = await connection.request(
+                    "get", self.SESSION_URI, timeout=aiohttp.ClientTimeout(total=self.SESSION_FETCH_TIMEOUT))
+                try:
+                    # Not found outside of champion select
+                    if response.status != 200:
+                        return
+                    data = await response.json()
+                finally:
+                    response.release()
+            # A websocket event handled meanwhile is newer
+            if self.events_received != received:
+                return
+            await self.update(connection, WebsocketEventResponse(event_type="Create", uri=self.SESSION_URI, data=data))
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Failed to fetch the champion select session: {e}")
+
+    async def update(self, connection, event):
+        self.events_received += 1
+        if self.recorder is not None:
+            self.recorder.record(event)
+        trace_id = self.tracer.begin()
+        with self.tracer.span("websocket_receive", trace_id):
+            with self.tracer.span("session_parse", trace_id):
+                session = ChampionSelectSessionModel.from_websocket_event_response(event, trace_id)
+            self.com.data_signal.emit(session)
+
+    def retry_delay_after(self, attempts: int) -> float:
+        return min(self.retry_delay * 2 ** max(attempts - 1, 0), self.max_retry_delay)
+
+    @staticmethod
+    def _find_client() -> Optional[psutil.Process]:
+        # Processes that cannot be inspected have no name and are skipped
+        for process in psutil.process_iter(["name"]):
+            if process.info["name"] in LcuEventProcessorWorker.UX_PROCESS_NAMES:
+                return process
+        return None
+
+    def on_lockfile_created(self, lockfile: LockfileModel) -> None:
+        """Connect to the client of a lockfile right away. Safe to call from any
+    thread.
+    """
+        self.lockfile = lockfile
+        self._call_soon(self._wake)
+
+    def on_lockfile_deleted(self) -> None:
+        self.lockfile = None
+
+    def _wake(self) -> None:
+        # A launched client starts the backoff over
+        self.attempts = 0
+        self._wakeup.set()
+
+    def _call_soon(self, callback) -> None:
+        if not self._started.is_set():
+            return
+        try:
+            self.loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            # Loop already closed
+            pass
+
+    async def _next_client(self):
+        lockfile = self.lockfile
+        if lockfile is not None:
+            return lockfile.connection_string
+        return await self.loop.run_in_executor(None, self._find_client)
+
+    async def _serve(self) -> None:
+        if self.replayer is not None:
+            played = await self.replayer.play(self.update, self._stopping)
+            logging.debug(f"Replayed {played} champion select events from {self.replayer.path}")
+            return
+        connector = self._create_connector()
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            client = await self._next_client()
+            # A stop while the client was looked up found no connection to close
+            if self._stopping.is_set():
+                break
+            if client is not None:
+                self.connection = LcuConnection(connector, client)
+                try:
+                    await self.connection.wait_until_ready()
+                    await self.connection.init()
+                except (aiohttp.ClientError, OSError) as e:
+                    logging.warning(f"Lost connection to the League client: {e}")
+                except asyncio.CancelledError:
+                    # Stopped before the client API was ready
+                    await self.connection.close_session()
+                    break
+                finally:
+                    self.connection = None
+            if self._stopping.is_set():
+                break
+            self.attempts += 1
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.retry_delay_after(self.attempts))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _stop(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self.connection is None:
+            return
+        if self.connection.is_listening:
+            await self.connection.close_websocket()
+        else:
+            self._task.cancel()
 
     def run(self):
         self.isRunning = True
-        self.connector.start()
-        while self.isRunning:
-            asyncio.get_running_loop().run_until_complete(asyncio.sleep(1))
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._started.set()
+        # Stop was called before the loop existed
+        if self._stop_requested:
+            self._stopping.set()
+        try:
+            self._task = self.loop.create_task(self._serve())
+            self.loop.run_until_complete(self._task)
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+            if self.recorder is not None:
+                self.recorder.close()
+            self.isRunning = False
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Stop the loop from any thread and wait for the worker to finish.
+
+    Returns:
+        bool: Whether the worker finished within the timeout.
+    """
+        self._stop_requested = True
+        self._call_soon(lambda: asyncio.ensure_future(self._stop()))
+        return self.wait(int(timeout * 1000))
 
 
 class LockfileWatcherWorker(QThread):
-    lockfile_create_signal = Signal()
+    """Watches the install directory of the League client for the lockfile it
+    writes while running, without polling. A created or rewritten lockfile is
+    parsed and emitted once complete; stop wakes the worker right away.
+    """
+    LOCKFILE_NAME = "lockfile"
+    lockfile_create_signal = Signal(LockfileModel)
     lockfile_delete_signal = Signal()
 
-    def __init___(self):
+    def __init__(self, install_path: str = None):
         QThread.__init__(self)
         self.isRunning = False
+        self.install_path = install_path or LockfileWatcherWorker.default_install_path()
+        # Last lockfile emitted, None while there is none
+        self.lockfile: Optional[LockfileModel] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_install_path() -> str:
+        if sys.platform == "win32":
+            return "C:/Riot Games/League of Legends"
+        if sys.platform == "darwin":
+            return "/Applications/League of Legends.app/Contents/LoL"
+        # Default prefix of the Lutris installer on Linux
+        return os.path.expanduser("~/Games/league-of-legends/drive_c/Riot Games/League of Legends")
+
+    @property
+    def lockfile_path(self) -> str:
+        return os.path.join(self.install_path, LockfileWatcherWorker.LOCKFILE_NAME)
 
     def run(self):
         self.isRunning = True
-        event_handler = LockfileHandler()
-        event_handler.lockfile_changed += self.emit_signal
+        event_handler = LockfileHandler(LockfileWatcherWorker.LOCKFILE_NAME)
+        event_handler.lockfile_changed += self.on_lockfile_changed
         observer = Observer()
-        observer.schedule(event_handler, "C:\Riot Games\League of Legends")
-        observer.start()
-        while self.isRunning:
-            time.sleep(1)
-        observer.stop()
-        observer.join()
-
-    def emit_signal(self, sender, args):
-        if args == EVENT_TYPE_CREATED:
-            self.lockfile_create_signal.emit()
+        try:
+            observer.schedule(event_handler, self.install_path)
+            observer.start()
+        except OSError as e:
+            logging.warning(f"Not watching {self.install_path} for the League client lockfile: {e}")
+            observer = None
+        else:
+            # The client was running before the watch started
+            self.read_lockfile()
+        self._stopping.wait()
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        self.isRunning = False
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Stop watching from any thread and wait for the worker to finish.
+
+    Returns:
+        bool: Whether the worker finished within the timeout.
+    """
+        self._stopping.set()
+        return self.wait(int(timeout * 1000))
+
+    def on_lockfile_changed(self, sender, args):
         if args == EVENT_TYPE_DELETED:
-            self.lockfile_delete_signal.emit()
+            with self._lock:
+                lockfile, self.lockfile = self.lockfile, None
+            if lockfile is not None:
+                self.lockfile_delete_signal.emit()
+        else:
+            self.read_lockfile()
+
+    def read_lockfile(self) -> None:
+        """Emit the lockfile when it is complete and differs from the last one.
+    """
+        try:
+            with open(self.lockfile_path, encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            return
+        try:
+            lockfile = LockfileModel.from_string(content)
+        except Exception:
+            # Still being written, the write that completes it is another event
+            return
+        with self._lock:
+            if lockfile == self.lockfile:
+                return
+            self.lockfile = lockfile
+        self.lockfile_create_signal.emit(lockfile)
 
 
 class LockfileHandler(FileSystemEventHandler):
-    def __init__(self):
+    def __init__(self, name: str = LockfileWatcherWorker.LOCKFILE_NAME):
         super().__init__()
+        self.name = name
         self.lockfile_changed = EventHandler()
 
     def on_any_event(self, event: FileSystemEvent):
-        path: str = event.src_path
-        if "lockfile" in path:
-            if not "_" in path:
+        if event.is_directory:
+            return
+        if event.event_type == EVENT_TYPE_MOVED:
+            # Lockfiles written to a temporary file and renamed
+            if os.path.basename(event.dest_path) == self.name:
+                self.lockfile_changed.invoke(self, EVENT_TYPE_CREATED)
+            elif os.path.basename(event.src_path) == self.name:
+                self.lockfile_changed.invoke(self, EVENT_TYPE_DELETED)
+        elif event.event_type in (EVENT_TYPE_CREATED, EVENT_TYPE_MODIFIED, EVENT_TYPE_DELETED):
+            if os.path.basename(event.src_path) == self.name:
                 self.lockfile_changed.invoke(self, event.event_type)
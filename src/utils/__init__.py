@@ -1,4 +1,9 @@
 from .eventhandler import *
+from .diskcache import *
+from .iconstore import *
+from .pixmapcache import *
 from .qtcontainerfactory import *
 from .qthelpers import *
 from .resourcehelper import *
+from .stopwatch import *
+from .tracer import *
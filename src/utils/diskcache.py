@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .resourcehelper import ResourceHelper
+
+
+@dataclass
+class CacheStats:
+    """Data class for counting how requests to a cache were served.
+    """
+    # Served from disk without downloading a body
+    hits: int = 0
+    # Downloaded in full
+    misses: int = 0
+    # Hits confirmed by the upstream with 304 Not Modified
+    revalidations: int = 0
+
+
+class DiskCache:
+    """Represents a persistent cache of byte blobs stored under the user data
+    directory. Blobs are grouped into namespaces ("datadragon/12.19.1") which map
+    to directories, and may carry a small JSON metadata document (ETag...).
+    """
+
+    def __init__(self, root: str = None):
+        self.root = Path(root or ResourceHelper.get_user_data_path("cache"))
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str, key: str) -> Path:
+        if not key or key in (".", "..") or "/" in key or "\\" in key:
+            raise ValueError(f"Invalid cache key {key!r}")
+        parts = [x for x in namespace.split("/") if x]
+        if any(x in (".", "..") for x in parts):
+            raise ValueError(f"Invalid cache namespace {namespace!r}")
+        return self.root.joinpath(*parts, key)
+
+    def read(self, namespace: str, key: str) -> Optional[bytes]:
+        """Return the cached blob for a key, or None if it is not cached.
+    """
+        try:
+            return self._path(namespace, key).read_bytes()
+        except OSError:
+            return None
+
+    def read_metadata(self, namespace: str, key: str) -> dict:
+        """Return the metadata stored along with a blob, or an empty dict.
+    """
+        path = self._path(namespace, key)
+        try:
+            return json.loads(path.with_name(f"{path.name}.meta").read_text("utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, namespace: str, key: str, data: bytes, metadata: dict = None) -> None:
+        """Store a blob and its metadata. Files are replaced atomically so a
+    crash never leaves a truncated entry behind.
+    """
+        path = self._path(namespace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(path, data)
+        if metadata is not None:
+            metadata = {k: v for k, v in metadata.items() if v is not None}
+            self._atomic_write(path.with_name(f"{path.name}.meta"), json.dumps(metadata).encode("utf-8"))
+
+    def prune(self, namespace: str, keep: Iterable[str]) -> None:
+        """Remove every child namespace of a namespace except the ones to keep.
+    Used to drop data of outdated patches.
+    """
+        keep = set(keep)
+        directory = self.root.joinpath(*[x for x in namespace.split("/") if x])
+        if not directory.is_dir():
+            return
+        for child in directory.iterdir():
+            if child.is_dir() and child.name not in keep:
+                shutil.rmtree(child, ignore_errors=True)
+
+    def record_hit(self, revalidated: bool = False) -> None:
+        with self._lock:
+            self.stats.hits += 1
+            if revalidated:
+                self.stats.revalidations += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.stats.misses += 1
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+from typing import Dict, Iterable, Optional
+
+from .diskcache import DiskCache, CacheStats
+from .resourcehelper import ResourceHelper
+
+
+class IconStore:
+    """Represents a content-addressed store of icons on disk. Icons are saved
+    once under the SHA-256 digest of their content and a manifest per patch maps
+    names to digests, so icons that did not change between patches are shared.
+    """
+
+    def __init__(self, root: str = None):
+        self.cache = DiskCache(root or ResourceHelper.get_user_data_path("icons"))
+        self.stats = CacheStats()
+        self._manifests: Dict[str, Dict[str, str]] = dict()
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _manifest(self, version: str) -> Dict[str, str]:
+        # Caller must hold the lock
+        manifest = self._manifests.get(version)
+        if manifest is None:
+            content = self.cache.read("manifests", f"{version}.json")
+            manifest = json.loads(content) if content else dict()
+            self._manifests[version] = manifest
+        return manifest
+
+    def contains(self, version: str, name: str) -> bool:
+        with self._lock:
+            return name in self._manifest(version)
+
+    def get(self, version: str, name: str) -> Optional[bytes]:
+        """Return the icon stored for a name in a patch, or None.
+    """
+        with self._lock:
+            digest = self._manifest(version).get(name)
+        if digest is None:
+            return None
+        return self.cache.read(f"objects/{digest[:2]}", digest)
+
+    def put(self, version: str, name: str, data: bytes) -> str:
+        """Store an icon for a name in a patch and return its digest. The manifest
+    is only written to disk by flush().
+    """
+        digest = hashlib.sha256(data).hexdigest()
+        namespace = f"objects/{digest[:2]}"
+        if self.cache.read(namespace, digest) is None:
+            self.cache.write(namespace, digest, data)
+        with self._lock:
+            self._manifest(version)[name] = digest
+            self._dirty.add(version)
+        return digest
+
+    def flush(self) -> None:
+        """Write manifests changed since the last flush to disk.
+    """
+        with self._lock:
+            manifests = {x: json.dumps(self._manifests[x]).encode("utf-8") for x in self._dirty}
+            self._dirty.clear()
+        for version, content in manifests.items():
+            self.cache.write("manifests", f"{version}.json", content)
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Remove manifests of patches other than the ones to keep along with icons
+    no longer referenced by any kept manifest.
+    """
+        keep = set(keep)
+        manifests_path = self.cache.root / "manifests"
+        if manifests_path.is_dir():
+            for path in manifests_path.glob("*.json"):
+                if path.name[:-len(".json")] not in keep:
+                    path.unlink(missing_ok=True)
+        with self._lock:
+            for version in list(self._manifests):
+                if version not in keep:
+                    del self._manifests[version]
+            referenced = set()
+            for version in keep:
+                referenced.update(self._manifest(version).values())
+        objects_path = self.cache.root / "objects"
+        if objects_path.is_dir():
+            for path in objects_path.glob("*/*"):
+                if path.name not in referenced:
+                    path.unlink(missing_ok=True)
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.stats.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.stats.misses += 1
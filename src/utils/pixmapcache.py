@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional, Tuple
+
+from PySide6 import QtCore, QtGui
+
+
+@dataclass
+class PixmapCacheStats:
+    """Data class for counting how lookups of a pixmap cache were served.
+    """
+    # Served an already decoded and scaled image
+    hits: int = 0
+    # Nothing prepared for the key
+    misses: int = 0
+    # Entries dropped as least recently used
+    evictions: int = 0
+
+
+class PixmapCache:
+    """Represents a process-wide LRU cache of decoded, pre-scaled images keyed by
+    (champion, patch, target size). Images are decoded and smoothly scaled into
+    QImages on any thread; the GUI thread turns them into QPixmaps once, so
+    paints only blit a pixmap of the right size.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.stats = PixmapCacheStats()
+        # Key -> QImage until first used on the GUI thread, QPixmap afterwards
+        self._entries: "OrderedDict[Tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(champion_id: Hashable, version: Optional[str], size: QtCore.QSize) -> Tuple:
+        return champion_id, version, size.width(), size.height()
+
+    def __contains__(self, key: Tuple) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def prepare(self, key: Tuple, content: bytes) -> bool:
+        """Decode an image and scale it to the target size of its key, keeping
+    the aspect ratio. Safe to call from worker threads.
+
+    Returns:
+        bool: Whether the image is cached, False if it could not be decoded.
+    """
+        if key in self:
+            return True
+        image = QtGui.QImage.fromData(content)
+        if image.isNull():
+            return False
+        width, height = key[-2:]
+        image = image.scaled(width, height, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        with self._lock:
+            self._entries[key] = image
+            self._entries.move_to_end(key)
+            self._evict()
+        return True
+
+    def pixmap(self, key: Tuple, content: bytes = None) -> Optional[QtGui.QPixmap]:
+        """Return the pixmap of a key. Images not prepared yet are decoded from
+    content when given. Only call from the GUI thread.
+    """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.stats.hits += 1
+                self._entries.move_to_end(key)
+            else:
+                self.stats.misses += 1
+        if entry is None:
+            if content is None or not self.prepare(key, content):
+                return None
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                return None
+        if isinstance(entry, QtGui.QPixmap):
+            return entry
+
+        pixmap = QtGui.QPixmap.fromImage(entry)
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = pixmap
+        return pixmap
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        # Lock already held
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
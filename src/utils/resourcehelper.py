@@ -16,3 +16,18 @@ class ResourceHelper:
     @staticmethod
     def get_resource_bytes(relative_path: str) -> bytes:
         return Path(ResourceHelper.get_resource_path(relative_path)).read_bytes()
+
+    @staticmethod
+    def get_user_data_path(relative_path: str = "") -> str:
+        """Return a path inside the per-user data directory of Monsoon. The
+    directory can be overridden with the MONSOON_DATA_DIR environment variable.
+    """
+        base_path = os.environ.get("MONSOON_DATA_DIR")
+        if not base_path:
+            if sys.platform == "win32":
+                root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+            else:
+                root = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+            base_path = os.path.join(root, "Monsoon")
+
+        return os.path.join(base_path, relative_path)
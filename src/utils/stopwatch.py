@@ -0,0 +1,28 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class Stopwatch:
+    """Collects named wall-clock durations, in seconds, of the steps of a task.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = dict()
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def format(self) -> str:
+        return Stopwatch.format_timings(self.timings)
+
+    @staticmethod
+    def format_timings(timings: Dict[str, float]) -> str:
+        """Return a formatted breakdown of timings, one step per line.
+    """
+        return "\n".join(f"{name}: {seconds * 1000:.0f} ms" for name, seconds in timings.items())
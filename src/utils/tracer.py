@@ -0,0 +1,149 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, IO, Optional
+
+
+@dataclass(frozen=True)
+class TraceStats:
+    """Data class holding the rolling latency percentiles of a traced stage, in
+    seconds.
+    """
+    # Spans in the rolling window
+    count: int
+    p50: float
+    p95: float
+    p99: float
+
+
+class Tracer:
+    """Records the durations of named stages as spans and keeps rolling p50, p95
+    and p99 latencies over the last window spans of each stage. Spans carrying
+    the id of a trace (a champion select event) can be followed across threads,
+    from the begin of the trace to its end. Spans are optionally written to a
+    JSONL file, one record per line, for offline analysis.
+
+    Safe to use from any thread.
+    """
+    # Stage recorded from the begin to the end of a trace
+    END_TO_END = "end_to_end"
+
+    def __init__(self, window: int = 1024, max_open_traces: int = 256):
+        self.window = window
+        self.max_open_traces = max_open_traces
+        self._durations: Dict[str, Deque[float]] = dict()
+        # Trace id -> perf_counter at its begin, oldest dropped first
+        self._open_traces: "OrderedDict[int, float]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+
+    @property
+    def is_dumping(self) -> bool:
+        return self._file is not None
+
+    def dump_to(self, path: str) -> None:
+        """Append every following span to a JSONL file.
+    """
+        file = open(path, "a", encoding="utf-8")
+        with self._lock:
+            previous, self._file = self._file, file
+        if previous is not None:
+            previous.close()
+
+    def stop_dump(self) -> None:
+        with self._lock:
+            file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+    def begin(self) -> int:
+        """Start a trace and return its id.
+    """
+        with self._lock:
+            trace_id = next(self._ids)
+            self._open_traces[trace_id] = time.perf_counter()
+            # Traces of coalesced events are never ended
+            while len(self._open_traces) > self.max_open_traces:
+                self._open_traces.popitem(last=False)
+        return trace_id
+
+    def end(self, trace_id: int) -> Optional[float]:
+        """Record the end to end duration of a trace.
+
+    Returns:
+        Optional[float]: Seconds since the trace began, None for an unknown or
+        already ended trace.
+    """
+        with self._lock:
+            start = self._open_traces.pop(trace_id, None)
+        if start is None:
+            return None
+        duration = time.perf_counter() - start
+        self.record(Tracer.END_TO_END, duration, trace_id)
+        return duration
+
+    @contextmanager
+    def span(self, stage: str, trace_id: int = 0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, trace_id)
+
+    def record(self, stage: str, duration: float, trace_id: int = 0) -> None:
+        with self._lock:
+            durations = self._durations.get(stage)
+            if durations is None:
+                durations = self._durations[stage] = deque(maxlen=self.window)
+            durations.append(duration)
+            if self._file is not None:
+                self._write({
+                    "time": time.time(),
+                    "trace": trace_id,
+                    "stage": stage,
+                    "duration_ms": round(duration * 1000, 3),
+                    "thread": threading.current_thread().name
+                })
+
+    def _write(self, record: dict) -> None:
+        try:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+        except (OSError, ValueError) as e:
+            logging.warning(f"Stopped dumping traces: {e}")
+            self._file = None
+
+    def stats(self, stage: str) -> Optional[TraceStats]:
+        with self._lock:
+            durations = sorted(self._durations.get(stage, ()))
+        if not durations:
+            return None
+        return TraceStats(
+            count=len(durations),
+            p50=Tracer._percentile(durations, 50),
+            p95=Tracer._percentile(durations, 95),
+            p99=Tracer._percentile(durations, 99)
+        )
+
+    def summary(self) -> Dict[str, TraceStats]:
+        with self._lock:
+            stages = list(self._durations)
+        return {stage: self.stats(stage) for stage in stages}
+
+    def format(self) -> str:
+        """Return the percentiles of every stage, one stage per line.
+    """
+        return "\n".join(f"{stage}: p50 {x.p50 * 1000:.1f} ms, p95 {x.p95 * 1000:.1f} ms, "
+                         f"p99 {x.p99 * 1000:.1f} ms ({x.count} spans)" for stage, x in self.summary().items())
+
+    @staticmethod
+    def _percentile(durations, percent: int) -> float:
+        # Nearest rank of sorted durations
+        rank = max(-(-len(durations) * percent // 100), 1)
+        return durations[rank - 1]
@@ -3,22 +3,34 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from src.services import WorkerService, ApiService
+    from src.services import WorkerService, ApiService, ChampionSelectService
 
-from constants import Monsoon, Workers
-from models import ChampionSelectSessionModel
-from utils import EventHandler, ResourceHelper
+from constants import FreshnessStates, Monsoon, Workers
+from models import ChampionSelectResultModel, ChampionSelectSessionModel, SourceFreshnessModel
+from utils import EventHandler, ResourceHelper, Tracer
 
 from PySide6 import QtCore, QtGui
 from dependency_injector.wiring import Provide, inject
+import time
 
 
 class AppWindowViewModel(object):
+    # Source name -> title shown in the freshness indicator
+    SOURCE_TITLES = {
+        "datadragon": "DataDragon",
+        "lolfandom": "LoL Fandom",
+        "lolalytics": "LoLalytics"
+    }
+    # Milliseconds between updates of the ages shown in the freshness indicator
+    FRESHNESS_UPDATE_INTERVAL = 60 * 1000
+
     @inject
     def __init__(
             self,
             worker_service: WorkerService = Provide["worker_service"],
-            api_service: ApiService = Provide["api_service"]
+            api_service: ApiService = Provide["api_service"],
+            champion_select_service: ChampionSelectService = Provide["champion_select_service"],
+            tracer: Tracer = Provide["tracer"]
     ):
         self.object_name = "appView"
         self.window_title = Monsoon.TITLE
@@ -29,11 +41,25 @@ class AppWindowViewModel(object):
 
         self._available_champion_dynamic_balances = []
         self._team_champion_dynamic_balances = []
+        # Slots changed by the last applied result, None when every slot has to be compared
+        self._champion_slot_changes = None
+        # Changes of results skipped for a newer one, applied along with the next result
+        self._skipped_champion_slot_changes = ()
         self._is_enabled = False
 
         self.property_changed = EventHandler()
 
         self.api_service = api_service
+        self.tracer = tracer
+        # Freshness is changed by the refresh scheduler, the signal queues it here
+        self._freshness = api_service.freshness
+        api_service.com.freshness_signal.connect(self.on_freshness, QtCore.Qt.QueuedConnection)
+        self.freshness_timer = QtCore.QTimer()
+        self.freshness_timer.timeout.connect(lambda: self.property_changed.invoke(self, "freshness"))
+        self.freshness_timer.start(AppWindowViewModel.FRESHNESS_UPDATE_INTERVAL)
+        # Sessions are resolved on worker threads, only results reach the GUI thread
+        self.champion_select_service = champion_select_service
+        self.champion_select_service.com.result_signal.connect(self.on_result, QtCore.Qt.QueuedConnection)
         # Start worker threads
         lockfile_watcher_worker = worker_service.get(Workers.LOCKFILE_WATCHER)
         lockfile_watcher_worker.start()
@@ -43,21 +69,76 @@ class AppWindowViewModel(object):
 
     @QtCore.Slot(ChampionSelectSessionModel)
     def on_data(self, data: ChampionSelectSessionModel):
-        team_champion_dynamic_balances = []
-        for id in data.team_champion_ids:
-            champion = self.api_service.data_dragon.fetch_by_champion_id(id)
-            balance = self.api_service.lol_fandom.fetch_dynamic_balance_by_champion_name(champion["name"])
-            balance.champion_icon = self.api_service.data_dragon.fetch_icon_by_champion_id(id)
-            team_champion_dynamic_balances.append(balance)
-        available_champion_dynamic_balances = []
-        for id in data.available_champion_ids:
-            champion = self.api_service.data_dragon.fetch_by_champion_id(id)
-            balance = self.api_service.lol_fandom.fetch_dynamic_balance_by_champion_name(champion["name"])
-            balance.champion_icon = self.api_service.data_dragon.fetch_icon_by_champion_id(id)
-            available_champion_dynamic_balances.append(balance)
-
-        self.team_champion_dynamic_balances = team_champion_dynamic_balances
-        self.available_champion_dynamic_balances = available_champion_dynamic_balances
+        self.champion_select_service.submit(data)
+
+    @QtCore.Slot(ChampionSelectResultModel)
+    def on_result(self, result: ChampionSelectResultModel):
+        # A newer session was submitted while this one was queued
+        if not self.champion_select_service.is_latest(result):
+            self._skipped_champion_slot_changes += result.changes
+            return
+        self._champion_slot_changes = self._skipped_champion_slot_changes + result.changes
+        self._skipped_champion_slot_changes = ()
+        self._team_champion_dynamic_balances = list(result.team_champion_dynamic_balances)
+        self._available_champion_dynamic_balances = list(result.available_champion_dynamic_balances)
+        self.property_changed.invoke(self, None)
+        # Views updated their models, they repaint on the next pass of the event loop
+        self.tracer.end(result.trace_id)
+
+    @QtCore.Slot(SourceFreshnessModel)
+    def on_freshness(self, freshness: SourceFreshnessModel):
+        self.freshness = dict(self._freshness, **{freshness.source: freshness})
+
+    @property
+    def freshness(self):
+        return self._freshness
+
+    @freshness.setter
+    def freshness(self, value):
+        self._freshness = value
+        self.property_changed.invoke(self, "freshness")
+
+    @property
+    def freshness_text(self) -> str:
+        """One line telling how current the data of every source is.
+    """
+        now = time.time()
+        return " · ".join(f"{AppWindowViewModel.SOURCE_TITLES.get(x.source, x.source)}: "
+                          f"{AppWindowViewModel.format_freshness(x, now)}" for x in self._freshness.values())
+
+    @property
+    def freshness_tooltip(self) -> str:
+        errors = [f"{AppWindowViewModel.SOURCE_TITLES.get(x.source, x.source)}: {x.error}"
+                  for x in self._freshness.values() if x.error]
+        if not errors:
+            return "Champion data is checked for updates in the background"
+        return "Using the last saved data, the last check failed:\n" + "\n".join(errors)
+
+    @staticmethod
+    def format_freshness(freshness: SourceFreshnessModel, now: float) -> str:
+        if freshness.updated_at is None:
+            data = "no data"
+        else:
+            data = f"data from {AppWindowViewModel.format_age(now - freshness.updated_at)}"
+        if freshness.state is FreshnessStates.FRESH:
+            return f"updated {AppWindowViewModel.format_age(now - freshness.updated_at)}"
+        if freshness.state is FreshnessStates.OFFLINE:
+            return f"offline, {data}"
+        return f"checking, {data}"
+
+    @staticmethod
+    def format_age(seconds: float) -> str:
+        if seconds < 60:
+            return "just now"
+        if seconds < 60 * 60:
+            return f"{int(seconds // 60)} min ago"
+        if seconds < 24 * 60 * 60:
+            return f"{int(seconds // (60 * 60))} h ago"
+        return f"{int(seconds // (24 * 60 * 60))} d ago"
+
+    @property
+    def champion_slot_changes(self):
+        return self._champion_slot_changes
 
     @property
     def available_champion_dynamic_balances(self):
@@ -66,6 +147,7 @@ class AppWindowViewModel(object):
     @available_champion_dynamic_balances.setter
     def available_champion_dynamic_balances(self, value):
         self._available_champion_dynamic_balances = value
+        self._champion_slot_changes = None
         self.property_changed.invoke(self, None)
 
     @property
@@ -75,6 +157,7 @@ class AppWindowViewModel(object):
     @team_champion_dynamic_balances.setter
     def team_champion_dynamic_balances(self, value):
         self._team_champion_dynamic_balances = value
+        self._champion_slot_changes = None
         self.property_changed.invoke(self, None)
 
     @property
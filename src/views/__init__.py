@@ -1,5 +1,6 @@
 from .widgets.qimage import *
-from .widgets.qchampiontemplate import *
+from .widgets.qchampionbalancelistmodel import *
+from .widgets.qchampionbalancedelegate import *
 from .aboutwindowview import *
 from .appwindowview import *
 from .systemtray import *
@@ -1,30 +1,35 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 if TYPE_CHECKING:
+    from models import ChampionSlotChangeModel
     from viewmodels import AppWindowViewModel
-    from models import DynamicBalanceModel
 from utils import (
+    PixmapCache,
+    Tracer,
     QtContainerFactory,
     QtContainerLayouts,
     QtHelpers,
     QtStretches
 )
-from views import QImage, QChampionTemplate
+from views import QImage, QChampionBalanceDelegate, QChampionBalanceListModel
 
 from dependency_injector.wiring import Provide, inject
-from PySide6 import QtWidgets, QtGui
+from PySide6 import QtWidgets, QtCore
 
 
 class AppWindowView(QtWidgets.QMainWindow):
     @inject
     def __init__(
             self,
-            app_window_viewmodel: AppWindowViewModel = Provide["app_window_viewmodel"]
+            app_window_viewmodel: AppWindowViewModel = Provide["app_window_viewmodel"],
+            pixmap_cache: PixmapCache = Provide["pixmap_cache"],
+            tracer: Tracer = Provide["tracer"]
     ):
         super().__init__()
         self.viewmodel = app_window_viewmodel
+        self.tracer = tracer
         self.setObjectName(self.viewmodel.object_name)
 
         # Setup the view
@@ -32,12 +37,20 @@ class AppWindowView(QtWidgets.QMainWindow):
         self.title_bar = QtContainerFactory.create(QtContainerLayouts.HORIZONTAL)
         self.content_area = QtContainerFactory.create(QtContainerLayouts.HORIZONTAL)
         self.team_champions_panel = QtContainerFactory.create(QtContainerLayouts.VERTICAL)
-        self.team_champions_list_box = QtContainerFactory.create(QtContainerLayouts.VERTICAL)
         self.available_champions_panel = QtContainerFactory.create(QtContainerLayouts.VERTICAL)
-        self.available_champions_list_box = QtContainerFactory.create(QtContainerLayouts.GRID)
 
         self.title_bar.layout.addWidget(QImage(self.viewmodel.wordmark_pixmap))
         self.title_bar.container.setMaximumHeight(64)
+        self.freshness_label = QtWidgets.QLabel()
+        self.freshness_label.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        self.freshness_label.setStyleSheet("""
+    QWidget {
+      font-size: 9pt;
+      color: gray;
+    }
+    """)
+        self.title_bar.layout.addWidget(self.freshness_label)
+        self.render_freshness()
 
         self.team_champions_panel_label = QtWidgets.QLabel("Team Champions")
         self.team_champions_panel_label.setStyleSheet("""
@@ -47,20 +60,10 @@ class AppWindowView(QtWidgets.QMainWindow):
     }
     """)
         self.team_champions_panel.layout.addWidget(self.team_champions_panel_label)
-        self.team_champions_list_box_widgets: List[QChampionTemplate] = []
-        for i in range(5):
-            widget = QChampionTemplate()
-            widget.set_champion_image_text_stylesheet("""
-      QWidget {
-        font-size: 13pt;
-        font-weight: light;
-      }
-      """)
-            widget.setContentsMargins(16, 0, 16, 4)
-            self.team_champions_list_box.layout.addWidget(widget)
-            self.team_champions_list_box_widgets.append(widget)
-        self.team_champions_list_box.container.setSizePolicy(QtHelpers.create_size_policy(QtStretches.VERTICAL, 3))
-        self.team_champions_panel.layout.addWidget(self.team_champions_list_box.container)
+        self.team_champions_model = QChampionBalanceListModel(pixmap_cache)
+        self.team_champions_list_view = self._create_list_view(self.team_champions_model, 1)
+        self.team_champions_list_view.setSizePolicy(QtHelpers.create_size_policy(QtStretches.VERTICAL, 3))
+        self.team_champions_panel.layout.addWidget(self.team_champions_list_view)
 
         self.available_champions_panel_label = QtWidgets.QLabel("Available Champions")
         self.available_champions_panel_label.setStyleSheet("""
@@ -70,21 +73,10 @@ class AppWindowView(QtWidgets.QMainWindow):
     }
     """)
         self.available_champions_panel.layout.addWidget(self.available_champions_panel_label)
-        self.available_champions_list_box_widgets: List[QChampionTemplate] = []
-        for i in range(2):
-            for j in range(5):
-                widget = QChampionTemplate()
-                widget.set_champion_image_text_stylesheet("""
-        QWidget {
-          font-size: 13pt;
-          font-weight: light;
-        }
-        """)
-                widget.setContentsMargins(16, 0, 16, 4)
-                self.available_champions_list_box.layout.addWidget(widget, j + 1, i + 1)
-                self.available_champions_list_box_widgets.append(widget)
-        self.available_champions_list_box.container.setSizePolicy(QtHelpers.create_size_policy(QtStretches.VERTICAL, 1))
-        self.available_champions_panel.layout.addWidget(self.available_champions_list_box.container)
+        self.available_champions_model = QChampionBalanceListModel(pixmap_cache)
+        self.available_champions_list_view = self._create_list_view(self.available_champions_model, 2)
+        self.available_champions_list_view.setSizePolicy(QtHelpers.create_size_policy(QtStretches.VERTICAL, 1))
+        self.available_champions_panel.layout.addWidget(self.available_champions_list_view)
 
         self.team_champions_panel.container.setSizePolicy(QtHelpers.create_size_policy(QtStretches.HORIZONTAL, 1))
         self.team_champions_panel.layout.setContentsMargins(8, 0, 8, 0)
@@ -106,33 +98,40 @@ class AppWindowView(QtWidgets.QMainWindow):
         self.setCentralWidget(self.vbox.container)
 
     def on_property_changed(self, event, args) -> None:
-        for x in self.available_champions_list_box_widgets:
-            widget: QChampionTemplate = x
-            widget.clear_contents()
-        for x in self.team_champions_list_box_widgets:
-            widget: QChampionTemplate = x
-            widget.clear_contents()
-
-        for (i, x) in enumerate(self.viewmodel.available_champion_dynamic_balances):
-            if i > len(self.available_champions_list_box_widgets) - 1:
-                break
-            balance: DynamicBalanceModel = x
-            widget: QChampionTemplate = self.available_champions_list_box_widgets[i]
-            if balance.champion_icon is not None:
-                pixmap = QtGui.QPixmap()
-                pixmap.loadFromData(balance.champion_icon)
-                widget.set_champion_image(pixmap)
-            widget.set_champion_image_text(balance.champion_name)
-            widget.set_champion_modifiers_data_source(balance.format_balance_levers())
-
-        for (i, x) in enumerate(self.viewmodel.team_champion_dynamic_balances):
-            if i > len(self.team_champions_list_box_widgets) - 1:
-                break
-            balance: DynamicBalanceModel = x
-            widget: QChampionTemplate = self.team_champions_list_box_widgets[i]
-            if balance.champion_icon is not None:
-                pixmap = QtGui.QPixmap()
-                pixmap.loadFromData(balance.champion_icon)
-                widget.set_champion_image(pixmap)
-            widget.set_champion_image_text(balance.champion_name)
-            widget.set_champion_modifiers_data_source(balance.format_balance_levers())
+        if args == "freshness":
+            self.render_freshness()
+            return
+        # Only the slots of a change set are compared, every row without one
+        changes = self.viewmodel.champion_slot_changes
+        with self.tracer.span("render"):
+            self.available_champions_model.set_balances(self.viewmodel.available_champion_dynamic_balances,
+                                                        AppWindowView._changed_rows(changes, "bench"))
+            self.team_champions_model.set_balances(self.viewmodel.team_champion_dynamic_balances,
+                                                   AppWindowView._changed_rows(changes, "team"))
+
+    @staticmethod
+    def _changed_rows(changes: Optional[Tuple[ChampionSlotChangeModel, ...]], group: str) -> Optional[List[int]]:
+        if changes is None:
+            return None
+        return [x.slot for x in changes if x.group == group]
+
+    def render_freshness(self) -> None:
+        self.freshness_label.setText(self.viewmodel.freshness_text)
+        self.freshness_label.setToolTip(self.viewmodel.freshness_tooltip)
+
+    def _create_list_view(self, model: QChampionBalanceListModel, columns: int) -> QtWidgets.QListView:
+        """Create a list view painting the champions of a model, flowing into the
+    given number of columns.
+    """
+        list_view = QtWidgets.QListView()
+        list_view.setModel(model)
+        list_view.setItemDelegate(QChampionBalanceDelegate(columns, list_view))
+        list_view.setFlow(QtWidgets.QListView.LeftToRight if columns > 1 else QtWidgets.QListView.TopToBottom)
+        list_view.setWrapping(columns > 1)
+        list_view.setResizeMode(QtWidgets.QListView.Adjust)
+        list_view.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        list_view.setFocusPolicy(QtCore.Qt.NoFocus)
+        list_view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        list_view.setFrameShape(QtWidgets.QFrame.NoFrame)
+        list_view.setStyleSheet("background-color: transparent;")
+        return list_view
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models import DynamicBalanceModel
+from constants import Monsoon
+from views import QChampionBalanceListModel
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+
+class QChampionBalanceDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a champion of a QChampionBalanceListModel: icon and name on the
+    left, rank/winrate and balance levers on the right. Items are laid out in a
+    number of columns filling the width of the view.
+    """
+    BACKGROUND_COLOR = QtGui.QColor("#103038")
+    # Space around an item, then inside its background
+    MARGINS = QtCore.QMargins(16, 0, 16, 4)
+    PADDING = 8
+    MINIMUM_WIDTH = 240
+    TEXT_ALIGNMENT = QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter
+    MODIFIERS_ALIGNMENT = QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop
+
+    def __init__(self, columns: int = 1, parent: QtCore.QObject = None):
+        super().__init__(parent)
+        self.columns = columns
+        self.name_font = QtGui.QFont()
+        self.name_font.setPointSize(13)
+        self.name_font.setWeight(QtGui.QFont.Light)
+        self.header_font = QtGui.QFont()
+        self.header_font.setPointSize(12)
+        self.header_font.setWeight(QtGui.QFont.Normal)
+        self.modifier_font = QtGui.QFont()
+        self.modifier_font.setPointSize(8)
+        self.modifier_font.setWeight(QtGui.QFont.DemiBold)
+        self.name_metrics = QtGui.QFontMetrics(self.name_font)
+        self.header_metrics = QtGui.QFontMetrics(self.header_font)
+        self.modifier_metrics = QtGui.QFontMetrics(self.modifier_font)
+
+    @staticmethod
+    def _modifiers_text(balance: DynamicBalanceModel) -> str:
+        return "\n".join(balance.format_balance_levers())
+
+    def _content_height(self, balance: DynamicBalanceModel) -> int:
+        icon_height = Monsoon.CHAMPION_ICON_SIZE + self.name_metrics.height()
+        lines = self._modifiers_text(balance).count("\n") + 1
+        modifiers_height = self.header_metrics.height() + lines * self.modifier_metrics.lineSpacing()
+        return max(icon_height, modifiers_height)
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        balance = index.data(QChampionBalanceListModel.BalanceRole)
+        height = self.PADDING * 2 + self.MARGINS.top() + self.MARGINS.bottom()
+        if balance is not None:
+            height += self._content_height(balance)
+        width = self.MINIMUM_WIDTH
+        view = option.widget
+        if isinstance(view, QtWidgets.QAbstractItemView):
+            # Room for the scroll bar is always left, sizing by the viewport would
+            # show and hide the scroll bar in turns. Spacing and a pixel of slack
+            # keep the last column from wrapping.
+            available = view.maximumViewportSize().width() - view.verticalScrollBar().sizeHint().width() - 1
+            spacing = view.spacing() * 2 if isinstance(view, QtWidgets.QListView) else 0
+            width = max(width, available // self.columns - spacing)
+        return QtCore.QSize(width, height)
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem,
+              index: QtCore.QModelIndex) -> None:
+        balance: DynamicBalanceModel = index.data(QChampionBalanceListModel.BalanceRole)
+        if balance is None:
+            return
+        painter.save()
+        rect = option.rect.marginsRemoved(self.MARGINS)
+        painter.fillRect(rect, self.BACKGROUND_COLOR)
+        content = rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        painter.setPen(option.palette.color(QtGui.QPalette.Text))
+
+        # Icon with the champion name below
+        icon_size = Monsoon.CHAMPION_ICON_SIZE
+        icon = index.data(QtCore.Qt.DecorationRole)
+        if icon is not None:
+            painter.drawPixmap(content.left(), content.top(), icon)
+        name_width = max(icon_size, self.name_metrics.horizontalAdvance(balance.champion_name))
+        painter.setFont(self.name_font)
+        painter.drawText(QtCore.QRect(content.left(), content.top() + icon_size, name_width,
+                                      self.name_metrics.height()),
+                         self.TEXT_ALIGNMENT, balance.champion_name)
+
+        # Rank, winrate and balance levers
+        x = content.left() + name_width + self.PADDING
+        y = content.top()
+        width = max(content.right() - x, 0)
+        painter.setFont(self.header_font)
+        painter.drawText(QtCore.QRect(x, y, width, self.header_metrics.height()), self.TEXT_ALIGNMENT, "Modifiers")
+        y += self.header_metrics.height()
+        # All modifiers in one multi-line text, laid out by Qt in a single pass
+        painter.setFont(self.modifier_font)
+        painter.drawText(QtCore.QRect(x, y, width, max(content.bottom() - y, 0)), self.MODIFIERS_ALIGNMENT,
+                         self._modifiers_text(balance))
+        painter.restore()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from models import DynamicBalanceModel
+from constants import Monsoon
+from utils import PixmapCache
+
+from PySide6 import QtCore, QtGui
+
+
+class QChampionBalanceListModel(QtCore.QAbstractListModel):
+    """List model over the resolved dynamic balances of a champion panel. Rows
+    are updated in place, so views only repaint the rows that changed.
+    """
+    BalanceRole = QtCore.Qt.UserRole + 1
+
+    def __init__(self, pixmap_cache: PixmapCache = None, parent: QtCore.QObject = None):
+        super().__init__(parent)
+        self.pixmap_cache = pixmap_cache or PixmapCache()
+        self.icon_size = QtCore.QSize(Monsoon.CHAMPION_ICON_SIZE, Monsoon.CHAMPION_ICON_SIZE)
+        self._balances: List[DynamicBalanceModel] = []
+
+    @property
+    def balances(self) -> List[DynamicBalanceModel]:
+        return list(self._balances)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._balances)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._balances):
+            return None
+        balance = self._balances[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return balance.champion_name
+        if role == QtCore.Qt.DecorationRole:
+            return self._icon(balance)
+        if role == QtCore.Qt.ToolTipRole:
+            return "\n".join(balance.format_balance_levers())
+        if role == QChampionBalanceListModel.BalanceRole:
+            return balance
+        return None
+
+    def set_balances(self, balances: List[DynamicBalanceModel], rows: Optional[Iterable[int]] = None) -> int:
+        """Replace the balances row by row. Rows holding an equal balance are left
+    alone, rows are only inserted or removed when the count changes.
+
+    Args:
+        balances (list): Balances to show.
+        rows (Iterable[int]): Rows known to have changed, such as the slots of a
+            change set. Other rows are not compared. None compares every row.
+
+    Returns:
+        int: Number of rows that changed, were inserted or were removed.
+    """
+        changed = abs(len(balances) - len(self._balances))
+        common = min(len(self._balances), len(balances))
+        for row in range(common) if rows is None else sorted(x for x in set(rows) if x < common):
+            if self._balances[row] != balances[row]:
+                self._balances[row] = balances[row]
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+                changed += 1
+
+        if len(balances) > common:
+            self.beginInsertRows(QtCore.QModelIndex(), common, len(balances) - 1)
+            self._balances.extend(balances[common:])
+            self.endInsertRows()
+        elif len(self._balances) > common:
+            self.beginRemoveRows(QtCore.QModelIndex(), common, len(self._balances) - 1)
+            del self._balances[common:]
+            self.endRemoveRows()
+        return changed
+
+    def _icon(self, balance: DynamicBalanceModel) -> Optional[QtGui.QPixmap]:
+        if balance.champion_icon is None:
+            return None
+        key = PixmapCache.key(balance.champion_id, balance.champion_icon_version, self.icon_size)
+        return self.pixmap_cache.pixmap(key, balance.champion_icon)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from PySide6 import QtWidgets, QtCore, QtGui
 
 
@@ -5,9 +7,20 @@ class QImage(QtWidgets.QLabel):
     def __init__(self, pixmap: QtGui.QPixmap = None, parent=None):
         super().__init__(parent)
         self.setScaledContents(True)
+        self.setMaximumSize(QtCore.QSize(4000, 5000))
+        # Pixmap scaled to the widget, only rebuilt when the pixmap or size changes
+        self._scaled_pixmap: Optional[QtGui.QPixmap] = None
         if pixmap is not None:
             self.setPixmap(pixmap)
 
+    def setPixmap(self, pixmap: QtGui.QPixmap) -> None:
+        self._scaled_pixmap = None
+        super().setPixmap(pixmap)
+
+    def clear(self) -> None:
+        self._scaled_pixmap = None
+        super().clear()
+
     def hasHeightForWidth(self) -> bool:
         return self.pixmap() is not None
 
@@ -16,13 +29,21 @@ class QImage(QtWidgets.QLabel):
             return int(w * (self.pixmap().height() / self.pixmap().width()))
         return 0
 
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        self._scaled_pixmap = None
+        super().resizeEvent(event)
+
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
-        if self.pixmap():
-            size = self.size()
-            painter = QtGui.QPainter(self)
-            point = QtCore.QPoint(0, 0)
-            scaledPix = self.pixmap().scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            point.setX(0)
-            point.setY(0)
-            painter.drawPixmap(point, scaledPix)
-            self.setMaximumSize(QtCore.QSize(4000, 5000))
+        pixmap = self.pixmap()
+        if pixmap is None or pixmap.isNull():
+            return
+        if self._scaled_pixmap is None:
+            # Pre-scaled pixmaps that already fit are drawn as they are
+            size = pixmap.size().scaled(self.size(), QtCore.Qt.KeepAspectRatio)
+            if size == pixmap.size():
+                self._scaled_pixmap = pixmap
+            else:
+                self._scaled_pixmap = pixmap.scaled(self.size(), QtCore.Qt.KeepAspectRatio,
+                                                    QtCore.Qt.SmoothTransformation)
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(QtCore.QPoint(0, 0), self._scaled_pixmap)
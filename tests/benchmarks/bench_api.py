@@ -0,0 +1,272 @@
+"""Benchmark of constructing the API clients (DataDragon, LoLalytics, LolFandom
+and a full ApiService) against local stand-in servers, so runs need no network
+and are reproducible. Every scenario runs with cold caches, then again with the
+caches the cold run left behind.
+
+The stand-ins serve the responses of a fixtures directory, by default the
+fixtures committed next to this file, or with --built responses built to
+resemble the upstream websites. --record fetches the responses from the live
+websites once and saves them as fixtures.
+
+Results are printed and can be written to a JSON file. Medians are compared
+against a baseline (the JSON of an earlier run, by default baseline.json next
+to this file) and the exit status is 1 when a scenario got slower by more than
+the tolerance. A baseline of other responses is not compared against. The
+committed baseline was measured on the platform it names; after fixtures or
+hardware change, write a new one with --output.
+
+Usage: python tests/benchmarks/bench_api.py [--fixtures DIR | --built] [--record DIR] [--repeat N]
+                                            [--output FILE] [--baseline FILE] [--tolerance RATIO]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./tests/"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtCore, QtGui
+
+from apis import DataDragon, HttpClient, LolFandom
+from apis.lolalytics import LoLalytics
+from services import ApiService
+from standin import StandInServer
+from upstream import championdata_module, champion_names, fandom_module_page, lolalytics_build_page, \
+    lolalytics_tierlist_page
+from utils import DiskCache, IconStore
+
+# Stand-in name -> upstream website it replaces
+UPSTREAMS = {
+    "datadragon": "https://ddragon.leagueoflegends.com",
+    "fandom": "https://leagueoflegends.fandom.com",
+    "lolalytics": "https://lolalytics.com",
+}
+# Committed fixtures and the baseline measured against them
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+VERSION = "12.19.1"
+REVISION = 4242
+ICONS_PER_SPRITE = 40
+
+
+def create_png(seed: int, width: int, height: int) -> bytes:
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32)
+    image.fill(QtGui.QColor(seed * 37 % 256, seed * 91 % 256, seed * 13 % 256))
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def lolalytics_key(name: str) -> str:
+    return name.strip().lower().replace(" ", "").replace("'", "")
+
+
+def serve_built(servers: dict, count: int = 170) -> None:
+    """Serve responses built to resemble the upstream websites for count
+    champions.
+    """
+    names = champion_names(count)
+    ids = ["".join(x for x in name if x.isalnum()) for name in names]
+    champions = {"data": {id: {
+        "id": id, "key": str(i + 1), "name": name,
+        "image": {"sprite": f"champion{i // ICONS_PER_SPRITE}.png",
+                  "x": i % ICONS_PER_SPRITE % 10 * 48, "y": i % ICONS_PER_SPRITE // 10 * 48, "w": 48, "h": 48}
+    } for i, (id, name) in enumerate(zip(ids, names))}}
+    data_dragon = servers["datadragon"]
+    data_dragon.route("/api/versions.json", json.dumps([VERSION, "12.18.1"]), etag='"versions"')
+    data_dragon.route(f"/cdn/{VERSION}/data/en_US/champion.json", json.dumps(champions), etag='"champions"')
+    for i, id in enumerate(ids):
+        data_dragon.route(f"/cdn/{VERSION}/img/champion/{id}.png", create_png(i, 120, 120))
+    for sprite in range(-(-count // ICONS_PER_SPRITE)):
+        data_dragon.route(f"/cdn/{VERSION}/img/sprite/champion{sprite}.png", create_png(sprite, 480, 192))
+
+    source = championdata_module(count)
+    fandom = servers["fandom"]
+    fandom.route(f"/api.php?action=query&prop=revisions&titles=Module:ChampionData/data&rvprop=ids"
+                 f"&format=json&formatversion=2", json.dumps({"query": {"pages": [
+                     {"pageid": 1, "title": "Module:ChampionData/data", "revisions": [{"revid": REVISION}]}]}}))
+    fandom.route(f"/index.php?title=Module:ChampionData/data&action=raw&oldid={REVISION}", source)
+    fandom.route("/wiki/Module:ChampionData/data", fandom_module_page(source))
+
+    # Every tenth champion is missing from the tierlist and read from its page
+    winrates = {lolalytics_key(name): None if i % 10 == 9 else 45 + i % 100 / 10 for i, name in enumerate(names)}
+    lolalytics = servers["lolalytics"]
+    lolalytics.route("/lol/tierlist/aram/?patch=14", lolalytics_tierlist_page(winrates))
+    for i, champ in enumerate(winrates):
+        if winrates[champ] is None:
+            lolalytics.route(f"/lol/{champ}/aram/build/?patch=14", lolalytics_build_page(champ, 50 + i % 7))
+
+
+def create_scenarios(servers: dict):
+    """Return scenario name -> function constructing a client in a cache
+    directory.
+    """
+    data_dragon_url = servers["datadragon"].url
+    fandom_url = servers["fandom"].url
+    lolalytics_url = servers["lolalytics"].url
+
+    def data_dragon(path: Path):
+        DataDragon(url=data_dragon_url, http_client=HttpClient(), cache=DiskCache(path / "cache"),
+                   icon_store=IconStore(path / "icons"), prefetch_icons=False)
+
+    def data_dragon_icons(path: Path):
+        api = DataDragon(url=data_dragon_url, http_client=HttpClient(), cache=DiskCache(path / "cache"),
+                         icon_store=IconStore(path / "icons"))
+        api.icon_prefetcher.join()
+
+    def lolalytics(path: Path):
+        LoLalytics(HttpClient(), DiskCache(path / "cache"), base_url=lolalytics_url)
+
+    def lol_fandom(path: Path):
+        LolFandom(http_client=HttpClient(), cache=DiskCache(path / "cache"), url=fandom_url,
+                  lolalytics_url=lolalytics_url)
+
+    def api_service(path: Path):
+        ApiService(
+            http_client=HttpClient(),
+            use_snapshot=False,
+            data_dragon_options={"url": data_dragon_url, "cache": DiskCache(path / "cache"),
+                                 "icon_store": IconStore(path / "icons"), "prefetch_icons": False},
+            lol_fandom_options={"url": fandom_url, "lolalytics_url": lolalytics_url,
+                                "cache": DiskCache(path / "cache")})
+
+    return {
+        "DataDragon()": data_dragon,
+        "DataDragon() + icons": data_dragon_icons,
+        "LoLalytics()": lolalytics,
+        "LolFandom()": lol_fandom,
+        "ApiService()": api_service,
+    }
+
+
+def measure(servers: dict, fn, repeat: int) -> dict:
+    """Run a scenario repeat times with cold caches and repeat times with the
+    caches of the last cold run, returning the timings of both.
+    """
+    results = {}
+    root = Path(tempfile.mkdtemp(prefix="bench-api-"))
+    try:
+        for cache in ("cold", "warm"):
+            durations = []
+            requests = sum(len(x.requests) for x in servers.values())
+            sent = sum(x.bytes_sent for x in servers.values())
+            for i in range(repeat):
+                if cache == "cold":
+                    shutil.rmtree(root, ignore_errors=True)
+                start = time.perf_counter()
+                fn(root)
+                durations.append(time.perf_counter() - start)
+            results[cache] = {
+                "best_ms": round(min(durations) * 1000, 2),
+                "median_ms": round(statistics.median(durations) * 1000, 2),
+                "requests": (sum(len(x.requests) for x in servers.values()) - requests) // repeat,
+                "kilobytes": round((sum(x.bytes_sent for x in servers.values()) - sent) / repeat / 1024, 1),
+            }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Print the medians against a baseline and return the scenarios that got
+    slower by more than the tolerance.
+    """
+    regressions = []
+    print(f"\n{'scenario':<22} {'cache':<5} {'baseline ms':>12} {'median ms':>10} {'ratio':>6}")
+    for scenario, caches in results.items():
+        for cache, result in caches.items():
+            before = baseline.get(scenario, {}).get(cache)
+            if before is None:
+                continue
+            ratio = result["median_ms"] / max(before["median_ms"], 0.01)
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = " slower"
+                regressions.append(f"{scenario} {cache}")
+            print(f"{scenario:<22} {cache:<5} {before['median_ms']:>12.1f} {result['median_ms']:>10.1f} "
+                  f"{ratio:>5.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", default=FIXTURES,
+                        help="directory of recorded responses, one subdirectory per stand-in")
+    parser.add_argument("--built", action="store_true", help="serve built responses instead of fixtures")
+    parser.add_argument("--record", help="directory to record the live responses to")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="JSON results of an earlier run to compare against, empty to not compare")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([])
+    # Fixtures a run used, as they are compared against baselines
+    fixtures = "built" if args.built else os.path.relpath(args.fixtures, os.path.dirname(FIXTURES))
+    servers = {name: StandInServer(upstream if args.record else None) for name, upstream in UPSTREAMS.items()}
+    for server in servers.values():
+        server.start()
+    try:
+        if args.record:
+            # One cold run of every scenario requests everything the clients use
+            for fn in create_scenarios(servers).values():
+                with tempfile.TemporaryDirectory(prefix="bench-api-") as path:
+                    fn(Path(path))
+            for name, server in servers.items():
+                server.save(os.path.join(args.record, name))
+            print(f"Recorded {sum(len(x.fixtures) for x in servers.values())} responses to {args.record}")
+            return
+        if args.built:
+            serve_built(servers)
+        else:
+            for name, server in servers.items():
+                server.load(os.path.join(args.fixtures, name))
+
+        results = {}
+        print(f"{'scenario':<22} {'cache':<5} {'best ms':>9} {'median ms':>10} {'requests':>9} {'KB':>9}")
+        for scenario, fn in create_scenarios(servers).items():
+            results[scenario] = measure(servers, fn, args.repeat)
+            for cache, x in results[scenario].items():
+                print(f"{scenario:<22} {cache:<5} {x['best_ms']:>9.1f} {x['median_ms']:>10.1f} "
+                      f"{x['requests']:>9} {x['kilobytes']:>9.1f}")
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": time.time(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "fixtures": fixtures,
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("fixtures") != fixtures:
+            print(f"\nNot compared, {args.baseline} was measured against {baseline.get('fixtures')}")
+            return
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\nSlower than the baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
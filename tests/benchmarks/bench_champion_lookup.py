@@ -0,0 +1,65 @@
+"""Micro-benchmark of the champion lookups done by AppWindowViewModel.on_data
+for a champion select UPDATE (5 team + 10 bench champions).
+
+Compares the former linear scans of champion.json against the ChampionIndex
+lookup tables for growing champion pools, to show the per-event cost going
+from O(n*k) to O(k).
+
+Usage: python tests/benchmarks/bench_champion_lookup.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.append(os.path.abspath("./src/"))
+
+from apis import ChampionIndex
+
+CHAMPIONS_PER_EVENT = 15
+
+
+def create_champions(n: int) -> dict:
+    return {"data": {
+        f"Champion{i}": {"id": f"Champion{i}", "key": str(i + 1), "name": f"Champion {i}"}
+        for i in range(n)
+    }}
+
+
+def linear_event(champions: dict, champion_ids: list) -> None:
+    data = champions["data"]
+    for champion_id in champion_ids:
+        # fetch_by_champion_id
+        for id in data:
+            if int(data[id]["key"]) == champion_id:
+                break
+        # fetch_icon_by_champion_id
+        for id in data.keys():
+            if int(data[id]["key"]) == champion_id:
+                break
+
+
+def indexed_event(index: ChampionIndex, champion_ids: list) -> None:
+    for champion_id in champion_ids:
+        index.by_key.get(champion_id)
+        index.by_key.get(champion_id)["id"]
+
+
+def measure(fn, number: int = 200) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    random.seed(0)
+    print(f"{'champions':>10} {'linear (us/event)':>18} {'indexed (us/event)':>19} {'speedup':>8}")
+    for n in (170, 340, 680, 1360):
+        champions = create_champions(n)
+        index = ChampionIndex.from_champions("0.0.0", champions)
+        champion_ids = random.sample(range(1, n + 1), CHAMPIONS_PER_EVENT)
+        linear = measure(lambda: linear_event(champions, champion_ids))
+        indexed = measure(lambda: indexed_event(index, champion_ids))
+        print(f"{n:>10} {linear * 1e6:>18.1f} {indexed * 1e6:>19.2f} {linear / indexed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark of extracting single elements from scraped pages: a full-DOM
+BeautifulSoup parse against the streaming HtmlExtractor. Reports parse time and
+peak memory for each page.
+
+Pages are read from a directory of saved pages when given (tierlist.html,
+build.html, module.html), otherwise they are built to resemble the upstream
+pages. --save writes the built pages to a directory.
+
+Usage: python tests/benchmarks/bench_html_extract.py [--pages DIR] [--save DIR]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./tests/"))
+
+from bs4 import BeautifulSoup
+
+from apis.htmlextractor import HtmlExtractor
+from upstream import (
+    LOLALYTICS_WINRATE_CLASS,
+    champion_names,
+    championdata_module,
+    fandom_module_page,
+    lolalytics_build_page,
+    lolalytics_tierlist_page
+)
+
+
+def build_pages() -> dict:
+    names = [x.lower().replace(" ", "") for x in champion_names(170)]
+    winrates = {x: None if i % 40 == 0 else 45 + (i % 100) / 10 for i, x in enumerate(names)}
+    return {
+        "tierlist.html": lolalytics_tierlist_page(winrates, rows=8000),
+        "build.html": lolalytics_build_page("Sona", 52.4, rows=8000),
+        "module.html": fandom_module_page(championdata_module(170)),
+    }
+
+
+# page -> [(description, BeautifulSoup extraction, HtmlExtractor extraction)]
+TARGETS = {
+    "tierlist.html": [
+        ("div.ml-auto.text-right",
+         lambda soup: soup.find("div", class_="ml-auto text-right").get_text(),
+         lambda html: HtmlExtractor.find_text(html, "div", classes=("ml-auto", "text-right"))),
+        ("script[type=qwik/json]",
+         lambda soup: soup.find("script", {"type": "qwik/json"}).string,
+         lambda html: HtmlExtractor.find_text(html, "script", {"type": "qwik/json"})),
+    ],
+    "build.html": [
+        ("p.lolx-links",
+         lambda soup: soup.find("p", class_=LOLALYTICS_WINRATE_CLASS).get_text(),
+         lambda html: HtmlExtractor.find_text(html, "p", classes=LOLALYTICS_WINRATE_CLASS.split())),
+    ],
+    "module.html": [
+        ("pre.mw-code",
+         lambda soup: soup.select("pre.mw-code")[0].text,
+         lambda html: HtmlExtractor.find_all_text(html, "pre", classes=["mw-code"], limit=2)[0]),
+    ],
+}
+
+
+def measure(fn, repeat: int = 5):
+    """Return (best seconds, peak traced bytes, result) of a function.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", help="directory of saved pages")
+    parser.add_argument("--save", help="directory to save the built pages to")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = {}
+        for name in TARGETS:
+            with open(os.path.join(args.pages, name), encoding="utf-8") as f:
+                pages[name] = f.read()
+    else:
+        pages = build_pages()
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+        for name, html in pages.items():
+            with open(os.path.join(args.save, name), "w", encoding="utf-8") as f:
+                f.write(html)
+
+    print(f"{'page':<14} {'size':>8} {'target':<24} {'bs4 ms':>8} {'bs4 MiB':>8} "
+          f"{'scan ms':>8} {'scan MiB':>9} {'speedup':>8}")
+    for name, targets in TARGETS.items():
+        html = pages[name]
+        for description, soup_extract, scan_extract in targets:
+            soup_time, soup_peak, expected = measure(
+                lambda: soup_extract(BeautifulSoup(html, "html.parser")))
+            scan_time, scan_peak, actual = measure(lambda: scan_extract(html))
+            assert actual == expected, f"{description} differs from BeautifulSoup"
+            print(f"{name:<14} {len(html) / 1024:>6.0f}KB {description:<24} {soup_time * 1000:>8.1f} "
+                  f"{soup_peak / 2 ** 20:>8.2f} {scan_time * 1000:>8.1f} {scan_peak / 2 ** 20:>9.2f} "
+                  f"{soup_time / scan_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
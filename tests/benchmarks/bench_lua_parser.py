@@ -0,0 +1,89 @@
+"""Benchmark of evaluating Module:ChampionData: the former lupa path (a Lua
+runtime, blanket sanitizing, lua.eval and copying fields out of Lua proxies)
+against LuaTableParser.
+
+The module is read from the fandom fixtures committed next to this file by
+default, from a saved copy when given (the Lua source, or the wiki page it is
+rendered on), or with --built from a module built to resemble the upstream one.
+--save writes the module to a file.
+
+Usage: python tests/benchmarks/bench_lua_parser.py [--module FILE | --built] [--save FILE]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./tests/"))
+
+from apis.htmlextractor import HtmlExtractor
+from apis.luatableparser import LuaTableParser
+from luareference import evaluate_sanitized
+from upstream import championdata_module
+
+# Fixtures of the LoL Fandom stand-in, the raw module source among them
+FANDOM_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "fandom")
+
+
+def fixture_module() -> str:
+    """Return the module source of the committed fandom fixtures.
+    """
+    with open(os.path.join(FANDOM_FIXTURES, "manifest.json"), encoding="utf-8") as f:
+        entry = next(x for x in json.load(f) if "action=raw" in x["path"])
+    with open(os.path.join(FANDOM_FIXTURES, entry["file"]), encoding="utf-8") as f:
+        return f.read()
+
+
+def measure(fn, repeat: int = 10):
+    """Return (best seconds, result) of a function.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def used_fields(table: dict) -> dict:
+    """Return the fields LolFandom uses, in the shape of the lupa path.
+    """
+    return {name: {"id": champion["id"], "stats": {"aram": champion.get("stats", {}).get("aram")}}
+            for name, champion in table.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", help="saved copy of the module source or wiki page")
+    parser.add_argument("--built", action="store_true", help="build a module instead of using the fixtures")
+    parser.add_argument("--save", help="file to save the module to")
+    args = parser.parse_args()
+
+    if args.module:
+        with open(args.module, encoding="utf-8") as f:
+            source = f.read()
+        # The module source itself starts with a "-- <pre>" comment
+        if "mw-code" in source:
+            source = HtmlExtractor.find_text(source, "pre", classes=["mw-code"])
+    elif args.built:
+        source = championdata_module(170)
+    else:
+        source = fixture_module()
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            f.write(source)
+
+    lupa_time, expected = measure(lambda: evaluate_sanitized(source))
+    parser_time, actual = measure(lambda: used_fields(LuaTableParser.parse(source)))
+    mismatches = [x for x in expected if expected[x] != actual.get(x)]
+
+    print(f"{'module':<10} {'champions':>9} {'lupa ms':>8} {'parser ms':>10} {'speedup':>8} {'mismatches':>11}")
+    print(f"{len(source) / 1024:>8.0f}KB {len(expected):>9} {lupa_time * 1000:>8.1f} {parser_time * 1000:>10.1f} "
+          f"{lupa_time / parser_time:>7.1f}x {len(mismatches):>11}")
+
+
+if __name__ == "__main__":
+    main()
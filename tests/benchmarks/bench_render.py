@@ -0,0 +1,132 @@
+"""Benchmark of updating the champion panels of AppWindowView, list models
+with a painted delegate. Each update is timed until Qt processed the resulting
+events and the panels were painted.
+
+Usage: python tests/benchmarks/bench_render.py [--updates N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./tests/"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from models import BalanceLever, DynamicBalanceModel
+from utils import EventHandler, PixmapCache, Tracer
+from views import AppWindowView
+
+
+class StubViewModel:
+    def __init__(self):
+        self.object_name = "appView"
+        self.window_title = "Monsoon"
+        self.width = 1280
+        self.height = 720
+        self.wordmark_pixmap = QtGui.QPixmap(256, 64)
+        self.property_changed = EventHandler()
+        self.team_champion_dynamic_balances = []
+        self.available_champion_dynamic_balances = []
+        self.freshness_text = ""
+        self.freshness_tooltip = ""
+        self.champion_slot_changes = None
+
+
+def create_icon(seed: int) -> bytes:
+    image = QtGui.QImage(120, 120, QtGui.QImage.Format_ARGB32)
+    image.fill(QtGui.QColor(seed * 37 % 256, seed * 91 % 256, seed * 13 % 256))
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def create_balances(start: int, count: int):
+    return [DynamicBalanceModel(
+        champion_id=i,
+        rank_winrate=f"Rank: {i}\nWinrate: 5{i % 10}.5",
+        champion_name=f"Champion {i}",
+        balance_levers=[BalanceLever("dmg_dealt", 1 + i % 5 / 100), BalanceLever("dmg_taken", 0.95),
+                        BalanceLever("healing", 0.9)][:1 + i % 3],
+        champion_icon=create_icon(i)
+    ) for i in range(start, start + count)]
+
+
+def model_render(view: AppWindowView) -> None:
+    view.on_property_changed(view.viewmodel, None)
+
+
+def create_app_window(viewmodel: StubViewModel) -> QtWidgets.QWidget:
+    return AppWindowView(app_window_viewmodel=viewmodel, pixmap_cache=PixmapCache(), tracer=Tracer())
+
+
+def run(create, render, updates, scenario):
+    """Return the average seconds per update of a scenario, spent in the update
+    itself and in total until the panels were painted, and the widget count.
+    """
+    viewmodel = StubViewModel()
+    view = create(viewmodel)
+    view.show()
+    # Only the champion panels are painted, not the title bar of the window
+    panels = view.content_area.container
+    viewmodel.team_champion_dynamic_balances = create_balances(0, 5)
+    viewmodel.available_champion_dynamic_balances = create_balances(5, 10)
+    render(view)
+    QtWidgets.QApplication.processEvents()
+
+    update = total = 0.0
+    for i in range(updates):
+        team, available = scenario(i)
+        viewmodel.team_champion_dynamic_balances = team
+        viewmodel.available_champion_dynamic_balances = available
+        start = time.perf_counter()
+        render(view)
+        update += time.perf_counter() - start
+        QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+        QtWidgets.QApplication.processEvents()
+        panels.grab()
+        total += time.perf_counter() - start
+    widgets = len(panels.findChildren(QtWidgets.QWidget))
+    view.close()
+    view.deleteLater()
+    QtWidgets.QApplication.processEvents()
+    return update / updates, total / updates, widgets
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    team = create_balances(0, 5)
+    available = create_balances(5, 10)
+    swaps = [create_balances(100 + i, 1)[0] for i in range(2)]
+    others = create_balances(200, 15)
+    scenarios = {
+        # Timer and hover updates; same champions, equal copies of the balances
+        "unchanged": lambda i: (list(team), list(available)),
+        # A bench swap; one bench slot changes
+        "one slot": lambda i: (list(team), [swaps[i % 2]] + available[1:]),
+        # A new champion select; every slot changes
+        "all slots": lambda i: (others[:5], others[5:]) if i % 2 else (team, available),
+    }
+
+    modes = {
+        "model + delegate": (create_app_window, model_render),
+    }
+    print(f"{'scenario':<10} {'mode':<20} {'update':>9} {'total':>9} {'widgets':>8}")
+    for name, scenario in scenarios.items():
+        for mode, (create, render) in modes.items():
+            update, total, widgets = run(create, render, args.updates, scenario)
+            print(f"{name:<10} {mode:<20} {update * 1000:>6.2f} ms {total * 1000:>6.2f} ms {widgets:>8}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
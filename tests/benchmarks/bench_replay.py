@@ -0,0 +1,178 @@
+"""Load test of the champion select event path: a recording of websocket
+events is replayed through LcuEventProcessorWorker, ChampionSelectService,
+AppWindowViewModel and AppWindowView, offscreen. Champion data is served by the
+stand-ins of bench_api.py with warm caches, so no network is needed.
+
+The recording is one made with MONSOON_RECORD_SESSIONS when given, otherwise
+one built to resemble champion select: teammates picking, bench swaps and the
+once a second timer updates that change no champion. --save writes the built
+recording to a file.
+
+Events are replayed at their recorded pace scaled by --speed, or flat out with
+--speed 0. Prints the time until the last result was applied and the latency
+percentiles of every traced stage. --profile writes a cProfile of the GUI thread.
+
+Usage: python tests/benchmarks/bench_replay.py [--recording FILE] [--save FILE] [--speed N]
+                                               [--games N] [--profile FILE]
+"""
+import argparse
+import cProfile
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./tests/"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from lcu_driver.events.responses import WebsocketEventResponse
+from PySide6 import QtCore, QtWidgets
+
+from apis import HttpClient
+from bench_api import UPSTREAMS, serve_built
+from services import (
+    ApiService,
+    ChampionSelectService,
+    LcuEventProcessorWorker,
+    LcuSessionRecorder,
+    LcuSessionReplayer
+)
+from standin import StandInServer
+from utils import DiskCache, IconStore, PixmapCache, Tracer
+from viewmodels import AppWindowViewModel
+from views import AppWindowView
+
+CHAMPIONS = 170
+
+
+def session_data(team: list, bench: list) -> dict:
+    return {
+        "benchChampions": [{"championId": x} for x in bench],
+        "myTeam": [{"championId": x, "cellId": i} for i, x in enumerate(team)],
+        "benchEnabled": True,
+        "timer": {"phase": "BAN_PICK"}
+    }
+
+
+def build_recording(path: str, games: int) -> None:
+    """Write a recording of games champion selects: every teammate rolls a
+    champion, then champions are swapped with the bench while the timer ticks.
+    """
+    random.seed(0)
+    recorder = LcuSessionRecorder(path)
+    uri = LcuEventProcessorWorker.SESSION_URI
+    offset = 0.0
+    for game in range(games):
+        pool = random.sample(range(1, CHAMPIONS + 1), 15)
+        team, bench = [0] * 5, []
+        recorder.record(WebsocketEventResponse(event_type="Create", uri=uri, data=session_data(team, bench)), offset)
+        for slot in range(5):
+            offset += random.uniform(0.05, 0.3)
+            team[slot] = pool.pop()
+            recorder.record(WebsocketEventResponse(event_type="Update", uri=uri, data=session_data(team, bench)),
+                            offset)
+        bench = pool[:10]
+        for second in range(60):
+            # Timer updates come in bursts with the occasional swap
+            for _ in range(random.randint(1, 3)):
+                offset += random.uniform(0.01, 0.05)
+                if random.random() < 0.15:
+                    slot, index = random.randrange(5), random.randrange(len(bench))
+                    team[slot], bench[index] = bench[index], team[slot]
+                recorder.record(WebsocketEventResponse(event_type="Update", uri=uri, data=session_data(team, bench)),
+                                offset)
+            offset = float(int(offset) + 1)
+        recorder.record(WebsocketEventResponse(event_type="Delete", uri=uri, data=session_data([], [])), offset)
+        offset += 5
+    recorder.close()
+
+
+class IdleWorker(QtCore.QThread):
+    def run(self):
+        pass
+
+
+class ReplayWorkerService:
+    def __init__(self, worker: LcuEventProcessorWorker):
+        self.worker = worker
+        self.idle = IdleWorker()
+
+    def get(self, key):
+        return self.worker if key.name == "LCU_EVENT_PROCESSOR" else self.idle
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recording", help="recording made with MONSOON_RECORD_SESSIONS")
+    parser.add_argument("--save", help="file to save the built recording to")
+    parser.add_argument("--games", type=int, default=5, help="champion selects of the built recording")
+    parser.add_argument("--speed", type=float, default=0, help="replay speed, 0 replays flat out")
+    parser.add_argument("--profile", help="file to write a cProfile of the GUI thread to")
+    args = parser.parse_args()
+
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    root = Path(tempfile.mkdtemp(prefix="bench-replay-"))
+    recording = args.recording
+    if recording is None:
+        recording = args.save or str(root / "sessions.jsonl.gz")
+        build_recording(recording, args.games)
+
+    servers = {name: StandInServer().start() for name in UPSTREAMS}
+    serve_built(servers, CHAMPIONS)
+    options = {"data_dragon_options": {"url": servers["datadragon"].url, "cache": DiskCache(root / "cache"),
+                                       "icon_store": IconStore(root / "icons")},
+               "lol_fandom_options": {"url": servers["fandom"].url, "lolalytics_url": servers["lolalytics"].url,
+                                      "cache": DiskCache(root / "cache")}}
+    api_service = ApiService(http_client=HttpClient(), use_snapshot=False, **options)
+    api_service.data_dragon.icon_prefetcher.join()
+
+    tracer = Tracer(window=100000)
+    pixmap_cache = PixmapCache()
+    replayer = LcuSessionReplayer(recording, args.speed)
+    worker = LcuEventProcessorWorker(tracer=tracer, replayer=replayer)
+    champion_select_service = ChampionSelectService(api_service=api_service, pixmap_cache=pixmap_cache,
+                                                    tracer=tracer)
+    # The viewmodel starts the worker, replaying begins right away
+    start = time.perf_counter()
+    worker_service = ReplayWorkerService(worker)
+    viewmodel = AppWindowViewModel(worker_service=worker_service, api_service=api_service,
+                                   champion_select_service=champion_select_service, tracer=tracer)
+    view = AppWindowView(app_window_viewmodel=viewmodel, pixmap_cache=pixmap_cache, tracer=tracer)
+    view.show()
+
+    last_update = [start]
+    viewmodel.property_changed += lambda sender, args: last_update.__setitem__(0, time.perf_counter())
+
+    def settle():
+        # Results of the last events are still being coalesced and resolved
+        if time.perf_counter() - last_update[0] > champion_select_service.coalescer.window + 0.5:
+            application.quit()
+
+    timer = QtCore.QTimer()
+    timer.timeout.connect(settle)
+    worker.finished.connect(lambda: timer.start(50))
+
+    profile = cProfile.Profile() if args.profile else None
+    if profile is not None:
+        profile.enable()
+    application.exec()
+    if profile is not None:
+        profile.disable()
+        profile.dump_stats(args.profile)
+    champion_select_service.shutdown()
+    for server in servers.values():
+        server.stop()
+    shutil.rmtree(root, ignore_errors=True)
+
+    coalescer = champion_select_service.coalescer.stats
+    print(f"events {replayer.played}, forwarded {coalescer.forwarded}, dropped {champion_select_service.dropped}, "
+          f"last result after {(last_update[0] - start) * 1000:.0f} ms")
+    print(tracer.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,37 @@
+import pytest
+
+
 def pytest_sessionstart(session):
     """Import modules in source folder before unit tests.
     """
     import os
     import sys
     sys.path.append(os.path.abspath("./src/"))
+
+
+@pytest.fixture
+def stand_in():
+    """Local HTTP server standing in for upstream websites.
+    """
+    from standin import StandInServer
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def qt_application():
+    """Qt application without a display, for tests relying on the event loop.
+    """
+    import os
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import QtWidgets
+    yield QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def stand_in_client():
+    """Local League client API, reachable through its lockfile string.
+    """
+    from standin import StandInLeagueClient
+    with StandInLeagueClient() as client:
+        yield client
@@ -0,0 +1,63 @@
+"""Reference evaluations of Module:ChampionData with a real Lua runtime (lupa),
+to check and benchmark LuaTableParser against.
+"""
+import lupa
+from lupa import LuaRuntime
+
+
+def _create_runtime() -> LuaRuntime:
+    def filter_attribute_access(obj, attr_name, is_setting):
+        raise AttributeError("access denied")
+
+    lua = LuaRuntime(
+        unpack_returned_tuples=True,
+        attribute_filter=filter_attribute_access,
+        register_eval=False)
+    for key in list(lua.globals()):
+        if key != "_G":
+            del lua.globals()[key]
+    return lua
+
+
+def evaluate_sanitized(source: str) -> dict:
+    """Evaluate the module the way LolFandom used to: blanket removal of
+    keywords and parentheses, lua.eval, then copying the used fields out of Lua
+    one proxy at a time.
+    """
+    lua = _create_runtime()
+    code = source.strip()
+    code = code.replace("return", "")
+    code = code.replace("function", "")
+    code = code.replace("(", "")
+    code = code.replace(")", "")
+    code = code.replace("-- <pre>", "")
+    code = code.replace("-- </pre>", "")
+    code = code.replace("-- [[Category:Lua]]", "")
+    table = lua.eval(code)
+    if lupa.lua_type(table) != "table":
+        raise Exception("Failed to evaluate Module:ChampionData")
+
+    championdata = {}
+    for champion_name, champion in table.items():
+        aram_stats = champion["stats"]["aram"]
+        championdata[champion_name] = {
+            "id": champion["id"],
+            "stats": {"aram": dict(aram_stats.items()) if aram_stats else None}
+        }
+    return championdata
+
+
+def evaluate(source: str):
+    """Run the module unmodified and convert the whole returned table to
+    Python, with the same list/dict rules as LuaTableParser.
+    """
+    return _to_python(_create_runtime().execute(source))
+
+
+def _to_python(value):
+    if lupa.lua_type(value) != "table":
+        return value
+    fields = {key: _to_python(item) for key, item in value.items()}
+    if fields and all(isinstance(x, int) for x in fields) and sorted(fields) == list(range(1, len(fields) + 1)):
+        return [fields[x] for x in range(1, len(fields) + 1)]
+    return fields
@@ -3,9 +3,10 @@ import sys
 
 sys.path.append(os.path.abspath("./src/"))
 
-from src.apis import LolFandom, DataDragon
+from src.apis import LolFandom, DataDragon, HttpClient
 from src.models import DynamicBalanceModel
-from src.services import WorkerService, ApiService
+from src.services import WorkerService, ApiService, ChampionSelectService, SettingsContextService
+from src.utils import PixmapCache, Tracer
 from src.views import AppWindowView
 from src.viewmodels import AppWindowViewModel
 from PySide6 import QtWidgets
@@ -13,10 +14,14 @@ import qdarktheme
 
 app = QtWidgets.QApplication()
 app.setStyleSheet(qdarktheme.load_stylesheet())
-worker_service = WorkerService()
-api_service = ApiService()
-viewmodel = AppWindowViewModel(worker_service=worker_service, api_service=api_service)
-view = AppWindowView(app_window_viewmodel=viewmodel)
+tracer = Tracer()
+worker_service = WorkerService(settings_context_service=SettingsContextService(), tracer=tracer)
+api_service = ApiService(http_client=HttpClient())
+pixmap_cache = PixmapCache()
+champion_select_service = ChampionSelectService(api_service=api_service, pixmap_cache=pixmap_cache, tracer=tracer)
+viewmodel = AppWindowViewModel(worker_service=worker_service, api_service=api_service,
+                               champion_select_service=champion_select_service, tracer=tracer)
+view = AppWindowView(app_window_viewmodel=viewmodel, pixmap_cache=pixmap_cache, tracer=tracer)
 lf_api = LolFandom()
 dd_api = DataDragon()
 
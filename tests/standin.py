@@ -0,0 +1,261 @@
+import asyncio
+import base64
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from aiohttp import web
+
+# Response headers kept when recording, the ones the scrapers look at
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class StandInServer:
+    """Represents a local HTTP server that stands in for an upstream website.
+    Serves canned responses by path (including the query string), answers
+    conditional requests for routes with an ETag and records every request.
+
+    With an upstream url, paths without a route are fetched from the upstream
+    once and served as fixed routes from then on. Fixed routes can be saved to a
+    directory and loaded back, so recorded responses can be replayed offline.
+    """
+
+    def __init__(self, upstream: Optional[str] = None):
+        self.upstream = upstream
+        self.routes: Dict[str, Callable] = {}
+        # Path -> (status, headers, body) of every fixed route
+        self.fixtures: Dict[str, Tuple[int, dict, bytes]] = {}
+        self.requests: List[Tuple[str, str, dict]] = []
+        self.bytes_sent = 0
+        self._upstream_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, path: str, body: bytes = b"", status: int = 200,
+              headers: Optional[dict] = None, etag: Optional[str] = None) -> None:
+        """Serve a fixed response for a path.
+    """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers = dict(headers or {})
+        if etag is not None:
+            headers["ETag"] = etag
+
+        def handler(request_headers):
+            if etag is not None and request_headers.get("If-None-Match") == etag:
+                return 304, headers, b""
+            return status, headers, body
+
+        self.routes[path] = handler
+        self.fixtures[path] = (status, headers, body)
+
+    def route_handler(self, path: str, handler: Callable) -> None:
+        """Serve a path with a callable taking request headers and returning a
+    (status, headers, body) tuple.
+    """
+        self.routes[path] = handler
+        self.fixtures.pop(path, None)
+
+    def _record(self, path: str) -> Optional[Callable]:
+        with self._upstream_lock:
+            if path not in self.routes:
+                response = requests.get(f"{self.upstream}{path}", timeout=30)
+                headers = {x: response.headers[x] for x in RECORDED_HEADERS if x in response.headers}
+                etag = headers.pop("ETag", None)
+                self.route(path, response.content, response.status_code, headers, etag)
+            return self.routes[path]
+
+    def save(self, directory: str) -> None:
+        """Write the fixed routes to a directory, bodies next to a manifest.
+    """
+        os.makedirs(directory, exist_ok=True)
+        manifest = []
+        for i, (path, (status, headers, body)) in enumerate(sorted(self.fixtures.items())):
+            file = f"{i:04d}.bin"
+            with open(os.path.join(directory, file), "wb") as f:
+                f.write(body)
+            manifest.append({"path": path, "status": status, "headers": headers, "file": file})
+        with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    def load(self, directory: str) -> "StandInServer":
+        """Serve the routes saved to a directory.
+    """
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        for route in manifest:
+            with open(os.path.join(directory, route["file"]), "rb") as f:
+                body = f.read()
+            headers = dict(route["headers"])
+            etag = headers.pop("ETag", None)
+            self.route(route["path"], body, route["status"], headers, etag)
+        return self
+
+    def count(self, path: str, status: int = None) -> int:
+        return len([x for x in self.requests if x[1] == path and (status is None or x[2]["status"] == status)])
+
+    def start(self) -> "StandInServer":
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                handler = stand_in.routes.get(self.path)
+                if handler is None and stand_in.upstream is not None:
+                    handler = stand_in._record(self.path)
+                if handler is None:
+                    status, headers, body = 404, {}, b"not found"
+                else:
+                    status, headers, body = handler(self.headers)
+                stand_in.requests.append(("GET", self.path, {"status": status, "headers": dict(self.headers)}))
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+                    stand_in.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class StandInLeagueClient:
+    """Represents a local League client API: answers GET requests with canned
+    JSON and pushes events to the connected websockets, over plain HTTP. The
+    lockfile string points lcu-driver at it.
+    """
+
+    def __init__(self, token: str = "stand-in"):
+        self.token = token
+        self.routes: Dict[str, object] = {}
+        # Events sent to every websocket once it subscribed
+        self.greeting: List[Tuple[str, str, object]] = []
+        # Path and client port of every GET request
+        self.requests: List[Tuple[str, int]] = []
+        self.connections = 0
+        self._websockets = set()
+        self._loop = None
+        self._runner = None
+        self._port = None
+        self._thread = None
+
+    @property
+    def lockfile(self) -> str:
+        return f"1:1:{self._port}:{self.token}:http"
+
+    @property
+    def listening(self) -> int:
+        return len(self._websockets)
+
+    def start(self) -> "StandInLeagueClient":
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, args=(started,), daemon=True)
+        self._thread.start()
+        started.wait(5)
+        return self
+
+    def _run(self, started: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_get("/", self._websocket)
+        app.router.add_get("/{path:.*}", self._get)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self._port = site._server.sockets[0].getsockname()[1]
+        started.set()
+        self._loop.run_forever()
+
+    def _authorized(self, request) -> bool:
+        expected = base64.b64encode(f"riot:{self.token}".encode()).decode()
+        return request.headers.get("Authorization") == f"Basic {expected}"
+
+    async def _get(self, request):
+        self.requests.append((request.path, request.transport.get_extra_info("peername")[1]))
+        if request.path == "/riotclient/region-locale":
+            return web.json_response({"locale": "en_US"})
+        if not self._authorized(request):
+            return web.json_response({"message": "unauthorized"}, status=401)
+        if request.path not in self.routes:
+            return web.json_response({"message": "not found"}, status=404)
+        return web.json_response(self.routes[request.path])
+
+    async def _websocket(self, request):
+        if not self._authorized(request):
+            return web.Response(status=401)
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        await websocket.receive()
+        await websocket.send_json([0, "subscribed"])
+        self.connections += 1
+        self._websockets.add(websocket)
+        try:
+            for uri, event_type, data in self.greeting:
+                await self._send(websocket, uri, event_type, data)
+            async for _ in websocket:
+                pass
+        finally:
+            self._websockets.discard(websocket)
+        return websocket
+
+    @staticmethod
+    async def _send(websocket, uri: str, event_type: str, data) -> None:
+        await websocket.send_json([8, "OnJsonApiEvent", {"uri": uri, "eventType": event_type, "data": data}])
+
+    def send(self, uri: str, event_type: str, data) -> None:
+        """Push an event to every connected websocket.
+    """
+        async def send():
+            for websocket in list(self._websockets):
+                await self._send(websocket, uri, event_type, data)
+
+        asyncio.run_coroutine_threadsafe(send(), self._loop).result(5)
+
+    def disconnect(self) -> None:
+        """Close every websocket, as a client that restarts would.
+    """
+        async def disconnect():
+            for websocket in list(self._websockets):
+                await websocket.close()
+
+        asyncio.run_coroutine_threadsafe(disconnect(), self._loop).result(5)
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
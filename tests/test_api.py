@@ -1,5 +1,62 @@
+import json
+import threading
+import time
+
 import pytest
-from src.apis import DataDragon, LolFandom
+from PySide6 import QtCore, QtGui
+from constants import FandomFetchModes, IconModes
+from models import DynamicBalanceModel
+from src.apis import ChampionRegistry, ChampionSnapshot, DataDragon, HttpClient, IconPrefetcher, LolFandom, SNAPSHOT_RESOURCE
+from src.apis.htmlextractor import HtmlExtractor
+from src.apis.lolalytics import LoLalytics
+from src.apis.luatableparser import LuaTableParser, LuaParseError
+from src.utils import DiskCache, IconStore
+from upstream import championdata_module, fandom_module_page, lolalytics_build_page, lolalytics_tierlist_page
+
+
+def create_sprite_atlas() -> bytes:
+    image = QtGui.QImage(96, 48, QtGui.QImage.Format_ARGB32)
+    image.fill(QtGui.QColor(255, 0, 0))
+    for x in range(48, 96):
+        for y in range(48):
+            image.setPixelColor(x, y, QtGui.QColor(0, 0, 255))
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def serve_datadragon(server, version="12.19.1"):
+    champions = {"data": {
+        "Sona": {"id": "Sona", "key": "37", "name": "Sona",
+                 "image": {"sprite": "champion0.png", "x": 0, "y": 0, "w": 48, "h": 48}},
+        "Ahri": {"id": "Ahri", "key": "103", "name": "Ahri",
+                 "image": {"sprite": "champion0.png", "x": 48, "y": 0, "w": 48, "h": 48}}
+    }}
+    server.route("/api/versions.json", json.dumps([version, "12.18.1"]), etag='"v1"')
+    server.route(f"/cdn/{version}/data/en_US/champion.json", json.dumps(champions), etag='"c1"')
+    server.route(f"/cdn/{version}/img/champion/Sona.png", b"\x89PNG sona")
+    server.route(f"/cdn/{version}/img/champion/Ahri.png", b"\x89PNG ahri")
+    server.route(f"/cdn/{version}/img/sprite/champion0.png", create_sprite_atlas())
+
+
+def serve_fandom(server, revision, source):
+    server.route(f"/api.php?action=query&prop=revisions&titles=Module:ChampionData/data&rvprop=ids"
+                 f"&format=json&formatversion=2", json.dumps({"query": {"pages": [
+                     {"pageid": 1, "title": "Module:ChampionData/data", "revisions": [{"revid": revision}]}]}}))
+    server.route(f"/index.php?title=Module:ChampionData/data&action=raw&oldid={revision}", source)
+    server.route("/wiki/Module:ChampionData/data", fandom_module_page(source))
+    server.route("/lol/tierlist/aram/?patch=14", lolalytics_tierlist_page({"sona": 53.5, "ahri": 50.25}))
+
+
+def create_datadragon(server, path, prefetch_icons=False, icon_mode=IconModes.FULL):
+    return DataDragon(
+        url=server.url,
+        cache=DiskCache(path / "cache"),
+        icon_store=IconStore(path / "icons"),
+        prefetch_icons=prefetch_icons,
+        icon_mode=icon_mode)
 
 
 class TestApis:
@@ -10,7 +67,459 @@ class TestApis:
             data = api.fetch_by_champion_id(champion_id)
             assert data['id'] == 'Sona'
 
+        def test_warm_start_makes_no_full_body_downloads(self, stand_in, tmp_path):
+            serve_datadragon(stand_in)
+            cold = create_datadragon(stand_in, tmp_path)
+            assert cold.fetch_icon_by_champion_id(37) == b"\x89PNG sona"
+            assert cold.cache_stats.misses == 2
+            assert cold.icon_store.stats.misses == 1
+
+            warm = create_datadragon(stand_in, tmp_path)
+            assert warm.fetch_icon_by_champion_id(37) == b"\x89PNG sona"
+            assert warm.fetch_by_champion_id(37)["id"] == "Sona"
+            assert warm.cache_stats.misses == 0
+            assert warm.icon_store.stats.misses == 0
+            assert warm.cache_stats.revalidations == 1
+            assert stand_in.count("/api/versions.json", status=304) == 1
+            assert len(stand_in.requests) == 4
+
+        def test_refresh_swaps_index(self, stand_in, tmp_path):
+            serve_datadragon(stand_in, "12.19.1")
+            api = create_datadragon(stand_in, tmp_path)
+            index = api.index
+            assert api.fetch_by_champion_name("Ahri")["key"] == "103"
+            serve_datadragon(stand_in, "12.20.1")
+            stand_in.route("/api/versions.json", json.dumps(["12.20.1"]), etag='"v2"')
+            api.refresh()
+            assert api.index is not index
+            assert index.version == "12.19.1"
+            assert api.latest_version == "12.20.1"
+            assert api.fetch_by_champion_id(103)["id"] == "Ahri"
+
+        def test_refreshes_only_new_patches(self, stand_in, tmp_path):
+            serve_datadragon(stand_in, "12.19.1")
+            api = create_datadragon(stand_in, tmp_path)
+            index = api.index
+            assert api.fetch_icon_by_champion_id(37) == b"\x89PNG sona"
+            assert not api.refresh_if_outdated()
+            assert api.index is index
+            assert stand_in.count("/api/versions.json", status=304) == 1
+            assert stand_in.count("/cdn/12.19.1/data/en_US/champion.json") == 1
+
+            serve_datadragon(stand_in, "12.20.1")
+            stand_in.route("/api/versions.json", json.dumps(["12.20.1"]), etag='"v2"')
+            stand_in.route("/cdn/12.20.1/img/champion/Sona.png", b"\x89PNG sona 12.20")
+            assert api.refresh_if_outdated()
+            assert api.latest_version == "12.20.1"
+            assert api.fetch_icon_by_champion_id(37) == b"\x89PNG sona 12.20"
+
+        def test_new_patch_replaces_cached_patch(self, stand_in, tmp_path):
+            serve_datadragon(stand_in, "12.19.1")
+            create_datadragon(stand_in, tmp_path)
+            serve_datadragon(stand_in, "12.20.1")
+            stand_in.route("/api/versions.json", json.dumps(["12.20.1"]), etag='"v2"')
+            api = create_datadragon(stand_in, tmp_path)
+            assert api.latest_version == "12.20.1"
+            assert api.cache_stats.misses == 2
+            assert not (tmp_path / "cache" / "datadragon" / "12.19.1").exists()
+
+        def test_icons_are_prefetched_into_store(self, stand_in, tmp_path):
+            serve_datadragon(stand_in)
+            api = create_datadragon(stand_in, tmp_path, prefetch_icons=True)
+            assert api.icon_prefetcher.join(timeout=5)
+            assert api.icon_prefetcher.done == 2
+            requests_made = len(stand_in.requests)
+            assert api.fetch_icon_by_champion_id(103) == b"\x89PNG ahri"
+            assert len(stand_in.requests) == requests_made
+            assert IconStore(tmp_path / "icons").get("12.19.1", "Sona") == b"\x89PNG sona"
+
+        def test_icons_of_snapshot_index_are_prefetched(self, stand_in, tmp_path):
+            serve_datadragon(stand_in)
+            index = create_datadragon(stand_in, tmp_path / "live").index
+            api = DataDragon(url=stand_in.url, cache=DiskCache(tmp_path / "cache"),
+                             icon_store=IconStore(tmp_path / "icons"), index=index)
+            assert api.icon_prefetcher.join(timeout=5)
+            assert api.icon_prefetcher.done == 2
+            assert not api.refresh_if_outdated()
+            assert IconStore(tmp_path / "icons").get("12.19.1", "Ahri") == b"\x89PNG ahri"
+
+        def test_icon_prefetched_while_patch_changes_is_looked_up_again(self, stand_in, tmp_path):
+            serve_datadragon(stand_in)
+            api = create_datadragon(stand_in, tmp_path)
+            started, release = threading.Event(), threading.Event()
+
+            def fetch(name):
+                started.set()
+                release.wait(5)
+                return b"\x89PNG ahri of 12.19.1"
+
+            api.icon_prefetcher = IconPrefetcher(fetch, ["Ahri"], version="12.19.1").start()
+            icons = []
+            lookup = threading.Thread(target=lambda: icons.append(api.fetch_icon_by_champion_id(103)))
+            lookup.start()
+            assert started.wait(5)
+            serve_datadragon(stand_in, "12.20.1")
+            stand_in.route("/cdn/12.20.1/img/champion/Ahri.png", b"\x89PNG ahri of 12.20.1")
+            stand_in.route("/api/versions.json", json.dumps(["12.20.1"]), etag='"v2"')
+            assert api.refresh_if_outdated()
+            release.set()
+            lookup.join(5)
+            assert icons == [b"\x89PNG ahri of 12.20.1"]
+            assert ("12.19.1", "Ahri") not in api.champion_icons
+
+        def test_empty_snapshot_index_keeps_stored_icons(self, tmp_path):
+            store = IconStore(tmp_path / "icons")
+            store.put("12.19.1", "Ahri", b"\x89PNG ahri")
+            store.flush()
+            api = DataDragon(url="http://unreachable.invalid", cache=DiskCache(tmp_path / "cache"),
+                             icon_store=IconStore(tmp_path / "icons"), index=ChampionSnapshot.empty().create_index())
+            assert api.icon_prefetcher is None
+            api._on_icon_prefetch_completed("", cancelled=False)
+            assert IconStore(tmp_path / "icons").get("12.19.1", "Ahri") == b"\x89PNG ahri"
+
+        def test_sprite_mode_slices_icons_from_atlas(self, stand_in, tmp_path):
+            serve_datadragon(stand_in)
+            api = create_datadragon(stand_in, tmp_path, prefetch_icons=True, icon_mode=IconModes.SPRITE)
+            assert api.icon_prefetcher.join(timeout=5)
+            icon = QtGui.QImage.fromData(api.fetch_icon_by_champion_id(103))
+            assert (icon.width(), icon.height()) == (48, 48)
+            assert icon.pixelColor(10, 10) == QtGui.QColor(0, 0, 255)
+            assert api.fetch_icon_by_champion_id(37, full_resolution=True) == b"\x89PNG sona"
+            assert stand_in.count("/cdn/12.19.1/img/sprite/champion0.png") == 1
+            assert stand_in.count("/cdn/12.19.1/img/champion/Ahri.png") == 0
+
+            # Atlases of the previous patch and their locks are dropped
+            serve_datadragon(stand_in, "12.20.1")
+            stand_in.route("/api/versions.json", json.dumps(["12.20.1"]), etag='"v2"')
+            assert api.refresh_if_outdated()
+            assert api.icon_prefetcher.join(timeout=5)
+            assert {x[0] for x in api.sprite_atlases} == {x[0] for x in api._sprite_atlas_locks} == {"12.20.1"}
+
+    class TestIconStore:
+        def test_identical_icons_are_stored_once(self, tmp_path):
+            store = IconStore(tmp_path)
+            first = store.put("12.19.1", "Sona", b"icon")
+            second = store.put("12.20.1", "Sona", b"icon")
+            store.flush()
+            assert first == second
+            assert len(list((tmp_path / "objects").glob("*/*"))) == 1
+            store.prune(keep=["12.20.1"])
+            assert IconStore(tmp_path).get("12.20.1", "Sona") == b"icon"
+            assert IconStore(tmp_path).get("12.19.1", "Sona") is None
+
+    class TestIconPrefetcher:
+        def test_cancel_reports_completion(self):
+            release = threading.Event()
+            progress = []
+            completed = []
+
+            def fetch(name):
+                release.wait(5)
+                return name.encode()
+
+            prefetcher = IconPrefetcher(fetch, ["a", "b", "c"], max_workers=1)
+            prefetcher.progress_changed += lambda sender, args: progress.append(args)
+            prefetcher.completed += lambda sender, cancelled: completed.append(cancelled)
+            prefetcher.start()
+            prefetcher.cancel()
+            release.set()
+            assert prefetcher.join(timeout=5)
+            assert completed == [True]
+            assert progress[-1] == (3, 3)
+            assert prefetcher.wait("c") is None
+
+        def test_cancel_drops_queued_icons(self):
+            release = threading.Event()
+            fetched = []
+
+            def fetch(name):
+                release.wait(5)
+                fetched.append(name)
+                return name.encode()
+
+            prefetcher = IconPrefetcher(fetch, [str(x) for x in range(20)], max_workers=2)
+            prefetcher.start()
+            prefetcher.cancel()
+            release.set()
+            assert prefetcher.join(timeout=5)
+            # Only the icons already downloading finish, no pool thread is left behind
+            assert len(fetched) <= 2
+            deadline = time.monotonic() + 5
+            while any(x.name.startswith("icon-prefetch") for x in threading.enumerate()) \
+                    and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert not any(x.name.startswith("icon-prefetch") for x in threading.enumerate())
+
+    class TestChampionRegistry:
+        def test_resolves_aliases_of_every_source(self):
+            championdata = {
+                "Nunu & Willump": {"id": 20, "apiname": "Nunu", "stats": {"aram": {"dmg_dealt": 1.05}}},
+                "Wukong": {"id": 62, "apiname": "MonkeyKing", "stats": {"aram": None}},
+                "Miss Fortune": {"id": 21, "apiname": "MissFortune", "stats": {"aram": {"dmg_taken": 0.95}}},
+                "Dr. Mundo": {"id": 36, "apiname": "DrMundo", "stats": {"aram": None}},
+                "Kai'Sa": {"id": 145, "apiname": "Kaisa", "stats": {"aram": None}},
+            }
+            winrates = {"nunu": (1, 52.5), "wukong": (2, 51.0), "missfortune": (3, 50.5), "drmundo": (4, 49.0),
+                        "newchampion": (5, 48.0)}
+            registry = ChampionRegistry.from_sources(championdata, winrates)
+
+            assert registry.balance(20).rank_winrate == "Rank: 1\nWinrate: 52.5"
+            assert registry.balance(20).champion_name == "Nunu & Willump"
+            assert registry.balance(21).balance_levers[0].name == "dmg_taken"
+            assert registry.balance(36).rank_winrate == "Rank: 4\nWinrate: 49.0"
+            assert registry.balance(145).rank_winrate == ""
+            for name in ("Nunu & Willump", "nunu", "MonkeyKing", "Wukong", "Dr. Mundo", "KaiSa", "missfortune"):
+                assert registry.resolve(name) is not None
+            assert registry.resolve("MonkeyKing") == registry.resolve("wukong") == 62
+            assert registry.resolve("Unknown") is None
+            # Names matching no champion are reported once the registry is built
+            assert registry.unmatched == {"lolalytics": ["newchampion"], "lolfandom": ["Kai'Sa"]}
+
+        def test_indexes_snapshot_balances_by_id(self):
+            registry = ChampionRegistry.from_balances({"Sona": DynamicBalanceModel(37, "Rank: 1", "Sona", [])})
+            assert registry.balance(37).champion_name == "Sona"
+            assert registry.resolve("sona") == 37
+            assert registry.balances_by_name == {"Sona": registry.balance(37)}
+
+    class TestChampionSnapshot:
+        def test_round_trip_matches_sources(self, stand_in, tmp_path, monkeypatch):
+            serve_datadragon(stand_in)
+            serve_fandom(stand_in, 100, championdata_module(20))
+            data_dragon = create_datadragon(stand_in, tmp_path)
+            lol_fandom = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url)
+            ChampionSnapshot.capture(data_dragon, lol_fandom).save(str(tmp_path / SNAPSHOT_RESOURCE))
+
+            monkeypatch.setattr("sys._MEIPASS", str(tmp_path), raising=False)
+            snapshot = ChampionSnapshot.load_bundled()
+            assert snapshot.version == "12.19.1"
+            assert snapshot.revision == 100
+            index = snapshot.create_index()
+            assert index.by_key[37]["name"] == "Sona"
+            assert index.by_key[103]["image"] == data_dragon.fetch_by_champion_id(103)["image"]
+            restored = LolFandom(dynamic_balances=snapshot.dynamic_balances, revision=snapshot.revision)
+            for name in ("Sona", "Ahri", "Akali"):
+                assert restored.fetch_dynamic_balance_by_champion_name(name) == \
+                       lol_fandom.fetch_dynamic_balance_by_champion_name(name)
+            assert restored.fetch_dynamic_balance_by_champion_name("Sona").rank_winrate == "Rank: 1\nWinrate: 53.5"
+
+        def test_ignores_unusable_snapshots(self, tmp_path):
+            assert ChampionSnapshot.load(str(tmp_path / "missing.json.gz")) is None
+            (tmp_path / "corrupt.json.gz").write_bytes(b"not gzip")
+            assert ChampionSnapshot.load(str(tmp_path / "corrupt.json.gz")) is None
+
+    class TestHttpClient:
+        def test_retries_server_errors(self, stand_in):
+            responses = [(503, {}, b"busy"), (200, {}, b"ok")]
+            stand_in.route_handler("/flaky", lambda headers: responses.pop(0))
+            client = HttpClient(backoff_factor=0)
+            response = client.get(f"{stand_in.url}/flaky")
+            assert response.status_code == 200
+            assert stand_in.count("/flaky") == 2
+            assert client.stats.requests == 1
+            assert client.stats.bytes_received == 2
+
+        def test_limits_concurrency_per_host(self, stand_in):
+            lock = threading.Lock()
+            active = [0, 0]
+
+            def slow(headers):
+                with lock:
+                    active[0] += 1
+                    active[1] = max(active[1], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+                return 200, {}, b"ok"
+
+            stand_in.route_handler("/slow", slow)
+            client = HttpClient(max_connections_per_host=2)
+            threads = [threading.Thread(target=client.get, args=(f"{stand_in.url}/slow",)) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert active[1] == 2
+            assert client.host_stats[stand_in.url[len("http://"):]].requests == 6
+
+    class TestLoLalytics:
+        def test_missing_winrates_are_fetched_once_per_patch(self, stand_in, tmp_path):
+            stand_in.route("/lol/tierlist/aram/?patch=14", lolalytics_tierlist_page(
+                {"ahri": 52.5, "sona": None, "missfortune": None}))
+            stand_in.route("/lol/sona/aram/build/?patch=14", lolalytics_build_page("Sona", 53.1))
+            stand_in.route("/lol/missfortune/aram/build/?patch=14", lolalytics_build_page("Miss Fortune", 49.0))
+
+            api = LoLalytics(cache=DiskCache(tmp_path), base_url=stand_in.url)
+            assert api.fetch_winrate_by_champion("Sona") == "Rank: 1\nWinrate: 53.1"
+            assert api.fetch_winrate_by_champion("Miss Fortune") == "Rank: 3\nWinrate: 49.0"
+            assert api.winrates["missfortune"] == (3, 49.0)
+            assert stand_in.count("/lol/sona/aram/build/?patch=14") == 1
+
+            cached = LoLalytics(cache=DiskCache(tmp_path), base_url=stand_in.url)
+            assert cached.fetch_winrate_by_champion("Sona") == "Rank: 1\nWinrate: 53.1"
+            assert cached.cache.stats.hits == 2
+            assert stand_in.count("/lol/sona/aram/build/?patch=14") == 1
+
+            LoLalytics(cache=DiskCache(tmp_path), base_url=stand_in.url, winrate_ttl=0)
+            assert stand_in.count("/lol/sona/aram/build/?patch=14") == 2
+
+    class TestHtmlExtractor:
+        def test_matches_beautifulsoup_on_module_page(self):
+            html = fandom_module_page(championdata_module(20))
+            bs4 = pytest.importorskip("bs4")
+            expected = bs4.BeautifulSoup(html, "html.parser").select("pre.mw-code")[0].text
+            assert HtmlExtractor.find_all_text(html, "pre", classes=["mw-code"], limit=2) == [expected]
+
+        def test_matches_beautifulsoup_on_tierlist_page(self):
+            html = lolalytics_tierlist_page({"ahri": 52.5, "sona": None})
+            bs4 = pytest.importorskip("bs4")
+            soup = bs4.BeautifulSoup(html, "html.parser")
+            assert HtmlExtractor.find_text(html, "script", {"type": "qwik/json"}) == \
+                   soup.find("script", {"type": "qwik/json"}).string
+            assert HtmlExtractor.find_text(html, "div", classes=("ml-auto", "text-right")) == \
+                   soup.find("div", class_="ml-auto text-right").get_text()
+
+        def test_collects_text_of_nested_elements(self):
+            html = '<div class="a">x</div><div class="b c">1<div>2</div>&amp;3</div><div class="b">4</div>'
+            assert HtmlExtractor.find_text(html, "div", classes=["b"]) == "12&3"
+            assert HtmlExtractor.find_all_text(html, "div", classes=["b"]) == ["12&3", "4"]
+            assert HtmlExtractor.find_text(html, "div", classes=["d"]) is None
+
+        def test_skips_hints_inside_scripts_and_styles(self):
+            html = ('<script>var s = "<div class=\'score\'>decoy</div>";</script><div class="score">1</div>')
+            assert HtmlExtractor.find_all_text(html, "div", classes=["score"]) == ["1"]
+            html = ('<style>.a{}</style><STYLE>/* <div class="score">decoy</div> */</STYLE>'
+                    '<script>"</style>"</script><div class="score">2</div>')
+            assert HtmlExtractor.find_all_text(html, "div", classes=["score"]) == ["2"]
+
+    class TestLuaTableParser:
+        def test_matches_lua_on_module(self):
+            luareference = pytest.importorskip("luareference")
+            source = championdata_module(30)
+            table = LuaTableParser.parse(source)
+            assert table == luareference.evaluate(source)
+            assert table["Ahri"]["title"] == "the champion (number 1) who will return"
+            assert "aram" not in table["Akali"]["stats"]
+
+        def test_matches_former_lupa_path_on_used_fields(self):
+            luareference = pytest.importorskip("luareference")
+            source = championdata_module(30)
+            table = LuaTableParser.parse(source)
+            used = {name: {"id": x["id"], "stats": {"aram": x["stats"].get("aram")}} for name, x in table.items()}
+            assert used == luareference.evaluate_sanitized(source)
+
+        def test_parses_literals(self):
+            source = r"""-- <pre>
+            return {
+                a = 1, ["b c"] = "x\"y\n\65", [3] = 'q', --[[ comment ]] [[long
+            string]], d = -2 ^ 2, e = "a" .. 1, f = 0x1F, g = 1.5e1, h = nil, i = {true, false; "z"},
+            }
+            -- </pre>"""
+            assert LuaTableParser.parse(source) == {
+                "a": 1, "b c": 'x"y\nA', 3: "q", 1: "long\n            string", "d": -4.0, "e": "a1",
+                "f": 31, "g": 15.0, "i": [True, False, "z"]
+            }
+            assert LuaTableParser.parse("return {[1] = 'a', [2.0] = 'b', 'c'}") == ["c", "b"]
+            assert LuaTableParser.parse("{}") == {}
+            assert LuaTableParser.parse("return {--[==[ ]] ]==] [ [[k]] ] = 1 -- x\n}") == {"k": 1}
+
+        @pytest.mark.parametrize("source", [
+            "return {a = os.exit()}",
+            "return {a = function() end}",
+            "return {a = b}",
+            "return {a = 1 2}",
+            "return {a = 'x' + 1}",
+            "return {a = 'x}",
+            "return {} {}",
+            "return {a = 1",
+            "return {[",
+            "return {a = -}",
+            "return {a = {} .. 'x'}",
+        ])
+        def test_rejects_code(self, source):
+            with pytest.raises(LuaParseError):
+                LuaTableParser.parse(source)
+
     class TestLolFandom:
+        def test_skips_download_of_processed_revision(self, stand_in, tmp_path):
+            raw_path = "/index.php?title=Module:ChampionData/data&action=raw&oldid={}"
+            serve_fandom(stand_in, 100, championdata_module(20))
+            api = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url)
+            sona = api.fetch_dynamic_balance_by_champion_name("Sona")
+            assert api.revision == 100
+            assert stand_in.count(raw_path.format(100)) == 1
+
+            cached = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url)
+            assert cached.fetch_dynamic_balance_by_champion_name("Sona") == sona
+            assert cached.cache.stats.hits == 1
+            assert "lolfandom.parse" not in cached.stopwatch.timings
+            assert cached.fetch_dynamic_balance_by_champion_id(sona.champion_id) == sona
+            # Champions of the module without a winrate on the tierlist are reported
+            assert "Sona" not in cached.registry.unmatched["lolfandom"]
+            assert "Akali" in cached.registry.unmatched["lolfandom"]
+            assert stand_in.count(raw_path.format(100)) == 1
+
+            serve_fandom(stand_in, 101, championdata_module(21))
+            updated = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url)
+            assert updated.revision == 101
+            assert updated.fetch_dynamic_balance_by_champion_name("Wukong") is not None
+            assert stand_in.count(raw_path.format(101)) == 1
+            assert stand_in.count("/wiki/Module:ChampionData/data") == 0
+
+        def test_refreshes_new_revisions_and_winrates(self, stand_in, tmp_path):
+            raw_path = "/index.php?title=Module:ChampionData/data&action=raw&oldid={}"
+            serve_fandom(stand_in, 100, championdata_module(20))
+            api = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url)
+            balances = api.dynamic_balances
+            assert not api.refresh_championdata()
+            assert api.dynamic_balances is balances
+            assert stand_in.count(raw_path.format(100)) == 1
+
+            serve_fandom(stand_in, 101, championdata_module(21))
+            assert api.refresh_championdata()
+            assert api.revision == 101
+            assert api.fetch_dynamic_balance_by_champion_name("Wukong") is not None
+            # Balances handed out before the swap are left as they were
+            assert "Wukong" not in balances
+
+            assert not api.refresh_winrates()
+            stand_in.route("/lol/tierlist/aram/?patch=14", lolalytics_tierlist_page({"sona": 49.5, "ahri": 50.25}))
+            assert api.refresh_winrates()
+            assert api.fetch_dynamic_balance_by_champion_name("Sona").rank_winrate == "Rank: 2\nWinrate: 49.5"
+            assert stand_in.count(raw_path.format(101)) == 1
+
+        def test_refreshes_snapshot_data(self, stand_in, tmp_path):
+            serve_fandom(stand_in, 100, championdata_module(20))
+            api = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url,
+                            dynamic_balances={}, revision=99)
+            assert api.refresh_winrates()
+            assert api.revision == 100
+            assert api.fetch_dynamic_balance_by_champion_name("Sona") is not None
+
+        def test_refreshes_snapshot_championdata_without_winrates(self, stand_in, tmp_path):
+            serve_fandom(stand_in, 100, championdata_module(20))
+            fetched = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url)
+            api = LolFandom(cache=DiskCache(tmp_path), url=stand_in.url, lolalytics_url=stand_in.url,
+                            dynamic_balances=fetched.dynamic_balances, revision=99)
+            tierlist = stand_in.count("/lol/tierlist/aram/?patch=14")
+            assert api.refresh_championdata()
+            assert api.revision == 100
+            assert api.fetch_dynamic_balance_by_champion_name("Sona").rank_winrate == "Rank: 1\nWinrate: 53.5"
+            assert stand_in.count("/lol/tierlist/aram/?patch=14") == tierlist
+
+            assert not api.refresh_winrates()
+            assert stand_in.count("/lol/tierlist/aram/?patch=14") == tierlist + 1
+
+        def test_page_mode_matches_revision_mode(self, stand_in, tmp_path):
+            serve_fandom(stand_in, 100, championdata_module(20))
+            page = LolFandom(cache=DiskCache(tmp_path / "page"), url=stand_in.url, lolalytics_url=stand_in.url,
+                             fetch_mode=FandomFetchModes.PAGE)
+            revision = LolFandom(cache=DiskCache(tmp_path / "revision"), url=stand_in.url,
+                                 lolalytics_url=stand_in.url)
+            assert page.revision is None
+            for name in ("Sona", "Ahri", "Akali"):
+                assert page.fetch_dynamic_balance_by_champion_name(name) == \
+                       revision.fetch_dynamic_balance_by_champion_name(name)
+
         def test_api_has_processed_dynamic_data(self):
             champion_name = 'Sona'
             api = LolFandom()
@@ -0,0 +1,611 @@
+import asyncio
+import dataclasses
+import gzip
+import threading
+import time
+from unittest import mock
+
+import pytest
+from lcu_driver import Connector
+from lcu_driver.events.responses import WebsocketEventResponse
+from PySide6 import QtCore
+from apis import DataDragon, LolFandom
+from src.apis import ChampionSnapshot, SNAPSHOT_RESOURCE
+from constants import FreshnessStates, SettingsSchema, Workers
+from models import BalanceLever, ChampionSelectSessionModel, ChampionSlotChangeModel, DynamicBalanceModel, \
+    LockfileModel, SourceFreshnessModel
+from src.services import ApiService, ChampionSelectCoalescer, ChampionSelectService, LcuConnection, \
+    LcuEventProcessorWorker, LcuSessionRecorder, LcuSessionReplayer, LockfileWatcherWorker, RefreshScheduler, WorkerService
+from utils import EventHandler, PixmapCache, Stopwatch, Tracer
+
+
+class StubDataDragon:
+    def __init__(self, champions):
+        self.champions = champions
+        self.latest_version = "12.19.1"
+        self.icon_fetched = threading.Event()
+        self.icon_release = threading.Event()
+        self.icon_release.set()
+        self.icon_threads = set()
+
+    def fetch_by_champion_id(self, champion_id):
+        return self.champions.get(champion_id)
+
+    def fetch_icon_by_champion_id(self, champion_id):
+        self.icon_threads.add(threading.current_thread())
+        self.icon_fetched.set()
+        self.icon_release.wait(5)
+        return f"icon {champion_id}".encode()
+
+
+class StubLolFandom:
+    def __init__(self, balances):
+        self.balances = balances
+
+    def fetch_dynamic_balance_by_champion_name(self, name):
+        return self.balances.get(name)
+
+    def fetch_dynamic_balance_by_champion_id(self, champion_id):
+        return next((x for x in self.balances.values() if x.champion_id == champion_id), None)
+
+
+class StubApiService:
+    def __init__(self):
+        self.data_dragon = StubDataDragon({37: {"name": "Sona"}, 103: {"name": "Ahri"}, 84: {"name": "Akali"}})
+        self.lol_fandom = StubLolFandom({
+            name: DynamicBalanceModel(id, "Rank: 1", name, [BalanceLever("dmg_dealt", 0.9)])
+            for id, name in ((37, "Sona"), (103, "Ahri"))
+        })
+        self.refreshed = EventHandler()
+
+
+def session(team, available=None):
+    return ChampionSelectSessionModel(available, team, available is not None, "Update")
+
+
+class StubSettingsContextService:
+    def __init__(self, values: dict):
+        self.values = values
+
+    def get(self, schema_tuple: tuple):
+        (key, default) = schema_tuple
+        return self.values.get(key, default)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.01)
+    QtCore.QCoreApplication.processEvents()
+    return condition()
+
+
+class TestServices:
+    class TestApiService:
+        def test_starts_from_last_good_data_and_revalidates(self, tmp_path, monkeypatch):
+            balance = DynamicBalanceModel(37, "Rank: 1\nWinrate: 53.5", "Sona", [BalanceLever("dmg_dealt", 0.9)])
+            champions = {"data": {"Sona": {"id": "Sona", "key": "37", "name": "Sona"}}}
+            ChampionSnapshot(1000, "12.19.1", champions, 100, {"Sona": balance}).save(
+                str(tmp_path / "bundle" / SNAPSHOT_RESOURCE))
+            monkeypatch.setattr("sys._MEIPASS", str(tmp_path / "bundle"), raising=False)
+            monkeypatch.setenv("MONSOON_DATA_DIR", str(tmp_path / "user"))
+            release = threading.Event()
+
+            def refresh_if_outdated(self):
+                release.wait(5)
+                raise Exception("DataDragon is unreachable")
+
+            monkeypatch.setattr(DataDragon, "refresh_if_outdated", refresh_if_outdated)
+            monkeypatch.setattr(LolFandom, "refresh_championdata", lambda self: False)
+            monkeypatch.setattr(LolFandom, "refresh_winrates", lambda self: True)
+            api_service = ApiService(http_client=None, data_dragon_options={"prefetch_icons": False})
+            refreshed = []
+            api_service.refreshed += lambda sender, args: refreshed.append(args)
+            assert api_service.data_dragon.fetch_by_champion_id(37)["name"] == "Sona"
+            assert api_service.lol_fandom.fetch_dynamic_balance_by_champion_name("Sona") == balance
+            assert {x.state for x in api_service.freshness.values()} == {FreshnessStates.STALE}
+            assert {x.updated_at for x in api_service.freshness.values()} == {1000}
+
+            # Checks run on the scheduler thread, lookups are served meanwhile
+            api_service.start_refresh()
+            assert api_service.data_dragon.fetch_by_champion_id(37)["name"] == "Sona"
+            release.set()
+            assert wait_until(lambda: api_service.scheduler.get("lolalytics").checks == 1)
+            api_service.stop_refresh()
+            freshness = api_service.freshness
+            assert freshness["datadragon"] == SourceFreshnessModel(
+                "datadragon", FreshnessStates.OFFLINE, 1000, "DataDragon is unreachable")
+            assert freshness["lolfandom"].state is freshness["lolalytics"].state is FreshnessStates.FRESH
+            assert refreshed == ["lolalytics"]
+
+            # The next start uses the saved data along with its freshness
+            saved = ChampionSnapshot.load_latest()
+            assert saved.dynamic_balances == {"Sona": balance}
+            assert saved.updated_at["datadragon"] == 1000
+            assert saved.updated_at["lolalytics"] == freshness["lolalytics"].updated_at
+            restarted = ApiService(http_client=None, data_dragon_options={"prefetch_icons": False})
+            assert restarted.freshness["lolalytics"] == dataclasses.replace(
+                freshness["lolalytics"], state=FreshnessStates.STALE)
+
+        def test_starts_offline_without_any_data(self, tmp_path, monkeypatch):
+            monkeypatch.setattr("sys._MEIPASS", str(tmp_path / "bundle"), raising=False)
+            monkeypatch.setenv("MONSOON_DATA_DIR", str(tmp_path / "user"))
+
+            def unreachable(self):
+                raise Exception("Network is unreachable")
+
+            for target, name in ((DataDragon, "refresh_if_outdated"), (LolFandom, "refresh_championdata"),
+                                 (LolFandom, "refresh_winrates")):
+                monkeypatch.setattr(target, name, unreachable)
+            start = time.monotonic()
+            api_service = ApiService(http_client=None)
+            assert time.monotonic() - start < 1
+            assert api_service.data_dragon.fetch_by_champion_id(37) is None
+
+            api_service.start_refresh()
+            assert wait_until(lambda: all(x.state is FreshnessStates.OFFLINE for x in api_service.freshness.values()))
+            api_service.stop_refresh()
+            assert {x.updated_at for x in api_service.freshness.values()} == {None}
+            assert ChampionSnapshot.load_user() is None
+
+        def test_refreshes_sources_on_their_intervals(self, monkeypatch):
+            api_service = StubApiService()
+            checks = []
+            release = threading.Event()
+
+            def refresh_if_outdated():
+                checks.append("datadragon")
+                release.wait(5)
+                # Rebuilt in full before the swap
+                api_service.data_dragon = StubDataDragon({37: {"name": "Sona"}})
+                return True
+
+            api_service.data_dragon.refresh_if_outdated = refresh_if_outdated
+            api_service.lol_fandom.refresh_championdata = lambda: checks.append("lolfandom") and False
+            api_service.lol_fandom.stopwatch = Stopwatch()
+            monkeypatch.setattr(ApiService, "_fetch", lambda self: (api_service.data_dragon, api_service.lol_fandom))
+            service = ApiService(http_client=None, use_snapshot=False, refresh_intervals={
+                "datadragon": 0.05, "lolfandom": 0.05, "lolalytics": 60})
+            refreshed = []
+            service.refreshed += lambda sender, name: refreshed.append(name)
+            service.start_refresh()
+            assert wait_until(lambda: checks)
+
+            # Lookups keep being served from the current data during a refresh
+            start = time.monotonic()
+            assert service.data_dragon.fetch_by_champion_id(103) == {"name": "Ahri"}
+            assert time.monotonic() - start < 0.1
+            release.set()
+            assert wait_until(lambda: refreshed)
+            assert wait_until(lambda: checks.count("lolfandom") >= 2)
+            assert "datadragon" in refreshed and "lolfandom" not in refreshed
+            assert service.scheduler.get("lolalytics").checks == 0
+            service.stop_refresh()
+            assert not service.scheduler.is_running
+
+    class TestRefreshScheduler:
+        def test_keeps_checking_after_failures(self):
+            scheduler = RefreshScheduler()
+            task = scheduler.add("upstream", 0.02, lambda: 1 / 0)
+            scheduler.start()
+            assert wait_until(lambda: task.failures >= 2)
+            assert task.swaps == 0
+            assert scheduler.stop()
+
+        def test_trigger_and_stop_wake_scheduler(self):
+            scheduler = RefreshScheduler()
+            refreshed = []
+            scheduler.refreshed += lambda sender, name: refreshed.append(name)
+            task = scheduler.add("upstream", 60, lambda: True)
+            scheduler.start()
+            scheduler.trigger("upstream")
+            assert wait_until(lambda: refreshed == ["upstream"])
+            assert task.checks == task.swaps == 1
+
+            start = time.monotonic()
+            assert scheduler.stop()
+            assert time.monotonic() - start < 1
+
+    class TestChampionSelectService:
+        def test_resolves_off_gui_thread_and_queues_result(self, qt_application):
+            api_service = StubApiService()
+            tracer = Tracer()
+            service = ChampionSelectService(api_service=api_service, pixmap_cache=PixmapCache(), tracer=tracer,
+                                            coalesce_window=0)
+            results = []
+            service.com.result_signal.connect(
+                lambda result: results.append((result, threading.current_thread())), QtCore.Qt.QueuedConnection)
+
+            service.submit(dataclasses.replace(session([37, 84], [103]), trace_id=7))
+            assert wait_until(lambda: results)
+            result, thread = results[0]
+            assert thread is threading.main_thread()
+            assert threading.main_thread() not in api_service.data_dragon.icon_threads
+            assert [x.champion_name for x in result.team_champion_dynamic_balances] == ["Sona"]
+            assert result.available_champion_dynamic_balances[0].champion_icon == b"icon 103"
+            # Shared models are left untouched
+            assert api_service.lol_fandom.balances["Ahri"].champion_icon is None
+            # Champion 84 has no balance, so its icon is never fetched
+            assert result.trace_id == 7
+            assert tracer.stats("champion_lookup").count == 3
+            assert tracer.stats("icon_fetch").count == 2
+            assert tracer.stats("session_resolve").count == 1
+            service.shutdown()
+
+        def test_drops_stale_sessions(self, qt_application):
+            api_service = StubApiService()
+            api_service.data_dragon.icon_release.clear()
+            service = ChampionSelectService(api_service=api_service, pixmap_cache=PixmapCache(), tracer=Tracer(),
+                                            coalesce_window=0)
+            results = []
+            service.com.result_signal.connect(results.append, QtCore.Qt.QueuedConnection)
+
+            service.submit(session([37]))
+            assert api_service.data_dragon.icon_fetched.wait(5)
+            service.submit(session([103]))
+            service.submit(session([37, 103]))
+            api_service.data_dragon.icon_release.set()
+
+            assert wait_until(lambda: results)
+            assert not wait_until(lambda: len(results) > 1, timeout=0.2)
+            assert results[0].sequence == service.latest_sequence == 3
+            assert service.is_latest(results[0])
+            assert service.dropped == 2
+            service.shutdown()
+
+        def test_results_carry_changed_slots_of_shown_balances(self, qt_application):
+            api_service = StubApiService()
+            api_service.lol_fandom.balances["Akali"] = DynamicBalanceModel(84, "Rank: 3", "Akali", [])
+            service = ChampionSelectService(api_service=api_service, pixmap_cache=PixmapCache(), tracer=Tracer(),
+                                            coalesce_window=0)
+            results = []
+            service.com.result_signal.connect(results.append, QtCore.Qt.QueuedConnection)
+
+            # Champion 50 has no balance and takes up no slot
+            service.submit(session([37, 50, 103], [84]))
+            assert wait_until(lambda: len(results) == 1)
+            assert results[0].changes == (ChampionSlotChangeModel("team", 0, None, 37),
+                                          ChampionSlotChangeModel("team", 1, None, 103),
+                                          ChampionSlotChangeModel("bench", 0, None, 84))
+            # Pick swap between two teammates
+            service.submit(session([103, 50, 37], [84]))
+            assert wait_until(lambda: len(results) == 2)
+            assert results[1].changes == (ChampionSlotChangeModel("team", 0, 37, 103),
+                                          ChampionSlotChangeModel("team", 1, 103, 37))
+            # Trade of a teammate's champion with the bench
+            service.submit(session([84, 50, 37], [103]))
+            assert wait_until(lambda: len(results) == 3)
+            assert results[2].changes == (ChampionSlotChangeModel("team", 0, 103, 84),
+                                          ChampionSlotChangeModel("bench", 0, 84, 103))
+            service.submit(session([84, 37], None))
+            assert wait_until(lambda: len(results) == 4)
+            assert results[3].changes == (ChampionSlotChangeModel("bench", 0, 103, None),)
+            service.shutdown()
+
+        def test_resolves_last_session_again_after_refresh(self, qt_application):
+            api_service = StubApiService()
+            service = ChampionSelectService(api_service=api_service, pixmap_cache=PixmapCache(), tracer=Tracer(),
+                                            coalesce_window=0)
+            results = []
+            service.com.result_signal.connect(results.append, QtCore.Qt.QueuedConnection)
+
+            service.submit(session([37], [103]))
+            assert wait_until(lambda: results)
+            api_service.lol_fandom.balances["Sona"] = DynamicBalanceModel(37, "Rank: 2", "Sona", [])
+            # Refreshes are announced on the scheduler thread
+            thread = threading.Thread(target=api_service.refreshed.invoke, args=(api_service, "lolfandom"))
+            thread.start()
+            thread.join()
+
+            assert wait_until(lambda: len(results) == 2)
+            assert results[1].team_champion_dynamic_balances[0].rank_winrate == "Rank: 2"
+            assert service.is_latest(results[1])
+            assert service.coalescer.stats.forwarded == 2
+            service.shutdown()
+            api_service.refreshed.invoke(api_service, "lolalytics")
+            assert service.coalescer.stats.forwarded == 2
+
+    class TestChampionSelectCoalescer:
+        def test_forwards_only_changed_sessions(self):
+            forwarded = []
+            coalescer = ChampionSelectCoalescer(forwarded.append, window=0)
+            coalescer.push(session([37, 0], [103]))
+            coalescer.push(session([37, 0], [103]))
+            coalescer.push(session([37, 84], [103]))
+            coalescer.push(session([37, 84], None))
+            # Only whether the bench is enabled changed
+            coalescer.push(ChampionSelectSessionModel(None, [37, 84], True, "Update"))
+
+            assert [(x.team_champion_ids, x.available_champion_ids, x.is_bench_enabled) for x in forwarded] == [
+                ([37, 0], [103], True), ([37, 84], [103], True), ([37, 84], None, False), ([37, 84], None, True)]
+            assert (coalescer.stats.received, coalescer.stats.unchanged, coalescer.stats.forwarded) == (5, 1, 4)
+
+        def test_coalesces_bursts(self):
+            forwarded = []
+            coalescer = ChampionSelectCoalescer(forwarded.append, window=0.1)
+            for team in ([37], [103], [84], [84]):
+                coalescer.push(session(team))
+            assert forwarded == []
+            assert wait_until(lambda: forwarded)
+            time.sleep(0.15)
+            assert [x.team_champion_ids for x in forwarded] == [[84]]
+            assert (coalescer.stats.received, coalescer.stats.coalesced, coalescer.stats.forwarded) == (4, 3, 1)
+
+            coalescer.push(session([84]))
+            coalescer.flush()
+            assert coalescer.stats.unchanged == 1
+
+    class TestLcuEventProcessorWorker:
+        def test_backs_off_exponentially(self):
+            worker = LcuEventProcessorWorker(retry_delay=0.5, max_retry_delay=4)
+            assert [worker.retry_delay_after(x) for x in range(1, 6)] == [0.5, 1, 2, 4, 4]
+
+        def test_stops_while_waiting_for_client(self, qt_application):
+            worker = LcuEventProcessorWorker(retry_delay=30)
+            worker._find_client = lambda: None
+            worker.start()
+            assert wait_until(lambda: worker.attempts == 1)
+
+            start = time.monotonic()
+            assert worker.stop()
+            assert time.monotonic() - start < 1
+            assert worker.loop.is_closed()
+
+        def test_stops_while_looking_up_client(self, qt_application):
+            worker = LcuEventProcessorWorker(retry_delay=30)
+            looking_up = threading.Event()
+            release = threading.Event()
+
+            def find_client():
+                looking_up.set()
+                release.wait(5)
+                # Nothing listens on the port, the API never becomes ready
+                return LockfileModel("LeagueClient", 1, 1, "password", "https").connection_string
+
+            worker._find_client = find_client
+            worker.start()
+            assert looking_up.wait(5)
+            threading.Timer(0.1, release.set).start()
+            start = time.monotonic()
+            assert worker.stop(timeout=2)
+            assert time.monotonic() - start < 1
+
+        def test_finds_client_process_by_name(self):
+            processes = [mock.Mock(info={"name": None}), mock.Mock(info={"name": "LeagueClient.exe"}),
+                         mock.Mock(info={"name": "LeagueClientUx.exe"})]
+            with mock.patch("psutil.process_iter", return_value=iter(processes)):
+                assert LcuEventProcessorWorker._find_client() is processes[2]
+            with mock.patch("psutil.process_iter", return_value=iter(processes[:2])):
+                assert LcuEventProcessorWorker._find_client() is None
+
+        def test_connects_with_protocol_of_lockfile(self):
+            connector = Connector(loop=asyncio.new_event_loop())
+            connection = LcuConnection(connector, "1234:1234:50123:s3cr3t:http")
+            assert (connection.address, connection.ws_address) == ("http://127.0.0.1:50123", "ws://127.0.0.1:50123")
+            assert connection.auth_key == "s3cr3t"
+            connection = LcuConnection(connector, "1234:1234:50123:s3cr3t:https")
+            assert connection.protocols == ("https", "wss")
+            assert not connection.is_listening
+            connector.loop.close()
+
+        def test_stop_before_loop_started(self, qt_application):
+            worker = LcuEventProcessorWorker()
+            worker._find_client = lambda: None
+            assert worker.stop()
+            worker.start()
+            assert worker.wait(2000)
+
+        def test_queues_session_events(self, qt_application):
+            tracer = Tracer()
+            worker = LcuEventProcessorWorker(retry_delay=30, tracer=tracer)
+            worker._find_client = lambda: None
+            sessions = []
+            worker.com.data_signal.connect(
+                lambda x: sessions.append((x, threading.current_thread())), QtCore.Qt.QueuedConnection)
+            worker.start()
+            assert wait_until(lambda: worker.attempts == 1)
+
+            event = WebsocketEventResponse(event_type="Update", uri=LcuEventProcessorWorker.SESSION_URI, data={
+                "benchChampions": [{"championId": 103}], "myTeam": [{"championId": 37}], "benchEnabled": True})
+            asyncio.run_coroutine_threadsafe(worker.update(None, event), worker.loop).result(5)
+            assert wait_until(lambda: sessions)
+            assert sessions == [(ChampionSelectSessionModel([103], [37], True, "Update"), threading.main_thread())]
+            assert sessions[0][0].trace_id == 1
+            assert tracer.stats("websocket_receive").count == tracer.stats("session_parse").count == 1
+            assert tracer.end(1) is not None
+            assert worker.stop()
+
+        def test_reconnects_to_client(self, qt_application, stand_in_client):
+            session_data = {"benchChampions": [], "myTeam": [{"championId": 37}], "benchEnabled": False}
+            stand_in_client.greeting.append((LcuEventProcessorWorker.SESSION_URI, "Create", session_data))
+            worker = LcuEventProcessorWorker(retry_delay=0.05)
+            worker._find_client = lambda: stand_in_client.lockfile
+            sessions = []
+            worker.com.data_signal.connect(sessions.append, QtCore.Qt.QueuedConnection)
+            worker.start()
+            assert wait_until(lambda: len(sessions) == 1)
+            assert sessions[0].team_champion_ids == [37]
+
+            stand_in_client.disconnect()
+            assert wait_until(lambda: len(sessions) == 2 and stand_in_client.listening)
+            assert stand_in_client.connections == 2
+            stand_in_client.send(LcuEventProcessorWorker.SESSION_URI, "Update", dict(session_data, myTeam=[]))
+            assert wait_until(lambda: len(sessions) == 3)
+            assert sessions[2].team_champion_ids == []
+
+            start = time.monotonic()
+            assert worker.stop()
+            assert time.monotonic() - start < 1
+            assert wait_until(lambda: not stand_in_client.listening)
+
+        def test_fetches_running_session_on_connect(self, qt_application, stand_in_client):
+            stand_in_client.routes[LcuEventProcessorWorker.SESSION_URI] = {
+                "benchChampions": [{"championId": 103}], "myTeam": [{"championId": 37}], "benchEnabled": True}
+            tracer = Tracer()
+            worker = LcuEventProcessorWorker(tracer=tracer)
+            worker._find_client = lambda: stand_in_client.lockfile
+            sessions = []
+            worker.com.data_signal.connect(sessions.append, QtCore.Qt.QueuedConnection)
+            worker.start()
+            assert wait_until(lambda: sessions)
+            assert sessions == [ChampionSelectSessionModel([103], [37], True, "Create")]
+            assert tracer.stats("session_fetch").count == 1
+
+            # The session is fetched once the API answered
+            requests = [x[0] for x in stand_in_client.requests if x[0] != "/"]
+            assert requests[0] == "/riotclient/region-locale"
+            assert requests[-1] == LcuEventProcessorWorker.SESSION_URI
+            assert worker.stop()
+
+        def test_fetches_nothing_outside_champion_select(self, qt_application, stand_in_client):
+            worker = LcuEventProcessorWorker()
+            worker._find_client = lambda: stand_in_client.lockfile
+            sessions = []
+            worker.com.data_signal.connect(sessions.append, QtCore.Qt.QueuedConnection)
+            worker.start()
+            assert wait_until(lambda: stand_in_client.listening)
+            assert wait_until(lambda: (LcuEventProcessorWorker.SESSION_URI, mock.ANY) in stand_in_client.requests)
+            stand_in_client.send(LcuEventProcessorWorker.SESSION_URI, "Create", {
+                "benchChampions": [], "myTeam": [{"championId": 37}], "benchEnabled": False})
+            assert wait_until(lambda: sessions)
+            assert [x.websocket_event_type for x in sessions] == ["Create"]
+            assert worker.events_received == 1
+            assert worker.stop()
+
+        def test_replays_recorded_session(self, qt_application, tmp_path):
+            uri = LcuEventProcessorWorker.SESSION_URI
+            recording = str(tmp_path / "sessions.jsonl.gz")
+            recorder = LcuSessionRecorder(recording)
+            for i, team in enumerate([[], [37], [37, 103]]):
+                event = WebsocketEventResponse(event_type="Create" if i == 0 else "Update", uri=uri, data={
+                    "benchChampions": [], "myTeam": [{"championId": x} for x in team], "benchEnabled": False})
+                recorder.record(event, i * 0.01)
+            recorder.close()
+            assert recorder.count == 3
+
+            rerecording = str(tmp_path / "rerecorded.jsonl.gz")
+            worker = LcuEventProcessorWorker(replayer=LcuSessionReplayer(recording, speed=0),
+                                             recorder=LcuSessionRecorder(rerecording))
+            worker._find_client = lambda: pytest.fail("Replaying connected to a client")
+            sessions = []
+            worker.com.data_signal.connect(sessions.append, QtCore.Qt.QueuedConnection)
+            worker.start()
+            # Replaying ends the worker once the recording is played
+            assert worker.wait(5000)
+            assert wait_until(lambda: len(sessions) == 3)
+            assert [x.team_champion_ids for x in sessions] == [[], [37], [37, 103]]
+            assert [x.websocket_event_type for x in sessions] == ["Create", "Update", "Update"]
+            assert worker.replayer.played == 3
+
+            replayed = [(x.type, x.data) for _, x in LcuSessionReplayer(rerecording).events()]
+            assert replayed == [(x.type, x.data) for _, x in LcuSessionReplayer(recording).events()]
+
+        def test_replays_at_recorded_pace(self, tmp_path):
+            recording = str(tmp_path / "sessions.jsonl.gz")
+            recorder = LcuSessionRecorder(recording)
+            for offset in (0, 0.2):
+                recorder.record(WebsocketEventResponse(event_type="Update", uri="/", data=None), offset)
+            recorder.close()
+
+            times = []
+
+            async def handler(connection, event):
+                times.append(time.monotonic())
+
+            assert asyncio.run(LcuSessionReplayer(recording, speed=2).play(handler)) == 2
+            assert 0.08 < times[1] - times[0] < 0.3
+
+            async def stop_after_first():
+                stopping = asyncio.Event()
+
+                async def stop(connection, event):
+                    stopping.set()
+
+                return await LcuSessionReplayer(recording, speed=1).play(stop, stopping)
+
+            start = time.monotonic()
+            assert asyncio.run(stop_after_first()) == 1
+            assert time.monotonic() - start < 0.15
+
+        def test_rejects_unknown_recording_format(self, tmp_path):
+            recording = tmp_path / "sessions.jsonl.gz"
+            with gzip.open(recording, "wt") as f:
+                f.write('{"format": 99}\n')
+            with pytest.raises(Exception, match="unsupported format"):
+                list(LcuSessionReplayer(str(recording)).events())
+
+    class TestLockfileWatcherWorker:
+        def test_parses_lockfile(self):
+            lockfile = LockfileModel.from_string("LeagueClient:1234:50123:s3cr3t:https\n")
+            assert lockfile == LockfileModel("LeagueClient", 1234, 50123, "s3cr3t", "https")
+            assert lockfile.connection_string == "1234:1234:50123:s3cr3t:https"
+            for content in ("", "LeagueClient:1234:", "LeagueClient:1234:port:s3cr3t:https"):
+                with pytest.raises(Exception, match="incomplete"):
+                    LockfileModel.from_string(content)
+
+        def test_emits_created_and_deleted_lockfiles(self, qt_application, tmp_path):
+            worker = LockfileWatcherWorker(str(tmp_path))
+            created, deleted = [], []
+            worker.lockfile_create_signal.connect(created.append, QtCore.Qt.DirectConnection)
+            worker.lockfile_delete_signal.connect(lambda: deleted.append(True), QtCore.Qt.DirectConnection)
+            worker.start()
+            assert wait_until(lambda: worker.isRunning)
+
+            # The client creates the lockfile before writing it
+            path = tmp_path / "lockfile"
+            path.touch()
+            (tmp_path / "lockfile_backup").write_text("LeagueClient:1:2:other:https")
+            path.write_text("LeagueClient:1234:50123:s3cr3t:https")
+            assert wait_until(lambda: created)
+            path.unlink()
+            assert wait_until(lambda: deleted)
+            assert created == [LockfileModel("LeagueClient", 1234, 50123, "s3cr3t", "https")]
+            assert deleted == [True]
+
+            start = time.monotonic()
+            assert worker.stop()
+            assert time.monotonic() - start < 1
+
+        def test_emits_lockfile_of_running_client(self, qt_application, tmp_path):
+            (tmp_path / "lockfile").write_text("LeagueClient:1234:50123:s3cr3t:https")
+            worker = LockfileWatcherWorker(str(tmp_path))
+            created = []
+            worker.lockfile_create_signal.connect(created.append, QtCore.Qt.DirectConnection)
+            worker.start()
+            assert wait_until(lambda: created)
+            assert created[0].port == 50123
+            assert worker.stop()
+
+        def test_stops_without_install_directory(self, qt_application, tmp_path):
+            worker = LockfileWatcherWorker(str(tmp_path / "missing"))
+            worker.start()
+            assert wait_until(lambda: worker.isRunning)
+            assert worker.stop(1)
+
+        def test_lockfile_connects_client_right_away(self, qt_application, tmp_path, stand_in_client):
+            stand_in_client.greeting.append((LcuEventProcessorWorker.SESSION_URI, "Create", {
+                "benchChampions": [], "myTeam": [{"championId": 37}], "benchEnabled": False}))
+            settings = StubSettingsContextService({SettingsSchema.LEAGUE_INSTALL_PATH[0]: str(tmp_path)})
+            worker_service = WorkerService(settings_context_service=settings, tracer=Tracer())
+            lcu_event_processor = worker_service.get(Workers.LCU_EVENT_PROCESSOR)
+            lcu_event_processor.retry_delay = 30
+            lcu_event_processor._find_client = lambda: None
+            sessions = []
+            lcu_event_processor.com.data_signal.connect(sessions.append, QtCore.Qt.QueuedConnection)
+            worker_service.get(Workers.LOCKFILE_WATCHER).start()
+            lcu_event_processor.start()
+            assert wait_until(lambda: lcu_event_processor.attempts == 1)
+
+            # Well within the 30 second backoff
+            _, _, port, token, protocol = stand_in_client.lockfile.split(":")
+            (tmp_path / "lockfile").write_text(f"LeagueClient:1:{port}:{token}:{protocol}")
+            assert wait_until(lambda: sessions, timeout=3)
+            assert sessions[0].team_champion_ids == [37]
+            assert lcu_event_processor.attempts == 0
+
+            (tmp_path / "lockfile").unlink()
+            assert wait_until(lambda: lcu_event_processor.lockfile is None)
+            start = time.monotonic()
+            worker_service.stop()
+            assert time.monotonic() - start < 1
@@ -0,0 +1,86 @@
+import json
+import threading
+
+from PySide6 import QtCore, QtGui
+from utils import PixmapCache, Tracer
+
+
+def create_png(width, height) -> bytes:
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32)
+    image.fill(QtGui.QColor(255, 0, 0))
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+class TestUtils:
+    class TestPixmapCache:
+        def test_prepares_scaled_images_off_gui_thread(self, qt_application):
+            cache = PixmapCache()
+            key = PixmapCache.key(37, "12.19.1", QtCore.QSize(80, 80))
+            worker = threading.Thread(target=cache.prepare, args=(key, create_png(120, 60)))
+            worker.start()
+            worker.join()
+
+            pixmap = cache.pixmap(key)
+            assert (pixmap.width(), pixmap.height()) == (80, 40)
+            assert cache.pixmap(key) is pixmap
+            assert cache.stats.hits == 2
+            assert cache.pixmap(PixmapCache.key(37, "12.20.1", QtCore.QSize(80, 80))) is None
+            assert cache.stats.misses == 1
+            assert not cache.prepare(PixmapCache.key(1, None, QtCore.QSize(80, 80)), b"not an image")
+
+        def test_evicts_least_recently_used(self, qt_application):
+            cache = PixmapCache(max_entries=2)
+            keys = [PixmapCache.key(x, "12.19.1", QtCore.QSize(32, 32)) for x in range(3)]
+            content = create_png(64, 64)
+            cache.prepare(keys[0], content)
+            cache.prepare(keys[1], content)
+            cache.pixmap(keys[0])
+            cache.prepare(keys[2], content)
+            assert keys[0] in cache and keys[1] not in cache and keys[2] in cache
+            assert cache.stats.evictions == 1
+            assert cache.pixmap(keys[1], content) is not None
+
+    class TestTracer:
+        def test_rolls_percentiles_per_stage(self):
+            tracer = Tracer(window=100)
+            for i in range(1, 201):
+                tracer.record("render", i / 1000)
+            stats = tracer.stats("render")
+            assert stats.count == 100
+            assert (stats.p50, stats.p95, stats.p99) == (0.150, 0.195, 0.199)
+            assert tracer.stats("unknown") is None
+            assert "render: p50 150.0 ms, p95 195.0 ms, p99 199.0 ms (100 spans)" == tracer.format()
+
+        def test_traces_end_to_end(self):
+            tracer = Tracer(max_open_traces=2)
+            first, second, third = tracer.begin(), tracer.begin(), tracer.begin()
+            with tracer.span("session_parse", second):
+                pass
+            assert tracer.end(first) is None
+            assert tracer.end(second) >= 0
+            assert tracer.end(second) is None
+            assert tracer.end(third) >= 0
+            assert tracer.stats(Tracer.END_TO_END).count == 2
+            assert tracer.stats("session_parse").count == 1
+
+        def test_dumps_spans_to_jsonl(self, tmp_path):
+            path = tmp_path / "traces.jsonl"
+            tracer = Tracer()
+            tracer.record("render", 0.5)
+            tracer.dump_to(str(path))
+            assert tracer.is_dumping
+            with tracer.span("icon_fetch", 3):
+                pass
+            tracer.record("render", 0.25)
+            tracer.stop_dump()
+            tracer.record("render", 0.125)
+
+            records = [json.loads(x) for x in path.read_text().splitlines()]
+            assert [(x["trace"], x["stage"]) for x in records] == [(3, "icon_fetch"), (0, "render")]
+            assert records[1]["duration_ms"] == 250
+            assert records[1]["thread"] == threading.current_thread().name
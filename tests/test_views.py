@@ -0,0 +1,144 @@
+import dataclasses
+
+from models import BalanceLever, DynamicBalanceModel
+
+
+def create_balance(name="Sona", levers=(("dmg_dealt", 0.9), ("dmg_taken", 1.05))):
+    return DynamicBalanceModel(37, "Rank: 1\nWinrate: 53.5", name, [BalanceLever(*x) for x in levers])
+
+
+class TestViews:
+    class TestQChampionBalanceListModel:
+        def test_updates_only_changed_rows(self, qt_application):
+            from views import QChampionBalanceListModel
+            model = QChampionBalanceListModel()
+            changed_rows = []
+            model.dataChanged.connect(lambda top_left, bottom_right: changed_rows.append(top_left.row()))
+
+            balances = [create_balance(f"Champion {i}") for i in range(3)]
+            assert model.set_balances(balances) == 3
+            assert model.rowCount() == 3
+            assert model.data(model.index(1)) == "Champion 1"
+            assert model.data(model.index(1), QChampionBalanceListModel.BalanceRole) == balances[1]
+
+            assert model.set_balances([dataclasses.replace(x) for x in balances]) == 0
+            assert changed_rows == []
+
+            balances[2] = create_balance("Ahri")
+            assert model.set_balances(balances) == 1
+            assert changed_rows == [2]
+
+        def test_compares_only_given_rows(self, qt_application):
+            from views import QChampionBalanceListModel
+            model = QChampionBalanceListModel()
+            changed_rows = []
+            model.dataChanged.connect(lambda top_left, bottom_right: changed_rows.append(top_left.row()))
+            model.set_balances([create_balance(f"Champion {i}") for i in range(3)])
+
+            balances = [create_balance("Ahri"), create_balance("Akali"), create_balance("Champion 2"),
+                        create_balance("Sona")]
+            assert model.set_balances(balances, rows=[1, 3]) == 2
+            assert changed_rows == [1]
+            assert [x.champion_name for x in model.balances] == ["Champion 0", "Akali", "Champion 2", "Sona"]
+
+        def test_inserts_and_removes_rows(self, qt_application):
+            from views import QChampionBalanceListModel
+            model = QChampionBalanceListModel()
+            model.set_balances([create_balance(f"Champion {i}") for i in range(3)])
+
+            balances = [create_balance(f"Champion {i}") for i in range(12)]
+            assert model.set_balances(balances) == 9
+            assert model.balances == balances
+
+            assert model.set_balances(balances[:2]) == 10
+            assert model.rowCount() == 2
+            assert model.data(model.index(5)) is None
+
+    class TestQChampionBalanceDelegate:
+        def test_grows_with_balance_levers(self, qt_application):
+            from PySide6 import QtWidgets
+            from views import QChampionBalanceDelegate, QChampionBalanceListModel
+            model = QChampionBalanceListModel()
+            levers = [("dmg_dealt", 0.9), ("dmg_taken", 1.05), ("healing", 1.1), ("shielding", 0.8),
+                      ("ability_haste", 1.2), ("attack_speed", 0.95), ("energy_regen", 1.1)]
+            model.set_balances([create_balance(), create_balance("Ahri", levers)])
+            delegate = QChampionBalanceDelegate()
+            option = QtWidgets.QStyleOptionViewItem()
+
+            short = delegate.sizeHint(option, model.index(0))
+            tall = delegate.sizeHint(option, model.index(1))
+            assert short.width() == tall.width() == QChampionBalanceDelegate.MINIMUM_WIDTH
+            assert tall.height() > short.height()
+
+        def test_paints_balance(self, qt_application):
+            from PySide6 import QtCore, QtGui, QtWidgets
+            from views import QChampionBalanceDelegate, QChampionBalanceListModel
+            model = QChampionBalanceListModel()
+            model.set_balances([create_balance()])
+            delegate = QChampionBalanceDelegate()
+            option = QtWidgets.QStyleOptionViewItem()
+            option.rect = QtCore.QRect(QtCore.QPoint(0, 0), delegate.sizeHint(option, model.index(0)))
+
+            image = QtGui.QImage(option.rect.size(), QtGui.QImage.Format_ARGB32)
+            image.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(image)
+            delegate.paint(painter, option, model.index(0))
+            painter.end()
+            center = option.rect.center()
+            assert image.pixelColor(center.x(), option.rect.bottom() - QChampionBalanceDelegate.PADDING) == \
+                QChampionBalanceDelegate.BACKGROUND_COLOR
+            assert image.pixelColor(0, 0).alpha() == 0
+
+    class TestAppWindowView:
+        def test_renders_balances_into_models(self, qt_application):
+            from PySide6 import QtGui
+            from utils import EventHandler, PixmapCache, Tracer
+            from views import AppWindowView
+
+            class StubViewModel:
+                object_name = "appView"
+                window_title = "Monsoon"
+                width = 1280
+                height = 720
+                wordmark_pixmap = QtGui.QPixmap(256, 64)
+                property_changed = EventHandler()
+                team_champion_dynamic_balances = [create_balance()]
+                available_champion_dynamic_balances = [create_balance(f"Champion {i}") for i in range(10)]
+                freshness_text = "DataDragon: updated just now"
+                freshness_tooltip = ""
+                champion_slot_changes = None
+
+            viewmodel = StubViewModel()
+            tracer = Tracer()
+            view = AppWindowView(viewmodel, pixmap_cache=PixmapCache(), tracer=tracer)
+            viewmodel.property_changed.invoke(viewmodel, "available_champion_dynamic_balances")
+            assert view.team_champions_model.balances == viewmodel.team_champion_dynamic_balances
+            assert view.available_champions_model.rowCount() == 10
+
+            viewmodel.available_champion_dynamic_balances = []
+            viewmodel.property_changed.invoke(viewmodel, "available_champion_dynamic_balances")
+            assert view.available_champions_model.rowCount() == 0
+            assert tracer.stats("render").count == 2
+
+            assert view.freshness_label.text() == "DataDragon: updated just now"
+            viewmodel.freshness_text = "DataDragon: offline, data from 2 d ago"
+            viewmodel.property_changed.invoke(viewmodel, "freshness")
+            assert view.freshness_label.text() == viewmodel.freshness_text
+            assert tracer.stats("render").count == 2
+
+        def test_formats_source_freshness(self):
+            from constants import FreshnessStates
+            from models import SourceFreshnessModel
+            from viewmodels import AppWindowViewModel
+
+            now = 10 ** 9
+            cases = [
+                (SourceFreshnessModel("lolalytics", FreshnessStates.FRESH, now - 5), "updated just now"),
+                (SourceFreshnessModel("lolalytics", FreshnessStates.STALE, now - 3 * 60 * 60),
+                 "checking, data from 3 h ago"),
+                (SourceFreshnessModel("lolalytics", FreshnessStates.OFFLINE, now - 2 * 24 * 60 * 60, "timed out"),
+                 "offline, data from 2 d ago"),
+                (SourceFreshnessModel("lolalytics", FreshnessStates.OFFLINE, None, "timed out"), "offline, no data"),
+            ]
+            for freshness, text in cases:
+                assert AppWindowViewModel.format_freshness(freshness, now) == text
@@ -0,0 +1,113 @@
+"""Builders of responses that mimic the upstream websites, for offline tests
+and benchmarks.
+"""
+import json
+from html import escape
+from typing import Dict, Optional
+
+LOLALYTICS_WINRATE_CLASS = "lolx-links px-2 text-justify text-[14px] leading-normal text-white sm:px-0"
+
+
+def lolalytics_tierlist_page(winrates: Dict[str, Optional[float]], average_winrate: float = 50.55,
+                             rows: int = 200) -> str:
+    """Return a LoLalytics ARAM tierlist page. Champions with a None winrate are
+    missing from the page data, like the website does for some champions.
+    """
+    champs = list(winrates)
+    objs = [f"filler{i}" for i in range(300)]
+    objs.append({champ: f"{i:x}" for i, champ in enumerate(champs)})
+    objs += [f"filler{i}" for i in range(len(objs), 1000)]
+    objs += [average_winrate, "avg"]
+    for rank, champ in enumerate(champs, 1):
+        winrate = winrates[champ]
+        if winrate is None:
+            objs += [rank, 1.25, {"wr": f"missing-{rank}"}]
+        else:
+            objs += [rank, winrate, 0.5, 3.2, 1000 + rank, {"wr": f"wr-{rank}"}]
+    objs.append("end")
+
+    return f"""<!DOCTYPE html>
+<html><head><title>ARAM Tier List</title></head>
+<body>
+<div class="flex"><div class="ml-auto text-right">Average Win Rate: {average_winrate}%</div></div>
+{"".join(f'<div class="row"><span class="ml-auto">{i}</span></div>' for i in range(rows))}
+<script type="qwik/json">{json.dumps({"objs": objs})}</script>
+</body></html>"""
+
+
+def lolalytics_build_page(champ: str, winrate: float, rows: int = 200) -> str:
+    """Return the LoLalytics ARAM build page of a champion.
+    """
+    return f"""<!DOCTYPE html>
+<html><head><title>{champ} ARAM Build</title></head>
+<body>
+{"".join(f'<div class="item"><img src="/{i}.webp"></div>' for i in range(rows))}
+<p class="{LOLALYTICS_WINRATE_CLASS}">{escape(champ)} has a {winrate}% win rate in ARAM.</p>
+</body></html>"""
+
+
+CHAMPION_NAMES = [
+    "Aatrox", "Ahri", "Akali", "Bel'Veth", "Cho'Gath", "Dr. Mundo", "Jarvan IV", "Kai'Sa", "Kog'Maw",
+    "LeBlanc", "Lee Sin", "Master Yi", "Miss Fortune", "Nunu & Willump", "Rek'Sai", "Renata Glasc",
+    "Sona", "Tahm Kench", "Twisted Fate", "Vel'Koz", "Wukong", "Xin Zhao"
+]
+
+
+def champion_names(count: int):
+    """Return count unique champion names, real ones first.
+    """
+    names = CHAMPION_NAMES[:count]
+    names += [f"Champion {i}" for i in range(len(names), count)]
+    return names
+
+
+def championdata_module(count: int = 170) -> str:
+    """Return Lua source resembling Module:ChampionData/data for count champions.
+    Every third champion has no ARAM balance changes.
+    """
+    lines = ["-- <pre>", "return {"]
+    for i, name in enumerate(champion_names(count)):
+        lua_name = name.replace("\\", "\\\\").replace('"', '\\"')
+        aram = "nil" if i % 3 == 2 else (
+            f'{{["dmg_dealt"] = {1 + (i % 5) / 100:.2f}, ["dmg_taken"] = {1 - (i % 4) / 100:.2f}'
+            + (', ["healing"] = 0.9' if i % 2 else "") + "}")
+        lines += [
+            f'  ["{lua_name}"] = {{',
+            f'    ["id"]           = {i + 1},',
+            f'    ["apiname"]      = "{lua_name.replace(" ", "")}",',
+            f'    ["title"]        = "the champion (number {i}) who will return",',
+            f'    ["attributes"]   = {{"Fighter", "Tank"}},',
+            f'    ["resource"]     = "Mana",',
+            f'    ["cost_ip"]      = {450 * (i % 10 + 1)},',
+            f'    ["date"]         = "2013-06-{i % 28 + 1:02d}",',
+            f'    ["stats"]        = {{',
+            f'      ["hp_base"]      = {500 + i},',
+            f'      ["hp_lvl"]       = 95.5,',
+            f'      ["mp_base"]      = 300,',
+            f'      ["arm_base"]     = -{i % 3},',
+            f'      ["ms"]           = 345,',
+            f'      ["range"]        = {125 + 25 * (i % 20)},',
+            f'      ["aram"]         = {aram},',
+            f'      ["urf"]          = {{["dmg_dealt"] = 1.05}},',
+            f'    }},',
+            f'    ["ratings"]      = {{["damage"] = 3, ["toughness"] = 2, ["control"] = 1}},',
+            f'    ["skill_i"]      = {{[1] = "Passive of {lua_name}"}},',
+            f'  }},',
+        ]
+    lines += ["}", "-- </pre>", "-- [[Category:Lua]]"]
+    return "\n".join(lines)
+
+
+def fandom_module_page(source: str) -> str:
+    """Return the rendered wiki page of a Lua module.
+    """
+    chrome = "".join(f'<li class="wds-tabs__tab"><a href="/wiki/Page_{i}">Page {i}</a></li>' for i in range(1500))
+    return f"""<!DOCTYPE html>
+<html><head><title>Module:ChampionData/data | League of Legends Wiki | Fandom</title></head>
+<body>
+<nav><ul>{chrome}</ul></nav>
+<div class="mw-parser-output">
+<pre class="mw-code mw-script" dir="ltr">{escape(source, quote=False)}</pre>
+</div>
+<footer>{chrome}</footer>
+</body></html>"""